@@ -14,7 +14,11 @@ cdef class EventDispatcher(ObjectWithUid):
     cdef dict __properties
     cdef dict __storage
     cdef object __weakref__
+    # number of nested batch() and properties whose dispatch is delayed
+    cdef int _batch_depth
+    cdef list _batch_pending
     cpdef dict properties(self)
+    cdef void _commit_batch(self) except *
 
 
 cdef enum BoundLock:
@@ -54,4 +58,4 @@ cdef class EventObservers:
     cdef inline void remove_callback(self, BoundCallback callback, int force=*) except *
     cdef inline object _dispatch(
         self, object f, tuple slargs, dict skwargs, object obj, object value, tuple largs, dict kwargs)
-    cdef inline int dispatch(self, object obj, object value, tuple largs, dict kwargs, int stop_on_true) except 2
+    cdef inline int dispatch(self, object obj, object value, tuple largs, dict kwargs, int stop_on_true, object name=*) except 2
@@ -9,9 +9,38 @@ handlers.
 .. versionchanged:: 1.0.9
     Property discovery and methods have been moved from the
     :class:`~kivy.uix.widget.Widget` to the :class:`EventDispatcher`.
+
+.. _event-tracing:
+
+Tracing
+-------
+
+.. versionadded:: 1.9.0
+
+When an application is slow, a property dispatched thousands of times per
+second, or an observer taking too long, is often the cause. The dispatches of
+the properties and events can be traced, to count them and to record the time
+spent in each observer::
+
+    from kivy.event import start_tracing, stop_tracing
+
+    start_tracing()
+    # ... run the application for a while ...
+    tracer = stop_tracing()
+    for (cls, name), count in tracer.get_dispatches()[:10]:
+        print(cls, name, count)
+    for (cls, name, observer), stats in tracer.get_stats()[:10]:
+        print(cls, name, observer, stats['count'], stats['total'])
+    tracer.dump('dispatch_trace.json')
+
+Only the properties with observers are counted. The
+:mod:`~kivy.modules.monitor` module can show the most dispatched properties
+while the application runs. When tracing is not started, the overhead is a
+single check per dispatch.
 '''
 
-__all__ = ('EventDispatcher', 'ObjectWithUid', 'Observable')
+__all__ = ('EventDispatcher', 'ObjectWithUid', 'Observable',
+           'DispatchTracer', 'start_tracing', 'stop_tracing', 'get_tracer')
 
 
 cdef extern from "Python.h":
@@ -27,8 +56,10 @@ cdef extern from "Python.h":
 from libc.stdlib cimport malloc, free
 from libc.string cimport memset
 
+import json
 from functools import partial
 from collections import defaultdict
+from timeit import default_timer
 from kivy.weakmethod import WeakMethod
 from kivy.compat import string_types
 from kivy.properties cimport (Property, PropertyStorage, ObjectProperty,
@@ -39,6 +70,8 @@ cdef int widget_uid = 0
 cdef dict cache_properties = {}
 cdef dict cache_events = {}
 cdef dict cache_events_handlers = {}
+# the DispatchTracer in use, see start_tracing()
+cdef object dispatch_tracer = None
 
 def _get_bases(cls):
     for base in cls.__bases__:
@@ -435,7 +468,7 @@ cdef class EventDispatcher(ObjectWithUid):
                 observers.bind(WeakMethod(value), 1)
             else:
                 ps = self.__storage[key]
-                ps.observers.bind(WeakMethod(value), 1)
+                ps.get_observers().bind(WeakMethod(value), 1)
 
     def unbind(self, **kwargs):
         '''Unbind properties from callback functions with similar usage as
@@ -461,7 +494,8 @@ cdef class EventDispatcher(ObjectWithUid):
                 observers.unbind(value, 1, 1)
             else:
                 ps = self.__storage[key]
-                ps.observers.unbind(value, 1, 1)
+                if ps.observers is not None:
+                    ps.observers.unbind(value, 1, 1)
 
     def fast_bind(self, name, func, *largs, **kwargs):
         '''A method for faster binding. This method is somewhat different than
@@ -565,7 +599,7 @@ cdef class EventDispatcher(ObjectWithUid):
             ps = self.__storage.get(name)
             if ps is None:
                 return 0
-            return ps.observers.fast_bind(func, largs, kwargs, 0)
+            return ps.get_observers().fast_bind(func, largs, kwargs, 0)
 
     def fast_unbind(self, name, func, *largs, **kwargs):
         '''Similar to :meth:`fast_bind`.
@@ -589,7 +623,7 @@ cdef class EventDispatcher(ObjectWithUid):
                 observers.fast_unbind(func, largs, kwargs)
         else:
             ps = self.__storage.get(name)
-            if ps is not None:
+            if ps is not None and ps.observers is not None:
                 ps.observers.fast_unbind(func, largs, kwargs)
 
     def unbind_uid(self, name, uid):
@@ -623,7 +657,7 @@ cdef class EventDispatcher(ObjectWithUid):
                 observers.unbind_uid(uid)
         else:
             ps = self.__storage.get(name)
-            if ps is not None:
+            if ps is not None and ps.observers is not None:
                 ps.observers.unbind_uid(uid)
 
     def get_property_observers(self, name, args=False):
@@ -662,6 +696,8 @@ cdef class EventDispatcher(ObjectWithUid):
         else:
             ps = self.__storage[name]
             observers = ps.observers
+            if observers is None:
+                return []
         return list(observers) if args else [item[0] for item in observers]
 
     def events(EventDispatcher self):
@@ -693,11 +729,19 @@ cdef class EventDispatcher(ObjectWithUid):
 
         '''
         cdef EventObservers observers = self.__event_stack[event_type]
-        if observers.dispatch(self, None, largs, kwargs, 1):
+        if observers.dispatch(self, None, largs, kwargs, 1, event_type):
             return True
 
         handler = getattr(self, event_type)
-        return handler(*largs, **kwargs)
+        tracer = dispatch_tracer
+        if tracer is None:
+            return handler(*largs, **kwargs)
+        start = default_timer()
+        try:
+            return handler(*largs, **kwargs)
+        finally:
+            tracer.record_call(self, event_type, handler,
+                               default_timer() - start)
 
     def dispatch_generic(self, basestring event_type, *largs, **kwargs):
         if event_type in self.__event_stack:
@@ -793,6 +837,58 @@ cdef class EventDispatcher(ObjectWithUid):
             ret[x] = p[x]
         return ret
 
+    def batch(self):
+        '''Return a context manager delaying the dispatch of the properties
+        changed within it. When leaving it, the observers of each changed
+        property are called once, with the last value of the property::
+
+            with widget.batch():
+                widget.x = 10
+                widget.y = 20
+                widget.size = (100, 100)
+            # here, the observers of x, y, pos, width, height and size were
+            # each called once
+
+        The observers are called in the order the properties first changed.
+        Dispatches triggered by the observers are coalesced too: for example,
+        the observers of `pos` are called once even though both `x` and `y`
+        changed. Batches can be nested, the dispatches happen at the end of
+        the outermost one. Events are never delayed.
+
+        .. versionadded:: 1.9.0
+
+        .. warning::
+
+            Within a batch, the observers are not called yet, so properties
+            depending on them, such as cached aliases or the ones set from kv
+            rules, are not updated until the end of the batch.
+        '''
+        return _PropertyBatch(self)
+
+    cdef void _commit_batch(self) except *:
+        cdef list pending = self._batch_pending
+        cdef Property prop
+        cdef PropertyStorage ps
+        cdef int i = 0
+        # the batch stays open while dispatching, so that the changes made by
+        # the observers are appended to pending instead of being dispatched
+        # several times
+        try:
+            while i < len(pending):
+                prop = pending[i]
+                i += 1
+                ps = self.__storage[prop._name]
+                ps.batch_pending = 0
+                if ps.observers is not None:
+                    ps.observers.dispatch(
+                        self, ps.value, None, None, 0, prop._name)
+        finally:
+            for prop in pending[i:]:
+                ps = self.__storage[prop._name]
+                ps.batch_pending = 0
+            self._batch_pending = None
+            self._batch_depth = 0
+
     def create_property(self, name, value=None, *largs, **kwargs):
         '''Create a new property at runtime.
 
@@ -856,6 +952,28 @@ cdef class EventDispatcher(ObjectWithUid):
             return self
 
 
+cdef class _PropertyBatch(object):
+    # context manager returned by EventDispatcher.batch()
+    cdef EventDispatcher obj
+
+    def __cinit__(self, EventDispatcher obj):
+        self.obj = obj
+
+    def __enter__(self):
+        cdef EventDispatcher obj = self.obj
+        if not obj._batch_depth:
+            obj._batch_pending = []
+        obj._batch_depth += 1
+        return obj
+
+    def __exit__(self, *largs):
+        cdef EventDispatcher obj = self.obj
+        if obj._batch_depth > 1:
+            obj._batch_depth -= 1
+        else:
+            obj._commit_batch()
+
+
 cdef class BoundCallback:
 
     def __cinit__(self, object func, tuple largs, dict kwargs, int is_ref,
@@ -1093,7 +1211,8 @@ cdef class EventObservers:
                         return f(obj, *largs, **kwargs)
 
     cdef inline int dispatch(self, object obj, object value, tuple largs,
-                             dict kwargs, int stop_on_true) except 2:
+                             dict kwargs, int stop_on_true,
+                             object name=None) except 2:
         '''Dispatches obj, value to all bound observers. If largs and/or kwargs,
         they are forwarded after obj, value. if stop_on_true, if a observer returns
         true, the function stops and returns true.
@@ -1125,12 +1244,17 @@ cdef class EventObservers:
         Each callback as it is dispatched is locked. Also, the last callback
         scheduled to be executed is immediatly locked, so that we know where to
         stop, in case new callbacks are added.
+
+        `name` is the name of the property or event, used when tracing.
         '''
         cdef BoundCallback callback, final, next
         cdef object f, result
         cdef BoundLock current_lock, last_lock
         cdef int done = 0, res = 0, reverse = self.dispatch_reverse
+        cdef object tracer = dispatch_tracer
 
+        if tracer is not None:
+            tracer.record_dispatch(obj, name)
         if reverse:  # dispatch starting from last until first
             callback = self.last_callback  # start callback
             final = self.first_callback  # last callback
@@ -1166,8 +1290,18 @@ cdef class EventObservers:
             if current_lock == unlocked:  # and lock it if unlocked
                 callback.lock = locked
 
-            result = self._dispatch(
-                f, callback.largs, callback.kwargs, obj, value, largs, kwargs)
+            if tracer is None:
+                result = self._dispatch(
+                    f, callback.largs, callback.kwargs, obj, value, largs,
+                    kwargs)
+            else:
+                start = default_timer()
+                try:
+                    result = self._dispatch(
+                        f, callback.largs, callback.kwargs, obj, value, largs,
+                        kwargs)
+                finally:
+                    tracer.record_call(obj, name, f, default_timer() - start)
 
             if current_lock == unlocked:  # now unlock/delete if it was unlocked
                 if callback.lock == deleted:
@@ -1199,3 +1333,125 @@ cdef class EventObservers:
                 callback.kwargs if callback.kwargs is not None else {},
                 callback.is_ref, callback.uid)
             callback = callback.next
+
+
+def _class_name(cls):
+    return '%s.%s' % (cls.__module__, cls.__name__)
+
+
+class DispatchTracer(object):
+    '''Records the dispatches of the properties and events, and the time spent
+    in their observers. It is created by :func:`start_tracing`, check the
+    :ref:`event-tracing` section of the module documentation.
+
+    .. versionadded:: 1.9.0
+    '''
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        '''Forget everything recorded so far.'''
+        # (class, name) -> number of dispatches
+        self._dispatches = defaultdict(int)
+        # (class, name, observer function, observer class) ->
+        # [count, total, max]
+        self._stats = {}
+
+    def record_dispatch(self, obj, name):
+        self._dispatches[(obj.__class__, name)] += 1
+
+    def record_call(self, obj, name, observer, duration):
+        # methods are recorded by function and class, not to keep the
+        # instances alive
+        owner = getattr(observer, '__self__', None)
+        key = (obj.__class__, name, getattr(observer, '__func__', observer),
+               None if owner is None else owner.__class__)
+        stats = self._stats.get(key)
+        if stats is None:
+            self._stats[key] = [1, duration, duration]
+        else:
+            stats[0] += 1
+            stats[1] += duration
+            if duration > stats[2]:
+                stats[2] = duration
+
+    def get_dispatches(self):
+        '''Return a list of `((class, name), count)` tuples, sorted by
+        decreasing number of dispatches, then by class and name. `class` is
+        the qualified name of the class of the dispatcher, and `name` the name
+        of the property or event.
+        '''
+        dispatches = [((_class_name(cls), name), count)
+                      for (cls, name), count in self._dispatches.items()]
+        dispatches.sort(key=lambda item: (-item[1], item[0]))
+        return dispatches
+
+    def get_stats(self):
+        '''Return a list of `((class, name, observer), stats)` tuples, sorted
+        by decreasing cumulative time. `observer` is the qualified name of
+        the observer, and `stats` a dict with the `count` of calls and the
+        `total` and `max` time spent in the observer, in seconds.
+        '''
+        stats = {}
+        for (cls, name, func, owner), values in self._stats.items():
+            observer = getattr(func, '__name__', None)
+            if owner is not None and observer is not None:
+                observer = '%s.%s' % (_class_name(owner), observer)
+            elif observer is not None:
+                observer = '%s.%s' % (getattr(func, '__module__', None),
+                                      getattr(func, '__qualname__', observer))
+            else:
+                observer = repr(func)
+            key = (_class_name(cls), name, observer)
+            # different observers can have the same name, e.g. lambdas
+            count, total, max_ = values
+            if key in stats:
+                count += stats[key]['count']
+                total += stats[key]['total']
+                max_ = max(max_, stats[key]['max'])
+            stats[key] = {'count': count, 'total': total, 'max': max_}
+        stats = list(stats.items())
+        stats.sort(key=lambda item: (-item[1]['total'], item[0]))
+        return stats
+
+    def dump(self, filename):
+        '''Write the dispatches and the observer stats to `filename` as
+        json.'''
+        with open(filename, 'w') as fd:
+            json.dump({'dispatches': self.get_dispatches(),
+                       'observers': self.get_stats()}, fd, indent=2)
+
+
+def start_tracing():
+    '''Start tracing the dispatches of all the properties and events, and
+    return the :class:`DispatchTracer` recording them. If tracing is already
+    started, the current tracer is returned.
+
+    .. versionadded:: 1.9.0
+    '''
+    global dispatch_tracer
+    if dispatch_tracer is None:
+        dispatch_tracer = DispatchTracer()
+    return dispatch_tracer
+
+
+def stop_tracing():
+    '''Stop tracing, and return the :class:`DispatchTracer` that was in use,
+    or None.
+
+    .. versionadded:: 1.9.0
+    '''
+    global dispatch_tracer
+    tracer = dispatch_tracer
+    dispatch_tracer = None
+    return tracer
+
+
+def get_tracer():
+    '''Return the :class:`DispatchTracer` in use, or None if tracing is not
+    started.
+
+    .. versionadded:: 1.9.0
+    '''
+    return dispatch_tracer
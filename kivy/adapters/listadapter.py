@@ -37,6 +37,12 @@ A :class:`~kivy.adapters.dictadapter.DictAdapter` is a subclass of a
     an ObjectProperty, so we need to reset it here to ListProperty). See also
     DictAdapter and its set of data = DictProperty().
 
+.. versionchanged:: 1.9.0
+    When :attr:`~ListAdapter.data` is modified in place, only the views of
+    the items after the first changed one are created again. Use the
+    `batch()` context manager of the data to make many changes at once, see
+    :class:`~kivy.properties.ListProperty`.
+
 '''
 
 __all__ = ('ListAdapter', )
@@ -392,8 +398,22 @@ class ListAdapter(Adapter, EventDispatcher):
     # [TODO] Could easily add select_all() and deselect_all().
 
     def update_for_new_data(self, *args):
-        self.delete_cache()
-        self.initialize_selection()
+        # the views of the items before the first change are still valid
+        changes = getattr(self.data, 'changes', None)
+        if changes is None:
+            start = 0
+        else:
+            start = min([change[1] for change in changes] + [len(self.data)])
+        if start == 0 or [view for view in self.selection
+                          if view.index >= start]:
+            self.delete_cache()
+            self.initialize_selection()
+            return
+
+        self.cached_views = dict([
+            (index, view) for index, view in self.cached_views.items()
+            if index < start])
+        self.check_for_empty_selection()
 
     def initialize_selection(self, *args):
         if len(self.selection) > 0:
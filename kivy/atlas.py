@@ -31,6 +31,10 @@ A file with ``<basename>.atlas`` is a json file formatted like this::
         # ...
     }
 
+If the atlas was created with rotation allowed, the rotated images have a
+5th `true` value, and their width and height are the ones of the rotated
+image in the page.
+
 Example from the Kivy ``data/images/defaulttheme.atlas``::
 
     {
@@ -96,6 +100,36 @@ As you can see, we get 2 new files: ``myatlas.atlas`` and ``myatlas-0.png``.
 
     In which case the id for ``../images/button.png`` will be ``images_button``
 
+Packing options
+~~~~~~~~~~~~~~~
+
+.. versionadded:: 1.9.0
+
+By default, the images are packed with a simple guillotine algorithm. The
+``--algorithm`` option selects ``maxrects`` (best short side fit) or
+``skyline`` (bottom-left) instead, which usually waste less space and need
+fewer atlas images. With ``--rotate``, the images may be rotated by 90 degrees
+to fit better. Instead of a fixed size, ``auto`` selects the smallest
+power-of-two size that holds all the images in one atlas image::
+
+    $ python -m kivy.atlas -- --algorithm=maxrects --rotate myatlas auto *.png
+
+The fill ratio of each atlas image is logged.
+
+Incremental and parallel builds
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+.. versionadded:: 1.9.0
+
+With ``--manifest``, the hash of the content of the images and of the options
+is recorded in a json manifest, which can be shared by several atlases. The
+next build of an atlas is skipped if nothing changed and its files are still
+there. With ``--workers``, the images are decoded and the atlas images are
+encoded by several processes::
+
+    $ python -m kivy.atlas -- --manifest=atlas.json --workers=4 \
+        myatlas 512 *.png
+
 
 How to use an Atlas
 -------------------
@@ -132,20 +166,45 @@ Manual usage of the Atlas
     ['bubble', 'bubble-red', 'button', 'button-down']
     >>> print(atlas['button'])
     <kivy.graphics.texture.TextureRegion object at 0x2404d10>
+
+.. _atlas-lazy:
+
+Lazy loading
+~~~~~~~~~~~~
+
+.. versionadded:: 1.9.0
+
+By default, all the images of an atlas are loaded and uploaded to the GPU when
+the atlas is opened. With `lazy=True`, only the ``.atlas`` file is read: an
+image is loaded the first time one of its textures is requested, and released
+when none of its textures are referenced anymore::
+
+    >>> atlas = Atlas('path/to/myatlas.atlas', lazy=True)
+    >>> print(atlas.keys())
+    ['bubble', 'bubble-red', 'button', 'button-down']
+    >>> texture = atlas['button']  # loads the image holding 'button'
+
+In lazy mode, :attr:`Atlas.textures` is left empty, as it would keep all the
+images loaded. Set the `atlas_lazy` token of the kivy section of the
+:mod:`~kivy.config` to use lazy loading for ``atlas://`` urls.
 '''
 
 __all__ = ('Atlas', )
 
 import json
-from os.path import basename, dirname, join, splitext
+from bisect import insort
+from hashlib import sha1
+from os.path import basename, dirname, exists, join, splitext
 from kivy.event import EventDispatcher
 from kivy.logger import Logger
 from kivy.properties import AliasProperty, DictProperty
+from weakref import ref
 import os
 
 
 # late import to prevent recursion
 CoreImage = None
+TextureRegion = None
 
 
 class Atlas(EventDispatcher):
@@ -169,19 +228,56 @@ class Atlas(EventDispatcher):
     to None.
     '''
 
-    def __init__(self, filename):
+    def _get_lazy(self):
+        return self._lazy
+
+    lazy = AliasProperty(_get_lazy, None)
+    '''True if the images of the atlas are loaded on demand. See
+    :ref:`atlas-lazy`.
+
+    .. versionadded:: 1.9.0
+
+    :attr:`lazy` is an :class:`~kivy.properties.AliasProperty` and defaults
+    to False.
+    '''
+
+    def __init__(self, filename, lazy=False):
         self._filename = filename
+        self._lazy = lazy
+        # region id -> (image filename, coordinates)
+        self._regions = {}
+        # weak references of the loaded images textures and regions, used in
+        # lazy mode
+        self._pages = {}
+        self._loaded = {}
         super(Atlas, self).__init__()
         self._load()
 
     def __getitem__(self, key):
-        return self.textures[key]
+        if not self._lazy:
+            return self.textures[key]
+        region = self._loaded.get(key)
+        if region is not None:
+            region = region()
+        if region is None:
+            subfilename, coords = self._regions[key]
+            region = self._get_region(self._load_page(subfilename), coords)
+            self._loaded[key] = ref(region)
+        return region
+
+    def keys(self):
+        '''Return the ids of all the textures of the atlas, loaded or not.
+
+        .. versionadded:: 1.9.0
+        '''
+        return list(self._regions.keys())
 
     def _load(self):
         # late import to prevent recursive import.
-        global CoreImage
+        global CoreImage, TextureRegion
         if CoreImage is None:
             from kivy.core.image import Image as CoreImage
+            from kivy.graphics.texture import TextureRegion
 
         # must be a name finished by .atlas ?
         filename = self._filename
@@ -192,26 +288,50 @@ class Atlas(EventDispatcher):
         with open(filename, 'r') as fd:
             meta = json.load(fd)
 
-        Logger.debug('Atlas: Need to load %d images' % len(meta))
         d = dirname(filename)
-        textures = {}
+        regions = self._regions
         for subfilename, ids in meta.items():
             subfilename = join(d, subfilename)
-            Logger.debug('Atlas: Load <%s>' % subfilename)
-
-            # load the image
-            ci = CoreImage(subfilename)
+            for meta_id, meta_coords in ids.items():
+                regions[meta_id] = subfilename, meta_coords
+        if self._lazy:
+            return
 
-            # for all the uid, load the image, get the region, and put
-            # it in our dict.
+        Logger.debug('Atlas: Need to load %d images' % len(meta))
+        textures = {}
+        for subfilename, ids in meta.items():
+            # load the image, and for all the uid, get the region and put it
+            # in our dict.
+            texture = self._load_page(join(d, subfilename))
             for meta_id, meta_coords in ids.items():
-                x, y, w, h = meta_coords
-                textures[meta_id] = ci.texture.get_region(*meta_coords)
+                textures[meta_id] = self._get_region(texture, meta_coords)
 
         self.textures = textures
 
+    def _load_page(self, subfilename):
+        # in lazy mode, the texture is only kept alive by its regions: once
+        # they are all released, the image is loaded again on the next access
+        texture = self._pages.get(subfilename)
+        if texture is not None:
+            texture = texture()
+        if texture is None:
+            Logger.debug('Atlas: Load <%s>' % subfilename)
+            texture = CoreImage(subfilename, nocache=self._lazy).texture
+            if self._lazy:
+                self._pages[subfilename] = ref(texture)
+        return texture
+
+    def _get_region(self, texture, meta_coords):
+        x, y, w, h = meta_coords[:4]
+        if len(meta_coords) > 4 and meta_coords[4]:
+            # the image was rotated to be packed
+            return TextureRegion(x, y, w, h, texture, rotated=True)
+        return texture.get_region(x, y, w, h)
+
     @staticmethod
-    def create(outname, filenames, size, padding=2, use_path=False):
+    def create(outname, filenames, size, padding=2, use_path=False,
+               algorithm='guillotine', allow_rotation=False, manifest=None,
+               workers=1):
         '''This method can be used to create an atlas manually from a set of
         images.
 
@@ -221,8 +341,10 @@ class Atlas(EventDispatcher):
                 associated images.
             `filenames`: list
                 List of filenames to put in the atlas.
-            `size`: int or list (width, height)
-                Size of the atlas image.
+            `size`: int, list (width, height) or 'auto'
+                Size of the atlas image. If 'auto', the smallest power-of-two
+                size that holds all the images in one image is used, up to
+                4096x4096.
             `padding`: int, defaults to 2
                 Padding to put around each image.
 
@@ -245,6 +367,25 @@ class Atlas(EventDispatcher):
                 ``../data/tiles/green_grass.png``, the id will be
                 ``green_grass``. If `use_path` is True, it will be
                 ``data_tiles_green_grass``.
+            `algorithm`: str, defaults to 'guillotine'
+                Packing algorithm, one of 'guillotine', 'maxrects' (best
+                short side fit) or 'skyline' (bottom-left). 'maxrects'
+                usually produces the densest atlases.
+            `allow_rotation`: bool, defaults to False
+                If True, images may be rotated by 90 degrees to fit better.
+                They are stored with a 5th `true` value in the ``.atlas``
+                file, and the :class:`Atlas` gives them back unrotated.
+            `manifest`: str, defaults to None
+                Filename of a json build manifest. If given, the atlas is
+                only created if the content of the images or the parameters
+                changed since the last build recorded in the manifest.
+            `workers`: int, defaults to 1
+                Number of processes used to decode the images and encode the
+                atlas images.
+
+            .. versionchanged:: 1.9.0
+                Parameters algorithm, allow_rotation, manifest and workers
+                added. The size can be 'auto'.
 
             .. versionchanged:: 1.8.0
                 Parameter use_path added
@@ -258,80 +399,76 @@ class Atlas(EventDispatcher):
             Logger.critical('Atlas: Imaging/PIL are missing')
             raise
 
-        if isinstance(size, (tuple, list)):
-            size_w, size_h = map(int, size)
-        else:
-            size_w = size_h = int(size)
+        if algorithm not in _packers:
+            raise ValueError('Atlas: unknown packing algorithm %r' %
+                             algorithm)
+
+        # skip the build if nothing changed since the last one
+        build_entry = None
+        if manifest is not None:
+            digest = _get_digest(filenames, (
+                size, padding, use_path, algorithm, allow_rotation))
+            entries = _read_manifest(manifest)
+            meta = _get_uptodate_meta(outname, entries.get(outname), digest)
+            if meta is not None:
+                Logger.info('Atlas: %s.atlas is up to date' % outname)
+                return '%s.atlas' % outname, meta
+            build_entry = manifest, digest
+
+        pool = None
+        if workers > 1:
+            from multiprocessing import Pool
+            pool = Pool(workers)
+
+        try:
+            return Atlas._create(
+                Image, pool, outname, filenames, size, padding, use_path,
+                algorithm, allow_rotation, build_entry)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
+    @staticmethod
+    def _create(Image, pool, outname, filenames, size, padding, use_path,
+                algorithm, allow_rotation, build_entry):
         # open all of the images
-        ims = list()
-        for f in filenames:
-            fp = open(f, 'rb')
-            im = Image.open(fp)
-            im.load()
-            fp.close()
-            ims.append((f, im))
-
-        # sort by image area
-        ims = sorted(ims, key=lambda im: im[1].size[0] * im[1].size[1],
-                     reverse=True)
-
-        # free boxes are empty space in our output image set
-        # the freebox tuple format is: outidx, x, y, w, h
-        freeboxes = [(0, 0, 0, size_w, size_h)]
-        numoutimages = 1
+        if pool is not None:
+            ims = list(zip(filenames, pool.map(_load_image, filenames)))
+        else:
+            ims = [(f, _load_image(f)) for f in filenames]
 
-        # full boxes are areas where we have placed images in the atlas
-        # the full box tuple format is: image, outidx, x, y, w, h, filename
-        fullboxes = []
+        sizes = [(im.size[0] + padding, im.size[1] + padding)
+                 for f, im in ims]
+        if size == 'auto':
+            size_w, size_h = _find_size(sizes, algorithm, allow_rotation)
+        elif isinstance(size, (tuple, list)):
+            size_w, size_h = map(int, size)
+        else:
+            size_w = size_h = int(size)
 
-        # do the actual atlasing by sticking the largest images we can
-        # have into the smallest valid free boxes
-        for imageinfo in ims:
-            im = imageinfo[1]
-            imw, imh = im.size
-            imw += padding
-            imh += padding
-            if imw > size_w or imh > size_h:
+        for (f, im), (imw, imh) in zip(ims, sizes):
+            if ((imw > size_w or imh > size_h) and not (
+                    allow_rotation and imh <= size_w and imw <= size_h)):
                 Logger.error(
                     'Atlas: image %s (%d by %d) is larger than the atlas size!'
-                    % (imageinfo[0], imw, imh))
+                    % (f, imw, imh))
                 return
 
-            inserted = False
-            while not inserted:
-                for idx, fb in enumerate(freeboxes):
-                    # find the smallest free box that will contain this image
-                    if fb[3] >= imw and fb[4] >= imh:
-                        # we found a valid spot! Remove the current
-                        # freebox, and split the leftover space into (up to)
-                        # two new freeboxes
-                        del freeboxes[idx]
-                        if fb[3] > imw:
-                            freeboxes.append((
-                                fb[0], fb[1] + imw, fb[2],
-                                fb[3] - imw, imh))
-
-                        if fb[4] > imh:
-                            freeboxes.append((
-                                fb[0], fb[1], fb[2] + imh,
-                                fb[3], fb[4] - imh))
-
-                        # keep this sorted!
-                        freeboxes = sorted(freeboxes,
-                                           key=lambda fb: fb[3] * fb[4])
-                        fullboxes.append((im,
-                                          fb[0], fb[1] + padding,
-                                          fb[2] + padding, imw - padding,
-                                          imh - padding, imageinfo[0]))
-                        inserted = True
-                        break
-
-                if not inserted:
-                    # oh crap - there isn't room in any of our free
-                    # boxes, so we have to add a new output image
-                    freeboxes.append((numoutimages, 0, 0, size_w, size_h))
-                    numoutimages += 1
+        # do the actual atlasing
+        placements, numoutimages = _pack(
+            sizes, size_w, size_h, algorithm, allow_rotation)
+
+        # full boxes are areas where we have placed images in the atlas
+        # the full box tuple format is: image, outidx, x, y, w, h, filename,
+        # rotated
+        fullboxes = []
+        for (f, im), (outidx, x, y, rotated) in zip(ims, placements):
+            if rotated:
+                im = im.transpose(Image.ROTATE_90)
+            w, h = im.size
+            fullboxes.append((im, outidx, x + padding, y + padding, w, h, f,
+                              rotated))
 
         # now that we've figured out where everything goes, make the output
         # images and blit the source images to the approriate locations
@@ -339,11 +476,13 @@ class Atlas(EventDispatcher):
                                                                  size_h))
         outimages = [Image.new('RGBA', (size_w, size_h))
                      for i in range(0, int(numoutimages))]
+        filled = [0] * int(numoutimages)
         for fb in fullboxes:
             x, y = fb[2], fb[3]
             out = outimages[fb[1]]
             out.paste(fb[0], (fb[2], fb[3]))
             w, h = fb[0].size
+            filled[fb[1]] += w * h
             if padding > 1:
                 out.paste(fb[0].crop((0, 0, w, 1)), (x, y - 1))
                 out.paste(fb[0].crop((0, h - 1, w, h)), (x, y + h))
@@ -351,8 +490,16 @@ class Atlas(EventDispatcher):
                 out.paste(fb[0].crop((w - 1, 0, w, h)), (x + w, y))
 
         # save the output images
-        for idx, outimage in enumerate(outimages):
-            outimage.save('%s-%d.png' % (outname, idx))
+        outfilenames = ['%s-%d.png' % (outname, idx)
+                        for idx in range(len(outimages))]
+        if pool is not None:
+            pool.map(_save_image, zip(outimages, outfilenames))
+        else:
+            for outimage, fn in zip(outimages, outfilenames):
+                _save_image((outimage, fn))
+        for idx in range(len(outimages)):
+            Logger.info('Atlas: image %d filled at %.1f%%' % (
+                idx, 100. * filled[idx] / (size_w * size_h)))
 
         # write out an json file that says where everything ended up
         meta = {}
@@ -379,15 +526,301 @@ class Atlas(EventDispatcher):
                 uid = splitext(basename(fb[6]))[0]
 
             x, y, w, h = fb[2:6]
-            d[uid] = x, size_h - y - h, w, h
+            if fb[7]:
+                d[uid] = x, size_h - y - h, w, h, True
+            else:
+                d[uid] = x, size_h - y - h, w, h
 
         outfn = '%s.atlas' % outname
         with open(outfn, 'w') as fd:
             json.dump(meta, fd)
 
+        # record the build in the manifest
+        if build_entry is not None:
+            filename, digest = build_entry
+            entries = _read_manifest(filename)
+            entries[outname] = digest
+            with open(filename, 'w') as fd:
+                json.dump(entries, fd, indent=2, sort_keys=True)
+
         return outfn, meta
 
 
+def _load_image(filename):
+    # module level function to be usable from a multiprocessing pool
+    from PIL import Image
+    fp = open(filename, 'rb')
+    im = Image.open(fp)
+    im.load()
+    fp.close()
+    return im
+
+
+def _save_image(args):
+    image, filename = args
+    image.save(filename)
+
+
+def _get_digest(filenames, options):
+    # hash of the content and names of the images, and of the options
+    digest = sha1(repr(options).encode('utf-8'))
+    for filename in filenames:
+        digest.update(filename.encode('utf-8'))
+        with open(filename, 'rb') as fd:
+            digest.update(sha1(fd.read()).digest())
+    return digest.hexdigest()
+
+
+def _read_manifest(filename):
+    if not exists(filename):
+        return {}
+    try:
+        with open(filename, 'r') as fd:
+            return json.load(fd)
+    except ValueError:
+        Logger.warning('Atlas: invalid manifest %s, ignored' % filename)
+        return {}
+
+
+def _get_uptodate_meta(outname, entry, digest):
+    # return the meta of the existing atlas if it was built from digest and
+    # all its files are there, None otherwise
+    outfn = '%s.atlas' % outname
+    if entry != digest or not exists(outfn):
+        return None
+    try:
+        with open(outfn, 'r') as fd:
+            meta = json.load(fd)
+    except ValueError:
+        return None
+    d = dirname(outname)
+    for fn in meta:
+        if not exists(join(d, fn)):
+            return None
+    return meta
+
+
+class _GuillotinePacker(object):
+    # free boxes are empty space in the page, split in two when an image is
+    # placed. The smallest free box that can contain the image is used.
+
+    def __init__(self, width, height):
+        # the free box tuple format is: area, x, y, w, h
+        self.freeboxes = [(width * height, 0, 0, width, height)]
+
+    def find(self, w, h, allow_rotation):
+        for idx, fb in enumerate(self.freeboxes):
+            if fb[3] >= w and fb[4] >= h:
+                return (fb[0], ), (idx, w, h), False
+            if allow_rotation and fb[3] >= h and fb[4] >= w:
+                return (fb[0], ), (idx, h, w), True
+
+    def place(self, placement):
+        idx, w, h = placement
+        _, x, y, fw, fh = self.freeboxes.pop(idx)
+        # split the leftover space into (up to) two new freeboxes, and keep
+        # the list sorted by area
+        if fw > w:
+            insort(self.freeboxes, ((fw - w) * h, x + w, y, fw - w, h))
+        if fh > h:
+            insort(self.freeboxes, (fw * (fh - h), x, y + h, fw, fh - h))
+        return x, y
+
+
+class _MaxRectsPacker(object):
+    # free rects are all the maximal empty rectangles of the page, they
+    # overlap. The free rect leaving the shortest side is used (best short
+    # side fit).
+
+    def __init__(self, width, height):
+        self.freerects = [(0, 0, width, height)]
+
+    def find(self, w, h, allow_rotation):
+        best = None
+        for x, y, fw, fh in self.freerects:
+            if fw >= w and fh >= h:
+                leftw, lefth = fw - w, fh - h
+                score = (min(leftw, lefth), max(leftw, lefth))
+                if best is None or score < best[0]:
+                    best = score, (x, y, w, h), False
+            if allow_rotation and fw >= h and fh >= w:
+                leftw, lefth = fw - h, fh - w
+                score = (min(leftw, lefth), max(leftw, lefth))
+                if best is None or score < best[0]:
+                    best = score, (x, y, h, w), True
+        return best
+
+    def place(self, placement):
+        x, y, w, h = placement
+        right, top = x + w, y + h
+        freerects = []
+        for fx, fy, fw, fh in self.freerects:
+            fright, ftop = fx + fw, fy + fh
+            if x >= fright or right <= fx or y >= ftop or top <= fy:
+                freerects.append((fx, fy, fw, fh))
+                continue
+            # split the intersected free rect in up to 4 maximal rects
+            if x > fx:
+                freerects.append((fx, fy, x - fx, fh))
+            if right < fright:
+                freerects.append((right, fy, fright - right, fh))
+            if y > fy:
+                freerects.append((fx, fy, fw, y - fy))
+            if top < ftop:
+                freerects.append((fx, top, fw, ftop - top))
+
+        # remove the free rects contained in another one
+        freerects.sort(key=lambda r: r[2] * r[3], reverse=True)
+        self.freerects = kept = []
+        for r in freerects:
+            rx, ry, rright, rtop = r[0], r[1], r[0] + r[2], r[1] + r[3]
+            for k in kept:
+                if (k[0] <= rx and k[1] <= ry and k[0] + k[2] >= rright and
+                        k[1] + k[3] >= rtop):
+                    break
+            else:
+                kept.append(r)
+        return x, y
+
+
+class _SkylinePacker(object):
+    # the skyline is the top edge of the placed images, as a list of
+    # segments. Images are put where their top is the lowest (bottom-left).
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # segment tuple format is: x, y, w
+        self.skyline = [(0, 0, width)]
+
+    def _fit(self, idx, w, h):
+        # return the y where an image of width w starting at segment idx
+        # would be placed, or None if it doesn't fit
+        skyline = self.skyline
+        x = skyline[idx][0]
+        if x + w > self.width:
+            return None
+        y = 0
+        left = w
+        while left > 0:
+            sx, sy, sw = skyline[idx]
+            y = max(y, sy)
+            if y + h > self.height:
+                return None
+            left -= sw
+            idx += 1
+        return y
+
+    def find(self, w, h, allow_rotation):
+        best = None
+        for idx in range(len(self.skyline)):
+            for rw, rh, rotated in ((w, h, False), (h, w, True)):
+                if rotated and (not allow_rotation or w == h):
+                    continue
+                y = self._fit(idx, rw, rh)
+                if y is None:
+                    continue
+                score = (y + rh, self.skyline[idx][2])
+                if best is None or score < best[0]:
+                    best = score, (idx, y, rw, rh), rotated
+        return best
+
+    def place(self, placement):
+        idx, y, w, h = placement
+        skyline = self.skyline
+        x = skyline[idx][0]
+        right = x + w
+        # the segments under the image are replaced by the image top
+        end = idx
+        while end < len(skyline) and skyline[end][0] < right:
+            end += 1
+        sx, sy, sw = skyline[end - 1]
+        segments = [(x, y + h, w)]
+        if sx + sw > right:
+            segments.append((right, sy, sx + sw - right))
+        skyline[idx:end] = segments
+
+        # merge the neighbour segments of the same height
+        merged = [skyline[0]]
+        for segment in skyline[1:]:
+            last = merged[-1]
+            if last[1] == segment[1]:
+                merged[-1] = (last[0], last[1], last[2] + segment[2])
+            else:
+                merged.append(segment)
+        self.skyline = merged
+        return x, y
+
+
+_packers = {
+    'guillotine': _GuillotinePacker,
+    'maxrects': _MaxRectsPacker,
+    'skyline': _SkylinePacker}
+
+
+def _pack(sizes, width, height, algorithm, allow_rotation):
+    # place the rects of sizes in pages of width x height. Returns the list
+    # of (page, x, y, rotated) in the order of sizes, and the number of pages.
+    packer_cls = _packers[algorithm]
+    pages = []
+    placements = [None] * len(sizes)
+
+    # place the largest images first
+    order = sorted(range(len(sizes)),
+                   key=lambda i: sizes[i][0] * sizes[i][1], reverse=True)
+    for i in order:
+        w, h = sizes[i]
+        best = None
+        for page, packer in enumerate(pages):
+            found = packer.find(w, h, allow_rotation)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found[0], found[1], found[2], page
+        if best is None:
+            # there isn't room in any of our pages, add a new one
+            pages.append(packer_cls(width, height))
+            found = pages[-1].find(w, h, allow_rotation)
+            if found is None:
+                raise ValueError('Atlas: rect %dx%d is larger than the atlas'
+                                 ' size' % (w, h))
+            best = found[0], found[1], found[2], len(pages) - 1
+        _, placement, rotated, page = best
+        x, y = pages[page].place(placement)
+        placements[i] = page, x, y, rotated
+    return placements, len(pages)
+
+
+def _find_size(sizes, algorithm, allow_rotation, max_size=4096):
+    # find the smallest power-of-two size (w, h) that holds all the sizes in
+    # one page. Fall back to max_size x max_size.
+    area = sum([w * h for w, h in sizes])
+    if allow_rotation:
+        min_w = min_h = max([min(w, h) for w, h in sizes] + [1])
+        longest = max([max(w, h) for w, h in sizes] + [1])
+    else:
+        min_w = max([w for w, h in sizes] + [1])
+        min_h = max([h for w, h in sizes] + [1])
+        longest = 1
+    candidates = []
+    w = 1
+    while w <= max_size:
+        h = 1
+        while h <= max_size:
+            if (w * h >= area and w >= min_w and h >= min_h and
+                    max(w, h) >= longest and max(w, h) <= 2 * min(w, h)):
+                candidates.append((w * h, abs(w - h), -w, h))
+            h *= 2
+        w *= 2
+    for _, _, w, h in sorted(candidates):
+        w = -w
+        try:
+            placements, pages = _pack(sizes, w, h, algorithm, allow_rotation)
+        except ValueError:
+            continue
+        if pages == 1:
+            return w, h
+    return max_size, max_size
+
+
 if __name__ == '__main__':
     """ Main line program. Process command line arguments
     to make a new atlas. """
@@ -399,8 +832,9 @@ if __name__ == '__main__':
     # arguments from this line. That is all arguments up to the first '--'
     if len(argv) < 3:
         print('Usage: python -m kivy.atlas [-- [--use-path] '
-              '[--padding=2]] <outname> '
-              '<size|512x256> <img1.png> [<img2.png>, ...]')
+              '[--padding=2] [--algorithm=guillotine|maxrects|skyline] '
+              '[--rotate] [--manifest=<file>] [--workers=<n>]] <outname> '
+              '<size|512x256|auto> <img1.png> [<img2.png>, ...]')
         sys.exit(1)
 
     options = {'use_path': False}
@@ -410,6 +844,14 @@ if __name__ == '__main__':
             options['use_path'] = True
         elif option.startswith('--padding='):
             options['padding'] = int(option.split('=', 1)[-1])
+        elif option.startswith('--algorithm='):
+            options['algorithm'] = option.split('=', 1)[-1]
+        elif option == '--rotate':
+            options['allow_rotation'] = True
+        elif option.startswith('--manifest='):
+            options['manifest'] = option.split('=', 1)[-1]
+        elif option.startswith('--workers='):
+            options['workers'] = int(option.split('=', 1)[-1])
         elif option[:2] == '--':
             print('Unknown option {}'.format(option))
             sys.exit(1)
@@ -419,12 +861,14 @@ if __name__ == '__main__':
 
     outname = argv[0]
     try:
-        if 'x' in argv[1]:
-            size = map(int, argv[1].split('x', 1))
+        if argv[1] == 'auto':
+            size = 'auto'
+        elif 'x' in argv[1]:
+            size = list(map(int, argv[1].split('x', 1)))
         else:
             size = int(argv[1])
     except ValueError:
-        print('Error: size must be an integer or <integer>x<integer>')
+        print('Error: size must be an integer, <integer>x<integer> or auto')
         sys.exit(1)
 
     filenames = [fname for fnames in argv[2:] for fname in glob(fnames)]
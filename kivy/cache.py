@@ -3,8 +3,8 @@ Cache manager
 =============
 
 The cache manager can be used to store python objects attached to a unique
-key. The cache can be controlled in two ways: with a object limit or a
-timeout.
+key. The cache can be controlled in three ways: with a object limit, a size
+limit or a timeout.
 
 For example, we can create a new cache with a limit of 10 objects and a
 timeout of 5 seconds::
@@ -22,14 +22,85 @@ timeout of 5 seconds::
 
 If the instance is NULL, the cache may have trashed it because you've
 not used the label for 5 seconds and you've reach the limit.
+
+Eviction
+--------
+
+.. versionadded:: 1.9.0
+
+The objects of a category are kept in least recently used order: when the
+`limit` of a category is reached, the objects that were not accessed for the
+longest time are removed first.
+
+A category can also be limited by the number of bytes it holds, with the
+`max_size` parameter. The size of an object is given to :meth:`Cache.append`,
+or estimated for textures, image data and loaded images (width x height x
+bytes per pixel, or the length of the raw data)::
+
+    # keep at most 64MB of textures
+    Cache.register('mytextures', max_size=64 * 1024 * 1024)
+
+Objects that timed out are removed once per second. Only the objects that
+were not accessed for longer than the shortest timeout of the category are
+visited.
+
+Statistics and memory pressure
+------------------------------
+
+.. versionadded:: 1.9.0
+
+:meth:`Cache.get_stats` returns, per category, the number of objects and bytes
+held, the hit and miss rates of :meth:`Cache.get` and the number of evicted
+objects.
+
+On memory limited devices, :meth:`Cache.trim` frees memory by removing the
+least recently used objects across several categories. It is called with the
+categories of :attr:`Cache.trim_categories` when the
+:class:`~kivy.core.window.WindowBase` dispatches `on_memorywarning`. You can
+also call it when the application is paused::
+
+    class MyApp(App):
+        def on_pause(self):
+            Cache.trim()
+            return True
 '''
 
 __all__ = ('Cache', )
 
 from os import environ
+from collections import OrderedDict
+from fnmatch import fnmatch
+from heapq import merge
+from itertools import islice
+from math import ceil
 from kivy.logger import Logger
 from kivy.clock import Clock
 
+# bytes per pixel of the texture and image formats
+_fmt_bpp = {
+    'rgba': 4, 'bgra': 4, 'argb': 4, 'abgr': 4, 'rgb': 3, 'bgr': 3,
+    'luminance_alpha': 2, 'luminance': 1, 'alpha': 1, 'red': 1}
+
+
+def _get_size(obj):
+    # estimate the number of bytes held by an object, 0 if unknown
+    data = getattr(obj, '_data', None)
+    if isinstance(data, (list, tuple)):
+        # image loaded by ImageLoaderBase
+        return sum([_get_size(d) for d in data])
+    data = getattr(obj, 'data', None)
+    if isinstance(data, (bytes, bytearray)):
+        # ImageData
+        return len(data)
+    fmt = getattr(obj, 'colorfmt', None)
+    if fmt is None:
+        return 0
+    width = getattr(obj, 'width', None)
+    height = getattr(obj, 'height', None)
+    if not isinstance(width, int) or not isinstance(height, int):
+        return 0
+    return width * height * _fmt_bpp.get(str(fmt).lower(), 4)
+
 
 class Cache(object):
     '''See module documentation for more information.
@@ -38,8 +109,16 @@ class Cache(object):
     _categories = {}
     _objects = {}
 
+    trim_categories = ['kv.texture', 'kv.image', 'kv.loader', 'kv.lang',
+                       'textinput.*']
+    '''Categories trimmed by :meth:`trim` when no categories are given. The
+    names can contain shell-style wildcards.
+
+    .. versionadded:: 1.9.0
+    '''
+
     @staticmethod
-    def register(category, limit=None, timeout=None):
+    def register(category, limit=None, timeout=None, max_size=None):
         '''Register a new category in the cache with the specified limit.
 
         :Parameters:
@@ -51,17 +130,30 @@ class Cache(object):
             `timeout` : double (optional)
                 Time after which to delete the object if it has not been used.
                 If None, no timeout is applied.
+            `max_size` : int (optional)
+                Maximum number of bytes held by the objects of the cache.
+                If None, no limit is applied.
+
+        .. versionchanged:: 1.9.0
+            `max_size` was added.
         '''
         Cache._categories[category] = {
             'limit': limit,
-            'timeout': timeout}
-        Cache._objects[category] = {}
+            'timeout': timeout,
+            'max_size': max_size,
+            # shortest timeout of the objects, used for expiring
+            'min_timeout': timeout,
+            'size': 0,
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0}
+        Cache._objects[category] = OrderedDict()
         Logger.debug(
-            'Cache: register <%s> with limit=%s, timeout=%ss' %
-            (category, str(limit), str(timeout)))
+            'Cache: register <%s> with limit=%s, timeout=%ss, max_size=%s' %
+            (category, str(limit), str(timeout), str(max_size)))
 
     @staticmethod
-    def append(category, key, obj, timeout=None):
+    def append(category, key, obj, timeout=None, size=None):
         '''Add a new object to the cache.
 
         :Parameters:
@@ -74,6 +166,13 @@ class Cache(object):
             `timeout` : double (optional)
                 Time after which to delete the object if it has not been used.
                 If None, no timeout is applied.
+            `size` : int (optional)
+                Number of bytes held by the object. If None, it is estimated
+                for textures and images, and 0 for other objects.
+
+        .. versionchanged:: 1.9.0
+            `size` was added. The least recently used objects are removed
+            when the limit or the max_size of the category is reached.
         '''
         #check whether obj should not be cached first
         if getattr(obj, '_no_cache', False):
@@ -84,15 +183,28 @@ class Cache(object):
             Logger.warning('Cache: category <%s> not exist' % category)
             return
         timeout = timeout or cat['timeout']
-        # FIXME: activate purge when limit is hit
-        #limit = cat['limit']
-        #if limit is not None and len(Cache._objects[category]) >= limit:
-        #    Cache._purge_oldest(category)
-        Cache._objects[category][key] = {
+        if timeout is not None and (cat['min_timeout'] is None or
+                                    timeout < cat['min_timeout']):
+            cat['min_timeout'] = timeout
+        if size is None:
+            size = _get_size(obj)
+        objects = Cache._objects[category]
+        old = objects.pop(key, None)
+        if old is not None:
+            cat['size'] -= old['size']
+        objects[key] = {
             'object': obj,
             'timeout': timeout,
+            'size': size,
             'lastaccess': Clock.get_time(),
             'timestamp': Clock.get_time()}
+        cat['size'] += size
+
+        limit = cat['limit']
+        max_size = cat['max_size']
+        if ((limit is not None and len(objects) > limit) or
+                (max_size is not None and cat['size'] > max_size)):
+            Cache._purge_oldest(category)
 
     @staticmethod
     def get(category, key, default=None):
@@ -107,10 +219,20 @@ class Cache(object):
                 Default value to be returned if the key is not found.
         '''
         try:
-            Cache._objects[category][key]['lastaccess'] = Clock.get_time()
-            return Cache._objects[category][key]['object']
-        except Exception:
+            objects = Cache._objects[category]
+            cat = Cache._categories[category]
+        except KeyError:
+            return default
+        try:
+            # move the object at the end, as the most recently used
+            item = objects.pop(key)
+        except (KeyError, TypeError):
+            cat['misses'] += 1
             return default
+        objects[key] = item
+        item['lastaccess'] = Clock.get_time()
+        cat['hits'] += 1
+        return item['object']
 
     @staticmethod
     def get_timestamp(category, key, default=None):
@@ -159,31 +281,119 @@ class Cache(object):
         '''
         try:
             if key is not None:
-                del Cache._objects[category][key]
+                item = Cache._objects[category].pop(key)
+                Cache._categories[category]['size'] -= item['size']
             else:
-                Cache._objects[category] = {}
+                Cache._objects[category] = OrderedDict()
+                Cache._categories[category]['size'] = 0
         except Exception:
             pass
 
     @staticmethod
-    def _purge_oldest(category, maxpurge=1):
-        print('PURGE', category)
-        import heapq
-        heap_list = []
-        for key in Cache._objects[category]:
-            obj = Cache._objects[category][key]
-            if obj['lastaccess'] == obj['timestamp']:
-                continue
-            heapq.heappush(heap_list, (obj['lastaccess'], key))
-            print('<<<', obj['lastaccess'])
-        n = 0
-        while n < maxpurge:
-            try:
-                lastaccess, key = heapq.heappop(heap_list)
-                print('=>', key, lastaccess, Clock.get_time())
-            except Exception:
-                return
-            del Cache._objects[category][key]
+    def get_stats(category=None):
+        '''Get the statistics of a category.
+
+        :Parameters:
+            `category` : str (optional)
+                Identifier of the category. If None, a dict of the statistics
+                of all the categories, keyed by category, is returned.
+
+        :Returns:
+            A dict with the number of objects (`count`) and bytes (`size`)
+            held, the `limit` and `max_size` of the category, the number of
+            `hits` and `misses` of :meth:`get`, the `hit_rate` and `miss_rate`
+            (0 to 1) and the number of `evictions`. None if the category
+            doesn't exist.
+
+        .. versionadded:: 1.9.0
+        '''
+        if category is None:
+            return dict([(name, Cache.get_stats(name))
+                         for name in Cache._categories])
+        cat = Cache._categories.get(category)
+        if cat is None:
+            return None
+        hits = cat['hits']
+        misses = cat['misses']
+        requests = float(hits + misses)
+        return {
+            'count': len(Cache._objects[category]),
+            'size': cat['size'],
+            'limit': cat['limit'],
+            'max_size': cat['max_size'],
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / requests if requests else 0.,
+            'miss_rate': misses / requests if requests else 0.,
+            'evictions': cat['evictions']}
+
+    @staticmethod
+    def trim(fraction=1., categories=None):
+        '''Remove the least recently used objects across categories, e.g. to
+        react to memory pressure.
+
+        :Parameters:
+            `fraction` : float, defaults to 1.
+                Fraction (0 to 1) of the objects of the categories to remove.
+            `categories` : list (optional)
+                Names of the categories to trim, they can contain shell-style
+                wildcards. Defaults to :attr:`trim_categories`.
+
+        :Returns:
+            The number of removed objects.
+
+        .. versionadded:: 1.9.0
+        '''
+        if categories is None:
+            categories = Cache.trim_categories
+        names = [name for name in Cache._categories
+                 if any([fnmatch(name, pattern) for pattern in categories])]
+        count = int(ceil(fraction * sum(
+            [len(Cache._objects[name]) for name in names])))
+        if count <= 0:
+            return 0
+
+        # merge the categories by last access, oldest first
+        def entries(index, objects):
+            for n, (key, item) in enumerate(objects.items()):
+                yield item['lastaccess'], index, n, key
+
+        oldest = list(islice(merge(*[
+            entries(index, Cache._objects[name])
+            for index, name in enumerate(names)]), count))
+        for _, index, _, key in oldest:
+            name = names[index]
+            cat = Cache._categories[name]
+            item = Cache._objects[name].pop(key)
+            cat['size'] -= item['size']
+            cat['evictions'] += 1
+        Logger.debug('Cache: trimmed %d objects from %s' % (count, names))
+        return count
+
+    @staticmethod
+    def _restore(category, objects):
+        # put back objects saved before purging the category, the ones added
+        # since then take precedence. Used when reloading the GL context.
+        objects.update(Cache._objects[category])
+        Cache._objects[category] = objects
+        Cache._categories[category]['size'] = sum(
+            [item['size'] for item in objects.values()])
+
+    @staticmethod
+    def _purge_oldest(category):
+        # remove the least recently used objects until the category fits in
+        # its limits. The most recent object is always kept.
+        cat = Cache._categories[category]
+        objects = Cache._objects[category]
+        limit = cat['limit']
+        max_size = cat['max_size']
+        while len(objects) > 1 and (
+                (limit is not None and len(objects) > limit) or
+                (max_size is not None and cat['size'] > max_size)):
+            key = next(iter(objects))
+            item = objects.pop(key)
+            cat['size'] -= item['size']
+            cat['evictions'] += 1
 
     @staticmethod
     def _purge_by_timeout(dt):
@@ -192,7 +402,8 @@ class Cache(object):
         for category in Cache._objects:
             if category not in Cache._categories:
                 continue
-            timeout = Cache._categories[category]['timeout']
+            cat = Cache._categories[category]
+            timeout = cat['timeout']
             if timeout is not None and dt > timeout:
                 # XXX got a lag ! that may be because the frame take lot of
                 # time to draw. and the timeout is not adapted to the current
@@ -200,34 +411,55 @@ class Cache(object):
                 # ie: if the timeout is 1 sec, and framerate go to 0.7, newly
                 # object added will be automaticly trashed.
                 timeout *= 2
-                Cache._categories[category]['timeout'] = timeout
+                cat['timeout'] = timeout
                 continue
 
-            for key in list(Cache._objects[category].keys())[:]:
-                lastaccess = Cache._objects[category][key]['lastaccess']
-                objtimeout = Cache._objects[category][key]['timeout']
+            # the objects are sorted by last access. Once an object is more
+            # recent than the shortest timeout, the next ones are too.
+            min_timeout = cat['min_timeout']
+            if min_timeout is None:
+                continue
+            objects = Cache._objects[category]
+            expired = []
+            for key, item in objects.items():
+                age = curtime - item['lastaccess']
+                if age <= min_timeout:
+                    break
 
                 # take the object timeout if available
-                if objtimeout is not None:
-                    timeout = objtimeout
+                objtimeout = item['timeout']
+                if objtimeout is None:
+                    objtimeout = timeout
 
                 # no timeout, cancel
-                if timeout is None:
+                if objtimeout is None:
                     continue
 
-                if curtime - lastaccess > timeout:
-                    del Cache._objects[category][key]
+                if age > objtimeout:
+                    expired.append(key)
+
+            for key in expired:
+                item = objects.pop(key)
+                cat['size'] -= item['size']
+                cat['evictions'] += 1
 
     @staticmethod
     def print_usage():
         '''Print the cache usage to the console.'''
         print('Cache usage :')
         for category in Cache._categories:
-            print(' * %s : %d / %s, timeout=%s' % (
-                category.capitalize(),
-                len(Cache._objects[category]),
-                str(Cache._categories[category]['limit']),
-                str(Cache._categories[category]['timeout'])))
+            cat = Cache._categories[category]
+            print(' * %s : %d / %s, timeout=%s, size=%d / %s, hits=%d, '
+                  'misses=%d, evictions=%d' % (
+                      category.capitalize(),
+                      len(Cache._objects[category]),
+                      str(cat['limit']),
+                      str(cat['timeout']),
+                      cat['size'],
+                      str(cat['max_size']),
+                      cat['hits'],
+                      cat['misses'],
+                      cat['evictions']))
 
 if 'KIVY_DOC_INCLUDE' not in environ:
     # install the schedule clock for purging
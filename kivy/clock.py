@@ -157,6 +157,83 @@ Even if x and y changes within one frame, the callback is only run once.
     :meth:`ClockBase.create_trigger` also has a timeout parameter that
     behaves exactly like :meth:`ClockBase.schedule_once`.
 
+.. _clock-tasks:
+
+Budgeted tasks
+--------------
+
+.. versionadded:: 1.9.0
+
+Heavy work, like building thousands of widgets or processing a large data set,
+blocks the frame it runs in. :meth:`ClockBase.schedule_task` queues work that
+is run after the scheduled events of each frame, without spending more than
+:attr:`ClockBase.task_budget` seconds per frame on it. A task is either a
+callable, called once, or a generator which yields between small units of
+work::
+
+    def build_rows(self):
+        for item in self.items:
+            self.add_widget(Row(item=item))
+            yield
+
+    Clock.schedule_task(build_rows(self))
+
+Each time the task yields, the clock checks the time spent in this frame, and
+resumes the task either right away or in the next frame. A callable which
+returns a generator is iterated the same way, so `Clock.schedule_task(
+self.build_rows)` works too. Tasks with a higher `priority` are run first,
+tasks of the same priority are run in the order they were scheduled.
+
+At least one step of a task is run per frame, so a single step should be
+short, whatever the budget.
+
+.. _clock-profiling:
+
+Profiling
+---------
+
+.. versionadded:: 1.9.0
+
+When a frame drops, :meth:`ClockBase.get_fps` doesn't tell which callback was
+responsible. The clock can record, per callback, the number of calls and the
+cumulative and maximum time spent in it, as well as the slowest ticks with
+the time spent in each of their callbacks::
+
+    Clock.start_profiling()
+    # ... run the application for a while ...
+    profiler = Clock.stop_profiling()
+    for name, stats in profiler.get_stats():
+        print(name, stats['count'], stats['total'], stats['max'])
+    profiler.dump('clock_profile.json')
+
+Callbacks are identified by their qualified name, e.g.
+`kivy.uix.label.Label.texture_update`. When profiling is not started, the
+overhead is a single attribute check per called callback.
+
+.. _clock-scheduler:
+
+Scheduler
+---------
+
+.. versionadded:: 1.9.0
+
+By default, :class:`ClockBase` visits every scheduled event on each frame to
+check if it is due. When an application schedules thousands of events, most of
+them due seconds from now, this becomes costly. The `clock_scheduler` token
+of the `kivy` section of the configuration selects the class used for the
+:attr:`Clock`:
+
+- `default`: :class:`ClockBase`, events are checked on every frame.
+- `heap`: :class:`ClockBaseHeap`, events are ordered by deadline and only the
+  due events are visited on each frame.
+
+For example::
+
+    from kivy.config import Config
+    Config.set('kivy', 'clock_scheduler', 'heap')
+
+As with other tokens, it must be set before :mod:`kivy.clock` is imported.
+
 Threading
 ----------
 
@@ -207,15 +284,19 @@ Note, in the code above, thread 1 or thread 2 could be the kivy thread, not
 just an external thread.
 '''
 
-__all__ = ('Clock', 'ClockBase', 'ClockEvent', 'mainthread')
+__all__ = ('Clock', 'ClockBase', 'ClockBaseHeap', 'ClockEvent', 'ClockTask',
+           'ClockProfiler', 'mainthread')
 
 from sys import platform
 from os import environ
+from types import GeneratorType
 from functools import wraps, partial
+from heapq import heappush, heappop, heappushpop, heapify
 from kivy.context import register_context
 from kivy.weakmethod import WeakMethod
 from kivy.config import Config
 from kivy.logger import Logger
+import json
 import time
 
 try:
@@ -273,6 +354,14 @@ def _hash(cb):
     return (id(cb) & 0xFF00) >> 8
 
 
+def _callback_key(cb):
+    # key of the callback in the clock index, the same for all the bound
+    # methods of an object
+    if hasattr(cb, '__self__') and cb.__self__ is not None:
+        return id(cb.__self__)
+    return id(cb)
+
+
 class ClockEvent(object):
     ''' A class that describes a callback scheduled with kivy's :attr:`Clock`.
     This class is never created by the user; instead, kivy creates and returns
@@ -295,8 +384,15 @@ class ClockEvent(object):
         self._is_triggered = trigger
         self._last_dt = starttime
         self._dt = 0.
+        self._key = _callback_key(callback)
+        # list in which the event is stored by the clock. A canceled event is
+        # only dropped from it during the next processing pass.
+        self._bucket = None
+        self._heap_entry = None
+        # position of the event in the clock index, -1 when not indexed
+        self._index_pos = -1
         if trigger:
-            clock._events[cid].append(self)
+            clock._add_event(self)
 
     def __call__(self, *largs):
         ''' Schedules the callback associated with this instance.
@@ -307,7 +403,7 @@ class ClockEvent(object):
             self._is_triggered = True
             # update starttime
             self._last_dt = self.clock._last_tick
-            self.clock._events[self.cid].append(self)
+            self.clock._add_event(self)
             return True
 
     def get_callback(self):
@@ -325,13 +421,14 @@ class ClockEvent(object):
 
     def cancel(self):
         ''' Cancels the callback if it was scheduled to be called.
+
+        .. versionchanged:: 1.9.0
+            Canceling is done in constant time, whatever the number of
+            scheduled events.
         '''
         if self._is_triggered:
             self._is_triggered = False
-            try:
-                self.clock._events[self.cid].remove(self)
-            except ValueError:
-                pass
+            self.clock._remove_event(self)
 
     def release(self):
         self.weak_callback = WeakMethod(self.callback)
@@ -371,7 +468,11 @@ class ClockEvent(object):
                 pass
 
         # call the callback
-        ret = callback(self._dt)
+        profiler = self.clock._profiler
+        if profiler is None:
+            ret = callback(self._dt)
+        else:
+            ret = profiler.call(callback, self._dt)
 
         # if the user returns False explicitly, remove the event
         if loop and ret is False:
@@ -387,13 +488,174 @@ class ClockEvent(object):
         return '<ClockEvent callback=%r>' % self.get_callback()
 
 
+class ClockTask(object):
+    ''' A class that describes a task scheduled with
+    :meth:`ClockBase.schedule_task`. Like :class:`ClockEvent`, it is never
+    created by the user.
+
+    .. versionadded:: 1.9.0
+    '''
+
+    def __init__(self, clock, task, priority):
+        self.clock = clock
+        self.priority = priority
+        if hasattr(task, '__next__') or hasattr(task, 'next'):
+            self.callback = None
+            self._iterator = task
+        elif callable(task):
+            self.callback = task
+            self._iterator = None
+        else:
+            raise ValueError('task must be a callable or an iterator, '
+                             'got %s' % task)
+        self._is_done = False
+
+    @property
+    def is_done(self):
+        '''True if the task has finished or was canceled.'''
+        return self._is_done
+
+    def cancel(self):
+        '''Cancels the task. If it is a generator, it won't be resumed.
+        '''
+        self._is_done = True
+
+    def step(self):
+        # run one unit of work, return True if there is more to do
+        iterator = self._iterator
+        if iterator is None:
+            ret = self.callback()
+            self.callback = None
+            if not isinstance(ret, GeneratorType):
+                return False
+            self._iterator = ret
+            return True
+        try:
+            next(iterator)
+        except StopIteration:
+            return False
+        return True
+
+    def __repr__(self):
+        return '<ClockTask task=%r>' % (self._iterator or self.callback)
+
+
+def _callback_name(cb):
+    func = getattr(cb, 'func', None)
+    if isinstance(cb, partial) and func is not None:
+        return 'partial(%s)' % _callback_name(func)
+    obj = getattr(cb, '__self__', None)
+    name = getattr(cb, '__name__', None)
+    if obj is not None and name is not None:
+        cls = obj if isinstance(obj, type) else type(obj)
+        return '%s.%s.%s' % (cls.__module__, cls.__name__, name)
+    if name is not None:
+        return '%s.%s' % (getattr(cb, '__module__', None),
+                          getattr(cb, '__qualname__', name))
+    return repr(cb)
+
+
+class ClockProfiler(object):
+    '''Records the time spent in the callbacks called by a
+    :class:`ClockBase`. It is created by :meth:`ClockBase.start_profiling`,
+    check the :ref:`clock-profiling` section of the module documentation.
+
+    :parameters:
+
+        `slowest_ticks`: int
+            Number of ticks kept by :meth:`get_slowest_ticks`.
+
+    .. versionadded:: 1.9.0
+    '''
+
+    def __init__(self, slowest_ticks=10):
+        self.slowest_ticks = slowest_ticks
+        self.reset()
+
+    def reset(self):
+        '''Forget everything recorded so far.'''
+        # name -> [count, total, max]
+        self._stats = {}
+        # min-heap of (duration, counter, frame, callbacks)
+        self._slowest = []
+        self._counter = 0
+        self._tick_start = None
+        self._tick_frame = None
+        self._tick_callbacks = None
+
+    def call(self, callback, dt):
+        '''Call `callback` with `dt` and record the time spent in it.'''
+        start = _default_time()
+        try:
+            return callback(dt)
+        finally:
+            duration = _default_time() - start
+            name = _callback_name(callback)
+            stats = self._stats.get(name)
+            if stats is None:
+                self._stats[name] = [1, duration, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                if duration > stats[2]:
+                    stats[2] = duration
+            if self._tick_callbacks is not None:
+                self._tick_callbacks.append((name, duration))
+
+    def begin_tick(self, frame):
+        self._tick_start = _default_time()
+        self._tick_frame = frame
+        self._tick_callbacks = []
+
+    def end_tick(self):
+        if self._tick_callbacks is None:
+            return
+        duration = _default_time() - self._tick_start
+        self._counter += 1
+        record = (duration, self._counter, self._tick_frame,
+                  self._tick_callbacks)
+        self._tick_callbacks = None
+        if len(self._slowest) < self.slowest_ticks:
+            heappush(self._slowest, record)
+        elif self.slowest_ticks:
+            heappushpop(self._slowest, record)
+
+    def get_stats(self):
+        '''Return a list of `(name, stats)` tuples, sorted by decreasing
+        cumulative time. `stats` is a dict with the `count` of calls and the
+        `total` and `max` time spent in the callback, in seconds.
+        '''
+        stats = [(name, {'count': count, 'total': total, 'max': max_})
+                 for name, (count, total, max_) in self._stats.items()]
+        stats.sort(key=lambda item: item[1]['total'], reverse=True)
+        return stats
+
+    def get_slowest_ticks(self):
+        '''Return the slowest ticks, slowest first, as a list of dicts with
+        the `frame` number, the `duration` of the tick and the list of
+        `(name, duration)` of the `callbacks` called during the tick.
+        '''
+        return [{'frame': frame, 'duration': duration,
+                 'callbacks': list(callbacks)}
+                for duration, _, frame, callbacks in
+                sorted(self._slowest, reverse=True)]
+
+    def dump(self, filename):
+        '''Write the stats and the slowest ticks to `filename` as json.'''
+        with open(filename, 'w') as fd:
+            json.dump({'callbacks': self.get_stats(),
+                       'slowest_ticks': self.get_slowest_ticks()}, fd,
+                      indent=2)
+
+
 class ClockBase(_ClockBase):
     '''A clock object with event support.
     '''
     __slots__ = ('_dt', '_last_fps_tick', '_last_tick', '_fps', '_rfps',
                  '_start_tick', '_fps_counter', '_rfps_counter', '_events',
-                 '_frames', '_frames_displayed',
-                 '_max_fps', 'max_iteration')
+                 '_frames', '_frames_displayed', '_callbacks',
+                 '_tasks', '_task_counter', '_profiler',
+                 '_max_fps', 'max_iteration', 'task_budget')
 
     MIN_SLEEP = 0.005
     SLEEP_UNDERSHOOT = MIN_SLEEP - 0.001
@@ -410,6 +672,12 @@ class ClockBase(_ClockBase):
         self._frames = 0
         self._frames_displayed = 0
         self._events = [[] for i in range(256)]
+        # scheduled events indexed by their callback key
+        self._callbacks = {}
+        # heap of [-priority, counter, task]
+        self._tasks = []
+        self._task_counter = 0
+        self._profiler = None
         self._max_fps = float(Config.getint('graphics', 'maxfps'))
 
         #: .. versionadded:: 1.0.5
@@ -418,6 +686,11 @@ class ClockBase(_ClockBase):
         #:     relayout.
         self.max_iteration = 10
 
+        #: .. versionadded:: 1.9.0
+        #:     Maximum time, in seconds, spent per frame running the tasks
+        #:     scheduled with :meth:`schedule_task`. Defaults to 0.004.
+        self.task_budget = 0.004
+
     @property
     def frametime(self):
         '''Time spent between the last frame and the current frame
@@ -480,17 +753,68 @@ class ClockBase(_ClockBase):
             self._rfps_counter = 0
 
         # process event
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.begin_tick(self._frames)
         self._process_events()
+        self._process_tasks()
+        if profiler is not None:
+            profiler.end_tick()
 
         return self._dt
 
     def tick_draw(self):
         '''Tick the drawing counter.
         '''
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.begin_tick(self._frames)
         self._process_events_before_frame()
+        if profiler is not None:
+            profiler.end_tick()
         self._rfps_counter += 1
         self._frames_displayed += 1
 
+    @property
+    def profiler(self):
+        '''The :class:`ClockProfiler` in use, or None if profiling is not
+        started.
+
+        .. versionadded:: 1.9.0
+        '''
+        return self._profiler
+
+    def start_profiling(self, slowest_ticks=10):
+        '''Start recording the time spent in each callback. Check the
+        :ref:`clock-profiling` section of the module documentation.
+
+        :parameters:
+
+            `slowest_ticks`: int
+                Number of slowest ticks to keep. Defaults to 10.
+
+        :returns:
+
+            The new :class:`ClockProfiler` instance.
+
+        .. versionadded:: 1.9.0
+        '''
+        self._profiler = ClockProfiler(slowest_ticks)
+        return self._profiler
+
+    def stop_profiling(self):
+        '''Stop recording the time spent in each callback.
+
+        :returns:
+
+            The :class:`ClockProfiler` instance that was in use, or None.
+
+        .. versionadded:: 1.9.0
+        '''
+        profiler = self._profiler
+        self._profiler = None
+        return profiler
+
     def get_fps(self):
         '''Get the current average FPS calculated by the clock.
         '''
@@ -586,16 +910,138 @@ class ClockBase(_ClockBase):
         '''
         if isinstance(callback, ClockEvent):
             callback.cancel()
+            return
+        events = self._callbacks.get(_callback_key(callback))
+        if not events:
+            return
+        for ev in events[:]:
+            if ev.get_callback() == callback:
+                ev.cancel()
+                if not all:
+                    break
+
+    def unschedule_many(self, callbacks, all=True):
+        '''Remove many previously scheduled events at once, e.g. all the
+        events of a widget tree that is being discarded.
+
+        :parameters:
+
+            `callbacks`: iterable
+                The :class:`ClockEvent` instances and callables to unschedule.
+            `all`: bool
+                Same as for :meth:`unschedule`. Defaults to `True`.
+
+        .. versionadded:: 1.9.0
+        '''
+        unschedule = self.unschedule
+        for callback in callbacks:
+            unschedule(callback, all)
+
+    def schedule_task(self, task, priority=0):
+        '''Schedule a task to be run after the events of the next frames,
+        within the per-frame :attr:`task_budget`. Check the
+        :ref:`clock-tasks` section of the module documentation for more
+        information.
+
+        :parameters:
+
+            `task`: callable or iterator
+                A callable, called without arguments, or an iterator (e.g. a
+                generator) advanced one step at a time. If the callable
+                returns a generator, it is iterated as well.
+            `priority`: int
+                Tasks with a higher priority are run first. Defaults to 0.
+
+        :returns:
+
+            A :class:`ClockTask` instance, which can be canceled.
+
+        .. versionadded:: 1.9.0
+        '''
+        task = ClockTask(self, task, priority)
+        self._task_counter += 1
+        heappush(self._tasks, [-priority, self._task_counter, task])
+        return task
+
+    def _process_tasks(self):
+        tasks = self._tasks
+        if not tasks:
+            return
+        deadline = _default_time() + self.task_budget
+        while tasks:
+            # pop it, a step might schedule a task with a higher priority
+            entry = heappop(tasks)
+            task = entry[2]
+            if task._is_done:
+                continue
+            more = False
+            try:
+                more = task.step()
+            finally:
+                if more and not task._is_done:
+                    heappush(tasks, entry)
+                else:
+                    task._is_done = True
+            if _default_time() >= deadline:
+                break
+
+    def _add_to_index(self, event):
+        callbacks = self._callbacks
+        key = event._key
+        events = callbacks.get(key)
+        if events is None:
+            events = callbacks[key] = []
+        event._index_pos = len(events)
+        events.append(event)
+
+    def _remove_from_index(self, event):
+        # swap the event with the last one of its list, so removing it doesn't
+        # depend on the number of events of the callback
+        pos = event._index_pos
+        if pos == -1:
+            return
+        event._index_pos = -1
+        callbacks = self._callbacks
+        key = event._key
+        events = callbacks.get(key)
+        if events is None or pos >= len(events) or events[pos] is not event:
+            # the index was reset meanwhile
+            return
+        last = events.pop()
+        if last is not event:
+            events[pos] = last
+            last._index_pos = pos
+        elif not events:
+            del callbacks[key]
+
+    def _add_event(self, event):
+        # called by the event when it gets scheduled
+        self._add_to_index(event)
+        events = self._events[event.cid]
+        # a canceled event may still be in its bucket
+        if event._bucket is not events:
+            event._bucket = events
+            events.append(event)
+
+    def _remove_event(self, event):
+        # called by the event when it gets canceled. The event is left in its
+        # bucket, it'll be dropped by _drop_canceled_events().
+        self._remove_from_index(event)
+
+    @staticmethod
+    def _drop_canceled_events(events):
+        for event in events:
+            if not event._is_triggered:
+                break
         else:
-            if all:
-                for ev in self._events[_hash(callback)][:]:
-                    if ev.get_callback() == callback:
-                        ev.cancel()
+            return
+        alive = []
+        for event in events:
+            if event._is_triggered:
+                alive.append(event)
             else:
-                for ev in self._events[_hash(callback)][:]:
-                    if ev.get_callback() == callback:
-                        ev.cancel()
-                        break
+                event._bucket = None
+        events[:] = alive
 
     def _release_references(self):
         # call that function to release all the direct reference to any
@@ -607,12 +1053,16 @@ class ClockBase(_ClockBase):
                     event.release()
 
     def _process_events(self):
+        remove = self._remove_event
+        drop_canceled_events = self._drop_canceled_events
         for events in self._events:
-            remove = events.remove
+            if not events:
+                continue
             for event in events[:]:
-                # event may be already removed from original list
-                if event in events:
+                # event may be already canceled by a previous callback
+                if event._is_triggered:
                     event.tick(self._last_tick, remove)
+            drop_canceled_events(events)
 
     def _process_events_before_frame(self):
         found = True
@@ -629,15 +1079,14 @@ class ClockBase(_ClockBase):
 
             # search event that have timeout = -1
             found = False
+            remove = self._remove_event
             for events in self._events:
-                remove = events.remove
                 for event in events[:]:
-                    if event.timeout != -1:
+                    # event may be already canceled
+                    if event.timeout != -1 or not event._is_triggered:
                         continue
                     found = True
-                    # event may be already removed from original list
-                    if event in events:
-                        event.tick(self._last_tick, remove)
+                    event.tick(self._last_tick, remove)
 
     time = staticmethod(partial(_default_time))
 
@@ -645,6 +1094,135 @@ ClockBase.time.__doc__ = ('Proxy method for time.time() or time.clock(), '
                           'whichever is more suitable for the running OS')
 
 
+class ClockBaseHeap(ClockBase):
+    '''A :class:`ClockBase` that keeps the scheduled events ordered by
+    deadline in a min-heap. On each tick, only the events that are due are
+    visited, instead of every scheduled event. This is faster when many
+    events are scheduled far in the future, e.g. thousands of intervals.
+
+    The public API and the semantics of :meth:`~ClockBase.schedule_once`,
+    :meth:`~ClockBase.schedule_interval`, :meth:`~ClockBase.unschedule` and
+    :meth:`~ClockBase.create_trigger` are the same as with :class:`ClockBase`.
+    It is selected with the `clock_scheduler` token of the `kivy` section of
+    the configuration, see :ref:`clock-scheduler`.
+
+    .. versionadded:: 1.9.0
+    '''
+    __slots__ = ('_heap', '_heap_counter', '_heap_dead', '_events_before_frame',
+                 '_events_to_release')
+
+    def __init__(self):
+        super(ClockBaseHeap, self).__init__()
+        # entries are [deadline, counter, event]. A canceled entry gets its
+        # event set to None and is dropped when it reaches the top.
+        self._heap = []
+        self._heap_counter = 0
+        self._heap_dead = 0
+        # events with a timeout of -1 are not ordered, they are always due
+        self._events_before_frame = []
+        # events holding a direct reference to their callback
+        self._events_to_release = []
+
+    def _add_event(self, event):
+        self._add_to_index(event)
+        if event.callback is not None:
+            self._events_to_release.append(event)
+        if event.timeout == -1:
+            events = self._events_before_frame
+            if event._bucket is not events:
+                event._bucket = events
+                events.append(event)
+            return
+        self._heap_counter += 1
+        entry = [event._last_dt + event.timeout, self._heap_counter, event]
+        event._heap_entry = entry
+        heappush(self._heap, entry)
+
+    def _remove_event(self, event):
+        self._remove_from_index(event)
+        entry = event._heap_entry
+        if entry is not None:
+            event._heap_entry = None
+            entry[2] = None
+            self._heap_dead += 1
+            heap = self._heap
+            if self._heap_dead > 64 and self._heap_dead * 2 > len(heap):
+                heap[:] = [e for e in heap if e[2] is not None]
+                heapify(heap)
+                self._heap_dead = 0
+
+    def _release_references(self):
+        events = self._events_to_release
+        if not events:
+            return
+        for event in events:
+            if event.callback is not None:
+                event.release()
+        del events[:]
+
+    def _tick_event(self, event, curtime):
+        event.tick(curtime, self._remove_event)
+        # an interval event (or one which wasn't due yet) is still scheduled,
+        # but was popped from the heap, push it back with its new deadline
+        if (event._is_triggered and event._heap_entry is None and
+                event.timeout != -1):
+            self._heap_counter += 1
+            entry = [event._last_dt + event.timeout, self._heap_counter,
+                     event]
+            event._heap_entry = entry
+            heappush(self._heap, entry)
+
+    def _process_events(self):
+        curtime = self._last_tick
+
+        events = self._events_before_frame
+        if events:
+            for event in events[:]:
+                if event._is_triggered:
+                    event.tick(curtime, self._remove_event)
+            self._drop_canceled_events(events)
+
+        # pop all the due events before calling them, so that the events
+        # scheduled from a callback are only processed in the next tick
+        heap = self._heap
+        limit = curtime + 0.005
+        due = []
+        while heap and heap[0][0] <= limit:
+            entry = heappop(heap)
+            event = entry[2]
+            if event is None:
+                self._heap_dead -= 1
+                continue
+            event._heap_entry = None
+            due.append(event)
+
+        tick_event = self._tick_event
+        for event in due:
+            # event may be already canceled by a previous callback
+            if event._is_triggered and event._heap_entry is None:
+                tick_event(event, curtime)
+
+    def _process_events_before_frame(self):
+        count = self.max_iteration
+        events = self._events_before_frame
+        while True:
+            self._drop_canceled_events(events)
+            if not events:
+                break
+            count -= 1
+            if count == -1:
+                Logger.critical(
+                    'Clock: Warning, too much iteration done before'
+                    ' the next frame. Check your code, or increase'
+                    ' the Clock.max_iteration attribute')
+                break
+
+            for event in events[:]:
+                # event may be already removed from original list
+                if event._is_triggered:
+                    event.tick(self._last_tick, self._remove_event)
+
+
 def mainthread(func):
     '''Decorator that will schedule the call of the function for the next
     available frame in the mainthread. It can be useful when you use
@@ -674,4 +1252,10 @@ if 'KIVY_DOC_INCLUDE' in environ:
     #: Instance of :class:`ClockBase`.
     Clock = None
 else:
-    Clock = register_context('Clock', ClockBase)
+    _clock_classes = {'default': ClockBase, 'heap': ClockBaseHeap}
+    _clock_scheduler = Config.get('kivy', 'clock_scheduler')
+    if _clock_scheduler not in _clock_classes:
+        Logger.warning('Clock: Unknown clock_scheduler %r, using the '
+                       'default one' % _clock_scheduler)
+        _clock_scheduler = 'default'
+    Clock = register_context('Clock', _clock_classes[_clock_scheduler])
@@ -45,6 +45,19 @@ Available configuration tokens
 
 :kivy:
 
+    `atlas_lazy`: int, 0 or 1
+        If 1, the images of the atlases loaded with ``atlas://`` urls are
+        only loaded when one of their textures is used. See
+        :ref:`atlas-lazy`.
+    `clock_scheduler`: string, one of 'default' or 'heap'
+        Scheduler used by the :attr:`~kivy.clock.Clock`. See
+        :ref:`clock-scheduler`.
+    `kv_cache`: int, 0 or 1
+        If 1, the parsed kv files and strings are cached on disk, in the
+        kivy home directory. Defaults to 0. See :ref:`kv-cache`.
+    `kv_delayed_expressions`: int, 0 or 1
+        If 1, the kv expressions of the widget properties are recomputed
+        once per frame, before drawing. See :ref:`kv-delayed-expressions`.
     `desktop`: int, 0 or 1
         This option controls desktop OS specific features, such as enabling
         drag-able scroll-bar in scroll views, disabling of bubbles in
@@ -234,6 +247,10 @@ Available configuration tokens
     The `fake` option of `fullscreen` in the graphics section has been
     deprecated, use the `borderless` option instead.
     `pause_on_minimize` has been added to the kivy section.
+    `clock_scheduler` has been added to the kivy section.
+    `atlas_lazy` has been added to the kivy section.
+    `kv_cache` has been added to the kivy section.
+    `kv_delayed_expressions` has been added to the kivy section.
 
 .. versionchanged:: 1.8.0
     `systemanddock` and `systemandmulti` has been added as possible values for
@@ -274,7 +291,7 @@ from weakref import ref
 _is_rpi = exists('/opt/vc/include/bcm_host.h')
 
 # Version number of current configuration format
-KIVY_CONFIG_VERSION = 12
+KIVY_CONFIG_VERSION = 16
 
 Config = None
 '''Kivy configuration object. Its :attr:`~kivy.config.ConfigParser.name` is
@@ -744,6 +761,18 @@ if not environ.get('KIVY_DOC_INCLUDE'):
         elif version == 11:
             Config.setdefault('kivy', 'pause_on_minimize', '0')
 
+        elif version == 12:
+            Config.setdefault('kivy', 'clock_scheduler', 'default')
+
+        elif version == 13:
+            Config.setdefault('kivy', 'atlas_lazy', '0')
+
+        elif version == 14:
+            Config.setdefault('kivy', 'kv_cache', '0')
+
+        elif version == 15:
+            Config.setdefault('kivy', 'kv_delayed_expressions', '0')
+
         #elif version == 1:
         #   # add here the command for upgrading from configuration 0 to 1
         #
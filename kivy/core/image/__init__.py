@@ -44,6 +44,7 @@ from kivy.event import EventDispatcher
 from kivy.core import core_register_libs
 from kivy.logger import Logger
 from kivy.cache import Cache
+from kivy.config import Config
 from kivy.clock import Clock
 from kivy.atlas import Atlas
 from kivy.resources import resource_find
@@ -396,10 +397,14 @@ class ImageLoader(object):
             afn = resource_find(afn)
             if not afn:
                 raise Exception('Unable to found %r atlas' % afn)
-            atlas = Atlas(afn)
+            atlas = Atlas(afn, lazy=Config.getboolean('kivy', 'atlas_lazy'))
             Cache.append('kv.atlas', rfn, atlas)
-            # first time, fill our texture cache.
-            for nid, texture in atlas.textures.items():
+            # first time, fill our texture cache. A lazy atlas only loads the
+            # requested texture.
+            textures = atlas.textures
+            if atlas.lazy:
+                textures = {uid: atlas[uid]}
+            for nid, texture in textures.items():
                 fn = 'atlas://%s/%s' % (rfn, nid)
                 cid = '{}|{:d}|{:d}'.format(fn, False, 0)
                 Cache.append('kv.texture', cid, texture)
@@ -14,12 +14,14 @@ from os.path import join, exists
 from os import getcwd
 
 from kivy.core import core_select_lib
+from kivy.cache import Cache
 from kivy.clock import Clock
 from kivy.config import Config
 from kivy.logger import Logger
 from kivy.base import EventLoop, stopTouchApp
 from kivy.modules import Modules
 from kivy.event import EventDispatcher
+from kivy.lang import Builder
 from kivy.properties import ListProperty, ObjectProperty, AliasProperty, \
     NumericProperty, OptionProperty, StringProperty, BooleanProperty
 from kivy.utils import platform, reify
@@ -251,6 +253,10 @@ class WindowBase(EventDispatcher):
 
         `on_dropfile`: str
             Fired when a file is dropped on the application.
+        `on_memorywarning`:
+            Fired when the system is low on memory.
+
+            .. versionadded:: 1.9.0
 
     '''
 
@@ -512,7 +518,8 @@ class WindowBase(EventDispatcher):
                   'on_mouse_down', 'on_mouse_move', 'on_mouse_up',
                   'on_keyboard', 'on_key_down', 'on_key_up', 'on_dropfile',
                   'on_request_close', 'on_joy_axis', 'on_joy_hat',
-                  'on_joy_ball', 'on_joy_button_down', "on_joy_button_up")
+                  'on_joy_ball', 'on_joy_button_down', "on_joy_button_up",
+                  'on_memorywarning')
 
     def __new__(cls, **kwargs):
         if cls.__instance is None:
@@ -791,6 +798,10 @@ class WindowBase(EventDispatcher):
             size=self._update_childsize,
             pos=self._update_childsize)
 
+        # Apply the rules of the widget if its build was deferred.
+        if widget._build_pending is not None:
+            Builder.apply_deferred(widget)
+
     def remove_widget(self, widget):
         '''Remove a widget from a window
         '''
@@ -1137,6 +1148,20 @@ class WindowBase(EventDispatcher):
         '''
         pass
 
+    def on_memorywarning(self):
+        '''Event called when the system is low on memory. By default, the
+        caches of :attr:`~kivy.cache.Cache.trim_categories` are emptied with
+        :meth:`~kivy.cache.Cache.trim`.
+
+        .. warning::
+
+            This event currently works with the sdl2 window provider.
+
+        .. versionadded:: 1.9.0
+        '''
+        Logger.info('Window: Low memory, trim the cache')
+        Cache.trim()
+
     @reify
     def dpi(self):
         '''Return the DPI of the screen. If the implementation doesn't support
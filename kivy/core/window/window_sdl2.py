@@ -345,6 +345,9 @@ class WindowSDL(WindowBase):
                 if Config.getboolean('kivy', 'pause_on_minimize'):
                     self.do_pause()
 
+            elif action == 'app_lowmemory':
+                self.dispatch('on_memorywarning')
+
             elif action == 'joyaxismotion':
                 stickid, axisid, value = args
                 self.dispatch('on_joy_axis', stickid, axisid, value)
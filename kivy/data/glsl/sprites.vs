@@ -0,0 +1,10 @@
+$HEADER$
+
+/* color of the sprite, see kivy.graphics.SpriteBatch */
+attribute vec4     vColor;
+
+void main (void) {
+  frag_color = vColor * color * vec4(1.0, 1.0, 1.0, opacity);
+  tex_coord0 = vTexCoords0;
+  gl_Position = projection_mat * modelview_mat * vec4(vPosition.xy, 0.0, 1.0);
+}
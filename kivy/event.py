@@ -3,10 +3,15 @@
 # conflict. We have one conflict with pygame.event and kivy.event => Both are
 # python extension and have the same "initevent" symbol. So right now, just
 # rename this one.
-__all__ = ('EventDispatcher', 'ObjectWithUid', 'Observable')
+__all__ = ('EventDispatcher', 'ObjectWithUid', 'Observable',
+           'DispatchTracer', 'start_tracing', 'stop_tracing', 'get_tracer')
 
 import kivy._event
 __doc__ = kivy._event.__doc__
 EventDispatcher = kivy._event.EventDispatcher
 ObjectWithUid = kivy._event.ObjectWithUid
 Observable = kivy._event.Observable
+DispatchTracer = kivy._event.DispatchTracer
+start_tracing = kivy._event.start_tracing
+stop_tracing = kivy._event.stop_tracing
+get_tracer = kivy._event.get_tracer
@@ -3,10 +3,14 @@ Geometry utilities
 ==================
 
 This module contains some helper functions for geometric calculations.
+
+.. versionchanged:: 1.9.0
+    :class:`BoxIndex` was added.
 '''
 
-__all__ = ('circumcircle', 'minimum_bounding_circle')
+__all__ = ('circumcircle', 'minimum_bounding_circle', 'BoxIndex')
 
+from math import floor, sqrt
 from kivy.vector import Vector
 
 
@@ -119,3 +123,89 @@ def minimum_bounding_circle(points):
 
     # find the circumcenter for triangle given by P,Q,R
     return circumcircle(P, Q, R)
+
+
+class BoxIndex(object):
+    '''Uniform grid index of axis aligned boxes, to find the boxes
+    containing a point without testing all of them.
+
+    The area covered by the boxes is divided in cells of the average box size,
+    and each box is stored in the cells it overlaps. A query only tests the
+    boxes of the cell of the point. Boxes much larger than the average are
+    kept apart and always tested.
+
+    .. versionadded:: 1.9.0
+
+    :Parameters:
+        `boxes` : list
+            A list of boxes (4 tuple with x, y, right, top coordinates).
+
+    .. code-block:: python
+
+        >>> index = BoxIndex([(0, 0, 10, 10), (5, 5, 20, 20)])
+        >>> index.query(7, 7)
+        [0, 1]
+    '''
+
+    __slots__ = ('boxes', 'cells', 'large', 'x', 'y', 'cell_width',
+                 'cell_height')
+
+    # boxes overlapping more cells than this are tested on every query
+    max_box_cells = 16
+
+    def __init__(self, boxes):
+        self.boxes = boxes = list(boxes)
+        self.cells = cells = {}
+        self.large = large = []
+        self.x = self.y = 0
+        self.cell_width = self.cell_height = 1.
+        if not boxes:
+            return
+
+        self.x = x0 = min([box[0] for box in boxes])
+        self.y = y0 = min([box[1] for box in boxes])
+        count = float(len(boxes))
+        cw = sum([box[2] - box[0] for box in boxes]) / count
+        ch = sum([box[3] - box[1] for box in boxes]) / count
+        # empty boxes give no hint, use the side of a cell holding one box on
+        # average
+        side = sqrt(max(max([box[2] for box in boxes]) - x0, 1.) *
+                    max(max([box[3] for box in boxes]) - y0, 1.) / count)
+        self.cell_width = cw = cw if cw > 0 else side
+        self.cell_height = ch = ch if ch > 0 else side
+
+        max_box_cells = self.max_box_cells
+        for i, (x, y, right, top) in enumerate(boxes):
+            cx1 = int(floor((x - x0) / cw))
+            cy1 = int(floor((y - y0) / ch))
+            cx2 = int(floor((right - x0) / cw))
+            cy2 = int(floor((top - y0) / ch))
+            if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > max_box_cells:
+                large.append(i)
+                continue
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    key = (cx, cy)
+                    cell = cells.get(key)
+                    if cell is None:
+                        cells[key] = [i]
+                    else:
+                        cell.append(i)
+
+    def query(self, x, y):
+        '''Return the sorted indices of the boxes containing the point (x, y).
+        The borders of a box are part of the box, as in
+        :meth:`~kivy.uix.widget.Widget.collide_point`.
+        '''
+        boxes = self.boxes
+        key = (int(floor((x - self.x) / self.cell_width)),
+               int(floor((y - self.y) / self.cell_height)))
+        result = []
+        for indices in (self.cells.get(key, ()), self.large):
+            for i in indices:
+                bx, by, right, top = boxes[i]
+                if bx <= x <= right and by <= y <= top:
+                    result.append(i)
+        if self.large:
+            result.sort()
+        return result
@@ -94,7 +94,8 @@ from kivy.graphics.context_instructions import BindTexture, Color, \
     PopMatrix, PushMatrix, Rotate, Scale, Translate, LoadIdentity, \
     UpdateNormalMatrix, gl_init_resources
 from kivy.graphics.vertex_instructions import Bezier, BorderImage, Ellipse, \
-    GraphicException, Line, Mesh, Point, Quad, Rectangle, Triangle
+    GraphicException, Line, Mesh, Point, Quad, Rectangle, SpriteBatch, \
+    Triangle
 from kivy.graphics.stencil_instructions import StencilPop, StencilPush, \
     StencilUse, StencilUnUse
 from kivy.graphics.gl_instructions import ClearColor, ClearBuffers
@@ -109,7 +110,8 @@ __all__ = (Bezier.__name__, BindTexture.__name__, BorderImage.__name__,
            Line.__name__, MatrixInstruction.__name__, Mesh.__name__,
            Point.__name__, PopMatrix.__name__, PushMatrix.__name__,
            Quad.__name__, Rectangle.__name__, RenderContext.__name__,
-           Rotate.__name__, Scale.__name__, StencilPop.__name__,
+           Rotate.__name__, Scale.__name__, SpriteBatch.__name__,
+           StencilPop.__name__,
            StencilPush.__name__, StencilUse.__name__,
            StencilUnUse.__name__, Translate.__name__, Triangle.__name__,
            VertexInstruction.__name__, ClearColor.__name__,
@@ -4,6 +4,8 @@ cdef class Buffer:
     cdef int i_free
     cdef long block_size
     cdef long block_count
+    cdef long dirty_start
+    cdef long dirty_stop
 
     cdef void clear(self)
     cdef void grow(self, long block_count)
@@ -14,4 +16,6 @@ cdef class Buffer:
     cdef void *pointer(self)
     cdef void *offset_pointer(self, int offset)
     cdef void update(self, int index, void* blocks, int count)
+    cdef void mark_dirty(self, long start, long stop)
+    cdef void mark_clean(self)
 
@@ -4,6 +4,9 @@ cdef class Buffer:
     '''
     The Buffer class is designed to manage a very fast list of fixed size
     blocks. You can easily add and remove data from the buffer.
+
+    The range of blocks written since the last :meth:`mark_clean` is kept in
+    dirty_start and dirty_stop, so that only this range can be uploaded.
     '''
     def __cinit__(self):
         self.data = NULL
@@ -11,6 +14,8 @@ cdef class Buffer:
         self.block_size = 0
         self.block_count = 0
         self.l_free = NULL
+        self.dirty_start = 0
+        self.dirty_stop = 0
 
     def __dealloc__(self):
         if self.data != NULL:
@@ -90,6 +95,7 @@ cdef class Buffer:
 
             # Copy content
             memcpy(<char *>(self.data) + (block * self.block_size), p, self.block_size)
+            self.mark_dirty(block, block + 1)
 
             # Push the current block as indices
             if indices != NULL:
@@ -110,6 +116,27 @@ cdef class Buffer:
         blocks.
         '''
         memcpy(<char *>(self.data) + (index * self.block_size), blocks, self.block_size * count)
+        self.mark_dirty(index, index + count)
+
+    cdef void mark_dirty(self, long start, long stop):
+        '''Extend the dirty range to include the blocks from *start* to
+        *stop*.
+        '''
+        if start >= stop:
+            return
+        if self.dirty_start == self.dirty_stop:
+            self.dirty_start = start
+            self.dirty_stop = stop
+            return
+        if start < self.dirty_start:
+            self.dirty_start = start
+        if stop > self.dirty_stop:
+            self.dirty_stop = stop
+
+    cdef void mark_clean(self):
+        '''Empty the dirty range.
+        '''
+        self.dirty_start = self.dirty_stop = 0
 
     cdef int count(self):
         '''Return the number of blocks currently used.
@@ -1,6 +1,18 @@
 cdef class GraphicsCompiler
 
-from instructions cimport InstructionGroup
+from instructions cimport Instruction, InstructionGroup, ContextInstruction
 
 cdef class GraphicsCompiler:
+    cdef list output
+    cdef list run
+    cdef long run_vertices
+    cdef dict states
+    cdef dict runs
+    cdef dict previous_runs
+
     cdef InstructionGroup compile(self, InstructionGroup group)
+    cdef list batch(self, InstructionGroup group)
+    cdef void batch_group(self, InstructionGroup group)
+    cdef InstructionGroup get_flattened(self, Instruction c)
+    cdef int track_states(self, ContextInstruction ci)
+    cdef void flush_run(self)
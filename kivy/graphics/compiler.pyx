@@ -55,12 +55,41 @@ Note to any Kivy contributor / internal developer:
 - We must reset our cache if one of our children is another instruction group
   because we don't know whether it might do weird things or not.
 
+
+Batching the vertex instructions
+--------------------------------
+
+.. versionadded:: 1.9.0
+
+When :attr:`~kivy.graphics.instructions.InstructionGroup.batching` is enabled,
+the compiled instructions are batched too. Taking the previous example, the
+three rectangles use the same texture and the same color, so they are drawn
+with a single draw call::
+
+    Color: change 'color' context to 1, 1, 1
+    BindTexture: change 'texture0' to `button.png texture`
+    VertexInstructionRun: push the vertices of the 3 rectangles & draw
+
+The context instructions that set a state to the value it already has in the
+batch are dropped. Any other context instruction ends the current run of
+vertex instructions. The child groups and canvases that don't change the
+render context or the opacity are batched as if their instructions were part
+of the group.
+
 '''
 
 include 'opcodes.pxi'
 
-from kivy.graphics.instructions cimport Instruction, RenderContext, ContextInstruction
-from kivy.graphics.context_instructions cimport BindTexture
+from kivy.graphics.instructions cimport RenderContext, VertexInstruction, \
+    VertexInstructionRun, Canvas, CanvasBase
+from kivy.graphics.context_instructions cimport BindTexture, Color, \
+    ChangeState
+from kivy.graphics.texture cimport Texture, TextureRegion
+from kivy.graphics.vbo cimport merged_vertex_count
+
+# maximum number of vertices drawn by a VertexInstructionRun, as the indices
+# are unsigned short.
+cdef long MAX_RUN_VERTICES = 65535
 
 cdef class GraphicsCompiler:
     cdef InstructionGroup compile(self, InstructionGroup group):
@@ -148,3 +177,107 @@ cdef class GraphicsCompiler:
         group.flags |= GI_NO_APPLY_ONCE
 
         return group
+
+    cdef list batch(self, InstructionGroup group):
+        # Build the list of instructions to apply for a compiled group, where
+        # the runs of consecutive vertex instructions drawn with the same
+        # states are replaced by a VertexInstructionRun. The runs of the
+        # previous build are reused when they have the same instructions.
+        cdef list output
+        self.output = []
+        self.run = []
+        self.run_vertices = 0
+        self.states = {}
+        self.previous_runs = group.batch_runs
+        self.runs = group.batch_runs = {}
+        self.batch_group(group)
+        self.flush_run()
+        output = self.output
+        self.output = self.run = None
+        self.states = self.runs = self.previous_runs = None
+        return output
+
+    cdef void batch_group(self, InstructionGroup group):
+        cdef Instruction c
+        cdef InstructionGroup child
+        cdef long count
+        for c in group.children:
+            if c.flags & GI_IGNORE:
+                continue
+            if isinstance(c, VertexInstruction):
+                count = merged_vertex_count((<VertexInstruction>c).batch)
+                if count < 0:
+                    self.flush_run()
+                    self.output.append(c)
+                    continue
+                if self.run_vertices + count > MAX_RUN_VERTICES:
+                    self.flush_run()
+                self.run.append(c)
+                self.run_vertices += count
+                continue
+            child = self.get_flattened(c)
+            if child is not None:
+                self.batch_group(child)
+            elif isinstance(c, BindTexture) or type(c) is Color or \
+                    type(c) is ChangeState:
+                if self.track_states(<ContextInstruction>c):
+                    # the states are already set, the instruction is useless.
+                    continue
+                self.flush_run()
+                self.output.append(c)
+            else:
+                # we don't know what this instruction does, it must be applied
+                # as is, and the states may have changed.
+                self.flush_run()
+                self.states = {}
+                self.output.append(c)
+
+    cdef InstructionGroup get_flattened(self, Instruction c):
+        # Return c if its children can be batched in place of c.
+        cdef InstructionGroup group
+        if type(c) is InstructionGroup or type(c) is CanvasBase:
+            group = c
+        elif type(c) is Canvas and (<Canvas>c)._opacity == 1.0:
+            group = c
+        else:
+            return None
+        if group.compiler is None or group.compiled_children is None:
+            return None
+        return group
+
+    cdef int track_states(self, ContextInstruction ci):
+        # Record the states set by the instruction, and return 1 if they were
+        # all already set to the same values.
+        cdef BindTexture bt
+        cdef Texture texture
+        cdef int same = 1
+        cdef list items
+        if isinstance(ci, BindTexture):
+            bt = ci
+            texture = bt._texture
+            # all the regions of an atlas are bound with the same texture
+            if isinstance(texture, TextureRegion):
+                texture = (<TextureRegion>texture).owner
+            items = [('texture%d' % bt._index, texture)]
+        else:
+            items = list(ci.context_state.items())
+        for key, value in items:
+            if key not in self.states or self.states[key] is not value and \
+                    self.states[key] != value:
+                self.states[key] = value
+                same = 0
+        return same
+
+    cdef void flush_run(self):
+        cdef VertexInstructionRun run
+        cdef list instructions = self.run
+        if len(instructions) == 1:
+            self.output.append(instructions[0])
+        elif len(instructions) > 1:
+            run = self.previous_runs.get(instructions[0])
+            if run is None or run.instructions != instructions:
+                run = VertexInstructionRun(instructions)
+            self.runs[instructions[0]] = run
+            self.output.append(run)
+        self.run = []
+        self.run_vertices = 0
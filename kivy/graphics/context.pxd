@@ -1,8 +1,9 @@
 from kivy.graphics.instructions cimport Instruction, Canvas
 from kivy.graphics.texture cimport Texture
-from kivy.graphics.vbo cimport VBO, VertexBatch
+from kivy.graphics.vbo cimport VBO, VertexBatch, BufferPage
 from kivy.graphics.shader cimport Shader
 from kivy.graphics.fbo cimport Fbo
+from kivy.graphics.c_opengl cimport GLuint, GLenum
 
 cdef class Context:
     cdef list observers
@@ -18,6 +19,7 @@ cdef class Context:
     cdef object lr_fbo_fb
     cdef object lr_shadersource
     cdef list lr_shader
+    cdef list lr_range
 
     cdef void register_texture(self, Texture texture)
     cdef void register_canvas(self, Canvas canvas)
@@ -26,6 +28,8 @@ cdef class Context:
     cdef void dealloc_texture(self, Texture texture)
     cdef void dealloc_vbo(self, VBO vbo)
     cdef void dealloc_vertexbatch(self, VertexBatch vbo)
+    cdef void dealloc_buffer(self, GLuint buffer_id)
+    cdef void dealloc_range(self, BufferPage page, long offset, long size)
     cdef void dealloc_shader(self, Shader shader)
     cdef void dealloc_shader_source(self, int shader)
     cdef void dealloc_fbo(self, Fbo fbo)
@@ -34,3 +38,12 @@ cdef class Context:
     cdef void flush(self)
 
 cpdef Context get_context()
+
+cdef void gl_use_program(GLuint program)
+cdef long gl_current_program()
+cdef void gl_active_texture(int unit)
+cdef void gl_bind_texture(GLenum target, GLuint texture)
+cdef void gl_blend_func_separate(GLenum src_rgb, GLenum dst_rgb,
+                                 GLenum src_alpha, GLenum dst_alpha)
+cdef void gl_count_uniforms(long calls, long avoided)
+cdef void gl_state_reset()
@@ -22,7 +22,7 @@ from os import environ
 from weakref import ref
 from kivy.graphics.instructions cimport Canvas
 from kivy.graphics.texture cimport Texture, TextureRegion
-from kivy.graphics.vbo cimport VBO, VertexBatch
+from kivy.graphics.vbo cimport VBO, VertexBatch, BufferPage, reload_arenas
 from kivy.logger import Logger
 from kivy.clock import Clock
 from kivy.graphics.c_opengl cimport *
@@ -34,6 +34,98 @@ from kivy.cache import Cache
 
 cdef Context context = None
 
+# Shadow of the GL state, used to skip the calls that would not change it. -1
+# means that the value is unknown, e.g. after a Callback.
+DEF MAX_TEXTURE_UNITS = 32
+DEF GLS_PROGRAM = 0
+DEF GLS_ACTIVE_TEXTURE = 1
+DEF GLS_TEXTURE = 2
+DEF GLS_BLEND = 3
+DEF GLS_UNIFORM = 4
+DEF GLS_COUNT = 5
+
+cdef tuple gl_state_names = (
+    'program', 'active_texture', 'texture', 'blend', 'uniform')
+cdef long gl_program = -1
+cdef long gl_unit = -1
+cdef long gl_textures[MAX_TEXTURE_UNITS]
+cdef long gl_texture_targets[MAX_TEXTURE_UNITS]
+cdef long gl_blend[4]
+cdef long gl_calls[GLS_COUNT]
+cdef long gl_avoided[GLS_COUNT]
+
+
+cdef void gl_use_program(GLuint program):
+    global gl_program
+    if gl_program == program:
+        gl_avoided[GLS_PROGRAM] += 1
+        return
+    gl_program = program
+    gl_calls[GLS_PROGRAM] += 1
+    glUseProgram(program)
+
+
+cdef long gl_current_program():
+    return gl_program
+
+
+cdef void gl_active_texture(int unit):
+    global gl_unit
+    if gl_unit == unit:
+        gl_avoided[GLS_ACTIVE_TEXTURE] += 1
+        return
+    gl_unit = unit
+    gl_calls[GLS_ACTIVE_TEXTURE] += 1
+    glActiveTexture(GL_TEXTURE0 + unit)
+
+
+cdef void gl_bind_texture(GLenum target, GLuint texture):
+    cdef long unit = gl_unit
+    if 0 <= unit < MAX_TEXTURE_UNITS:
+        if gl_textures[unit] == texture and \
+                gl_texture_targets[unit] == target:
+            gl_avoided[GLS_TEXTURE] += 1
+            return
+        gl_textures[unit] = texture
+        gl_texture_targets[unit] = target
+    gl_calls[GLS_TEXTURE] += 1
+    glBindTexture(target, texture)
+
+
+cdef void gl_blend_func_separate(GLenum src_rgb, GLenum dst_rgb,
+                                 GLenum src_alpha, GLenum dst_alpha):
+    if gl_blend[0] == src_rgb and gl_blend[1] == dst_rgb and \
+            gl_blend[2] == src_alpha and gl_blend[3] == dst_alpha:
+        gl_avoided[GLS_BLEND] += 1
+        return
+    gl_blend[0] = src_rgb
+    gl_blend[1] = dst_rgb
+    gl_blend[2] = src_alpha
+    gl_blend[3] = dst_alpha
+    gl_calls[GLS_BLEND] += 1
+    glBlendFuncSeparate(src_rgb, dst_rgb, src_alpha, dst_alpha)
+
+
+cdef void gl_count_uniforms(long calls, long avoided):
+    gl_calls[GLS_UNIFORM] += calls
+    gl_avoided[GLS_UNIFORM] += avoided
+
+
+cdef void gl_state_reset():
+    # forget everything, the next calls will be issued.
+    global gl_program, gl_unit
+    cdef int i
+    gl_program = -1
+    gl_unit = -1
+    for i in range(MAX_TEXTURE_UNITS):
+        gl_textures[i] = -1
+        gl_texture_targets[i] = -1
+    for i in range(4):
+        gl_blend[i] = -1
+
+
+gl_state_reset()
+
 cdef class Context:
     """
     The Context class manages groups of graphics instructions. It can also be used to manage
@@ -58,6 +150,7 @@ cdef class Context:
         self.lr_fbo_fb = array('i')
         self.lr_shadersource = array('i')
         self.lr_shader = []
+        self.lr_range = []
 
     cdef void register_texture(self, Texture texture):
         self.l_texture.append(ref(texture, self.l_texture.remove))
@@ -78,18 +171,23 @@ cdef class Context:
             self.trigger_gl_dealloc()
 
     cdef void dealloc_vbo(self, VBO vbo):
-        cdef array arr
         if vbo.have_id():
-            arr = self.lr_vbo
-            arr.append(vbo.id)
-            self.trigger_gl_dealloc()
+            self.dealloc_range(vbo.page, vbo.offset, vbo.vbo_size)
 
     cdef void dealloc_vertexbatch(self, VertexBatch batch):
-        cdef array arr
         if batch.have_id():
-            arr = self.lr_vbo
-            arr.append(batch.id)
-            self.trigger_gl_dealloc()
+            self.dealloc_range(batch.page, batch.offset, batch.elements_size)
+
+    cdef void dealloc_range(self, BufferPage page, long offset, long size):
+        # the range may still be read by the draws of the current frame, it's
+        # released with the other gl resources.
+        self.lr_range.append((page, offset, size))
+        self.trigger_gl_dealloc()
+
+    cdef void dealloc_buffer(self, GLuint buffer_id):
+        cdef array arr = self.lr_vbo
+        arr.append(buffer_id)
+        self.trigger_gl_dealloc()
 
     cdef void dealloc_shader(self, Shader shader):
         if shader.program == 0:
@@ -187,6 +285,7 @@ cdef class Context:
 
         start = time()
         Logger.info('Context: Reloading graphics data...')
+        gl_state_reset()
         Logger.debug('Context: Collect and flush all garbage')
         self.flush()
 
@@ -221,13 +320,14 @@ cdef class Context:
             Logger.trace('Context: << reload region texture %r' % texture)
 
         # Restore texture cache
-        texture_objects.update(Cache._objects['kv.texture'])
-        Cache._objects['kv.texture'] = texture_objects
-        image_objects.update(Cache._objects['kv.image'])
-        Cache._objects['kv.image'] = image_objects
+        Cache._restore('kv.texture', texture_objects)
+        Cache._restore('kv.image', image_objects)
 
         gc_objects = gc.get_objects()[:]
         Logger.debug('Context: Reload vbos')
+        # the pending ranges belong to the buffers of the lost context
+        del self.lr_range[:]
+        reload_arenas()
         for item in gc_objects:
             if isinstance(item, VBO):
                 vbo = item
@@ -264,6 +364,29 @@ cdef class Context:
         dt = time() - start
         Logger.info('Context: Reloading done in %2.4fs' % dt)
 
+    def get_gl_state_stats(self, reset=False):
+        '''Return the number of GL state changes that were issued and avoided
+        since the last reset, as a dict with the 'program', 'active_texture',
+        'texture', 'blend' and 'uniform' keys, and (calls, avoided) values.
+
+        The avoided calls are the glUseProgram, glActiveTexture,
+        glBindTexture, glBlendFuncSeparate and glUniform* calls that were
+        skipped because the GL state already had the requested value.
+
+        :Parameters:
+            `reset`: bool, defaults to False
+                If True, the counters are set back to 0.
+
+        .. versionadded:: 1.9.0
+        '''
+        cdef int i
+        stats = {}
+        for i in range(GLS_COUNT):
+            stats[gl_state_names[i]] = (gl_calls[i], gl_avoided[i])
+            if reset:
+                gl_calls[i] = gl_avoided[i] = 0
+        return stats
+
     def flag_update_canvas(self):
         cdef Canvas canvas
         for item in self.l_canvas:
@@ -275,7 +398,15 @@ cdef class Context:
         # dealloc all gl resources asynchronously
         cdef GLuint i, j
         cdef array arr
-
+        cdef BufferPage page
+
+        # release the ranges first, the emptied buffers are deleted just after
+        if len(self.lr_range):
+            Logger.trace('Context: releasing %d buffer ranges' % len(
+                self.lr_range))
+            for page, offset, size in self.lr_range:
+                page.arena.release(page, offset, size)
+            del self.lr_range[:]
         if len(self.lr_vbo):
             Logger.trace('Context: releasing %d vbos' % len(self.lr_vbo))
             arr = self.lr_vbo
@@ -287,6 +418,8 @@ cdef class Context:
             arr = self.lr_texture
             glDeleteTextures(<GLsizei>len(self.lr_texture), arr.data.as_uints)
             del self.lr_texture[:]
+            # the ids may be reused for new textures
+            gl_state_reset()
         if len(self.lr_fbo_fb):
             Logger.trace('Context: releasing %d framebuffer fbos' % len(self.lr_fbo_fb))
             arr = self.lr_fbo_fb
@@ -312,6 +445,7 @@ cdef class Context:
                     glDetachShader(program, fs_id)
                 glDeleteProgram(program)
             del self.lr_shader[:]
+            gl_state_reset()
 
 
 cpdef Context get_context():
@@ -43,6 +43,9 @@ cdef class InstructionGroup(Instruction):
     cdef public list children
     cdef InstructionGroup compiled_children
     cdef GraphicsCompiler compiler
+    cdef int _batching
+    cdef list batched_children
+    cdef dict batch_runs
     cdef void build(self)
     cdef void reload(self)
     cpdef add(self, Instruction c)
@@ -76,6 +79,11 @@ cdef class VertexInstruction(Instruction):
 
     cdef void build(self)
 
+cdef class VertexInstructionRun(Instruction):
+    cdef list instructions
+    cdef MergedVertexBatch batch
+    cdef void apply(self)
+
 cdef class Callback(Instruction):
     cdef Shader _shader
     cdef object func
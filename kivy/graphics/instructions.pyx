@@ -20,22 +20,29 @@ IF USE_OPENGL_DEBUG == 1:
     from c_opengl_debug cimport *
 from kivy.compat import PY2
 from kivy.logger import Logger
-from kivy.graphics.context cimport get_context, Context
+from kivy.graphics.context cimport get_context, Context, gl_state_reset, \
+    gl_active_texture, gl_blend_func_separate
 from weakref import proxy
 
 
 cdef int _need_reset_gl = 1
-cdef int _active_texture = -1
 cdef list canvas_list = []
 
+cdef void reset_gl_state():
+    # forget the shadow of the GL state. The program of the active context is
+    # bound again, otherwise its uniforms would wait for its next use().
+    cdef RenderContext rcx = getActiveContext()
+    gl_state_reset()
+    if rcx is not None:
+        rcx.enter()
+
 cdef void reset_gl_context():
-    global _need_reset_gl, _active_texture
+    global _need_reset_gl
     _need_reset_gl = 0
-    _active_texture = 0
+    reset_gl_state()
     glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-    glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE)
-    glActiveTexture(GL_TEXTURE0)
+    gl_blend_func_separate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE)
+    gl_active_texture(0)
     glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
 
 
@@ -140,10 +147,13 @@ cdef class InstructionGroup(Instruction):
         Instruction.__init__(self, **kwargs)
         self.children = list()
         self.compiled_children = None
+        self.batched_children = None
+        self.batch_runs = {}
         if 'nocompiler' in kwargs:
             self.compiler = None
         else:
             self.compiler = GraphicsCompiler()
+        self._batching = int(kwargs.get('batching', False))
 
     cdef void apply(self):
         cdef Instruction c
@@ -152,7 +162,10 @@ cdef class InstructionGroup(Instruction):
             if self.flags & GI_NEEDS_UPDATE:
                 self.build()
             if self.compiled_children is not None and not (self.flags & GI_NO_APPLY_ONCE):
-                children = self.compiled_children.children
+                if self.batched_children is not None:
+                    children = self.batched_children
+                else:
+                    children = self.compiled_children.children
                 for c in children:
                     if c.flags & GI_IGNORE:
                         continue
@@ -164,6 +177,8 @@ cdef class InstructionGroup(Instruction):
 
     cdef void build(self):
         self.compiled_children = self.compiler.compile(self)
+        if self._batching:
+            self.batched_children = self.compiler.batch(self)
         self.flag_update_done()
 
     cpdef add(self, Instruction c):
@@ -228,6 +243,39 @@ cdef class InstructionGroup(Instruction):
         for c in self.children:
             c.reload()
 
+    property batching:
+        '''If True, the consecutive vertex instructions of the group that are
+        drawn with the same texture and the same context states are merged
+        and drawn with a single draw call. The instructions of the child
+        groups and canvases (except the ones having an opacity or their own
+        render context) are merged too, so enabling it on the canvas of a
+        layout batches the drawing of all its children.
+
+        Only the instructions drawing triangles with the default vertex
+        format can be merged: :class:`~kivy.graphics.Rectangle`,
+        :class:`~kivy.graphics.BorderImage`, :class:`~kivy.graphics.Ellipse`,
+        :class:`~kivy.graphics.Triangle`, :class:`~kivy.graphics.Quad` and
+        the triangle meshes. Their vertices are copied into a shared buffer,
+        and only the range of an instruction is copied again when it changes.
+
+        The group can also be created with the `batching` keyword argument::
+
+            with self.canvas:
+                group = InstructionGroup(batching=True)
+
+        .. versionadded:: 1.9.0
+        '''
+        def __get__(self):
+            return bool(self._batching)
+        def __set__(self, value):
+            cdef int ivalue = int(bool(value))
+            if self._batching == ivalue:
+                return
+            self._batching = ivalue
+            self.batched_children = None
+            self.batch_runs = {}
+            self.flag_update()
+
 
 cdef class ContextInstruction(Instruction):
     '''The ContextInstruction class is the base for the creation of instructions
@@ -407,6 +455,31 @@ cdef class VertexInstruction(Instruction):
         self.batch.draw()
 
 
+cdef class VertexInstructionRun(Instruction):
+    '''(internal) Draw consecutive :class:`VertexInstruction` sharing the same
+    texture and context states with a single draw call. Created by the
+    :class:`InstructionGroup` when :attr:`InstructionGroup.batching` is
+    enabled.
+    '''
+    def __init__(self, list instructions):
+        cdef VertexInstruction instr
+        cdef list batches = []
+        Instruction.__init__(self, noadd=True)
+        for instr in instructions:
+            batches.append(instr.batch)
+        self.instructions = instructions
+        self.batch = MergedVertexBatch()
+        self.batch.set_batches(batches)
+
+    cdef void apply(self):
+        cdef VertexInstruction instr
+        for instr in self.instructions:
+            if instr.flags & GI_NEEDS_UPDATE:
+                instr.build()
+                instr.flag_update_done()
+        self.batch.draw()
+
+
 cdef class Callback(Instruction):
     '''.. versionadded:: 1.0.4
 
@@ -478,7 +551,10 @@ cdef class Callback(Instruction):
         if self.func(self):
             self.flag_update_done()
 
-        if self._reset_context:
+        if not self._reset_context:
+            # the callback may have changed any part of the GL state
+            reset_gl_state()
+        else:
             # FIXME do that in a proper way
             glDisable(GL_DEPTH_TEST)
             glDisable(GL_CULL_FACE)
@@ -505,6 +581,7 @@ cdef class Callback(Instruction):
                 shader.bind_vertex_format(None)
 
             # force binding again all our textures.
+            gl_state_reset()
             rcx = getActiveContext()
             shader = rcx._shader
             rcx.enter()
@@ -820,11 +897,8 @@ cdef class RenderContext(Canvas):
         #if index in self.bind_texture and \
         #   self.bind_texture[index] is texture:
         #    return
-        global _active_texture
         self.bind_texture[index] = texture
-        if _active_texture != index:
-            _active_texture = index
-            glActiveTexture(GL_TEXTURE0 + index)
+        gl_active_texture(index)
         texture.bind()
         self.flag_update()
 
@@ -23,6 +23,7 @@ cdef class Shader:
     cdef object frag_src
     cdef dict uniform_locations
     cdef dict uniform_values
+    cdef set pending_uniforms
 
     cdef void use(self)
     cdef void stop(self)
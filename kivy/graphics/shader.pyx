@@ -68,7 +68,8 @@ IF USE_OPENGL_DEBUG == 1:
     from kivy.graphics.c_opengl_debug cimport *
 from kivy.graphics.vertex cimport vertex_attr_t
 from kivy.graphics.transformation cimport Matrix
-from kivy.graphics.context cimport get_context
+from kivy.graphics.context cimport get_context, gl_use_program, \
+    gl_current_program, gl_count_uniforms, gl_state_reset
 from kivy.logger import Logger
 from kivy.cache import Cache
 from kivy import kivy_shader_dir
@@ -173,6 +174,7 @@ cdef class Shader:
         self.fragment_shader = None
         self.uniform_locations = dict()
         self.uniform_values = dict()
+        self.pending_uniforms = set()
 
     def __init__(self, str vs=None, str fs=None, str source=None):
         self.program = glCreateProgram()
@@ -190,7 +192,8 @@ cdef class Shader:
         # Note that we don't free previous created shaders. The current reload
         # is called only when the gl context is reseted. If we do it, we might
         # free newly created shaders (id collision)
-        glUseProgram(0)
+        gl_state_reset()
+        gl_use_program(0)
 
         # avoid shaders to be collected
         if self.vertex_shader:
@@ -211,9 +214,18 @@ cdef class Shader:
     cdef void use(self):
         '''Use the shader.
         '''
-        glUseProgram(self.program)
-        for k, v in self.uniform_values.iteritems():
-            self.upload_uniform(k, v)
+        gl_use_program(self.program)
+        # only upload the uniforms that changed while we were not in use, the
+        # program keeps the others.
+        if self.pending_uniforms:
+            gl_count_uniforms(0, len(self.uniform_values) -
+                              len(self.pending_uniforms))
+            for k in self.pending_uniforms:
+                if k in self.uniform_values:
+                    self.upload_uniform(k, self.uniform_values[k])
+            self.pending_uniforms.clear()
+        else:
+            gl_count_uniforms(0, len(self.uniform_values))
         IF USE_GLEW == 1:
             # XXX Very very weird bug. On virtualbox / win7 / glew, if we don't call
             # glFlush or glFinish or glGetIntegerv(GL_CURRENT_PROGRAM, ...), it seem
@@ -228,13 +240,19 @@ cdef class Shader:
     cdef void stop(self):
         '''Stop using the shader.
         '''
-        glUseProgram(0)
+        # the program is left bound: the next shader used will replace it, and
+        # rebinding the same one is avoided.
+        pass
 
     cdef void set_uniform(self, str name, value):
         if name in self.uniform_values and self.uniform_values[name] == value:
+            gl_count_uniforms(0, 1)
             return
         self.uniform_values[name] = value
-        self.upload_uniform(name, value)
+        if gl_current_program() == self.program:
+            self.upload_uniform(name, value)
+        else:
+            self.pending_uniforms.add(name)
 
     cdef void upload_uniform(self, str name, value):
         '''Pass a uniform variable to the shader.
@@ -256,6 +274,7 @@ cdef class Shader:
         if loc == -1:
             #Logger.debug('Shader: -> ignored')
             return
+        gl_count_uniforms(1, 0)
         #Logger.debug('Shader: -> (gl:%d) %s' % (glGetError(), str(value)))
 
         if val_type is Matrix:
@@ -431,6 +450,7 @@ cdef class Shader:
         cdef unsigned int i
         cdef vertex_attr_t *attr
         cdef bytes name
+        cdef GLint location
 
         # if the current vertex format used in the shader is the current one, do
         # nothing.
@@ -444,7 +464,7 @@ cdef class Shader:
         if self._current_vertex_format:
             for i in xrange(self._current_vertex_format.vattr_count):
                 attr = &self._current_vertex_format.vattr[i]
-                if attr.per_vertex == 0:
+                if attr.per_vertex == 0 or attr.index == <unsigned int>-1:
                     continue
                 glDisableVertexAttribArray(attr.index)
 
@@ -456,7 +476,11 @@ cdef class Shader:
                 if attr.per_vertex == 0:
                     continue
                 name = <bytes>attr.name
-                attr.index = glGetAttribLocation(self.program, <char *>name)
+                location = glGetAttribLocation(self.program, <char *>name)
+                attr.index = <unsigned int>location
+                # the attribute is not used by this shader
+                if location == -1:
+                    continue
                 glEnableVertexAttribArray(attr.index)
 
         # save for the next run.
@@ -496,6 +520,8 @@ cdef class Shader:
         glLinkProgram(self.program)
         self.process_message('program', self.get_program_log(self.program))
         self.uniform_locations = dict()
+        # a relinked program lost all its uniforms
+        self.pending_uniforms = set(self.uniform_values.keys())
         error = glGetError()
         if error:
             Logger.error('Shader: GL error %d' % error)
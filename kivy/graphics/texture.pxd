@@ -44,6 +44,10 @@ cdef class Texture:
 cdef class TextureRegion(Texture):
     cdef int x
     cdef int y
+    cdef int _rotated
     cdef Texture owner
+    cdef void update_tex_coords(self)
     cdef void reload(self)
+    cpdef flip_vertical(self)
+    cpdef flip_horizontal(self)
     cpdef bind(self)
@@ -228,7 +228,7 @@ cimport cython
 from os import environ
 from kivy.utils import platform
 from kivy.weakmethod import WeakMethod
-from kivy.graphics.context cimport get_context
+from kivy.graphics.context cimport get_context, gl_bind_texture
 
 from kivy.graphics.c_opengl cimport *
 IF USE_OPENGL_DEBUG == 1:
@@ -762,14 +762,14 @@ cdef class Texture:
 
         # if we have no change to apply, just bind and exit
         if not self.flags:
-            glBindTexture(self._target, self._id)
+            gl_bind_texture(self._target, self._id)
             return
 
         if self.flags & TI_NEED_GEN:
             self.flags &= ~TI_NEED_GEN
             glGenTextures(1, &self._id)
 
-        glBindTexture(self._target, self._id)
+        gl_bind_texture(self._target, self._id)
 
         if self.flags & TI_NEED_ALLOCATE:
             self.flags &= ~TI_NEED_ALLOCATE
@@ -1272,9 +1272,19 @@ cdef class Texture:
 
 cdef class TextureRegion(Texture):
     '''Handle a region of a Texture class. Useful for non power-of-2
-    texture handling.'''
+    texture handling.
 
-    def __init__(self, int x, int y, int width, int height, Texture origin):
+    If `rotated` is True, the region of the origin texture holds the image
+    rotated by 90 degrees counter-clockwise, as done by
+    :meth:`kivy.atlas.Atlas.create` when rotation is allowed. The size of the
+    region is then (height, width).
+
+    .. versionchanged:: 1.9.0
+        The `rotated` parameter was added.
+    '''
+
+    def __init__(self, int x, int y, int width, int height, Texture origin,
+                 int rotated=0):
         Texture.__init__(self, width, height, origin.target, origin.id)
         self._is_allocated = 1
         self._mipmap = origin._mipmap
@@ -1293,8 +1303,52 @@ cdef class TextureRegion(Texture):
         self._uvy = (y / <float>origin._height) * origin._uvh + origin_v1
         self._uvw = (width / <float>origin._width) * origin._uvw
         self._uvh = (height / <float>origin._height) * origin._uvh
+        if rotated:
+            self._rotated = 1
+            self._width = height
+            self._height = width
         self.update_tex_coords()
 
+    cdef void update_tex_coords(self):
+        if not self._rotated:
+            Texture.update_tex_coords(self)
+            return
+        # the image is rotated counter-clockwise in the origin texture: its
+        # bottom-left corner is at the bottom-right of the region, etc.
+        self._tex_coords[0] = self._uvx + self._uvw
+        self._tex_coords[1] = self._uvy
+        self._tex_coords[2] = self._uvx + self._uvw
+        self._tex_coords[3] = self._uvy + self._uvh
+        self._tex_coords[4] = self._uvx
+        self._tex_coords[5] = self._uvy + self._uvh
+        self._tex_coords[6] = self._uvx
+        self._tex_coords[7] = self._uvy
+
+    cpdef flip_vertical(self):
+        if not self._rotated:
+            Texture.flip_vertical(self)
+            return
+        # the vertical axis of the image is the horizontal one of the region
+        self._uvx += self._uvw
+        self._uvw = -self._uvw
+        self.update_tex_coords()
+
+    cpdef flip_horizontal(self):
+        if not self._rotated:
+            Texture.flip_horizontal(self)
+            return
+        self._uvy += self._uvh
+        self._uvh = -self._uvh
+        self.update_tex_coords()
+
+    property rotated:
+        '''True if the image is stored rotated in the origin texture.
+
+        .. versionadded:: 1.9.0
+        '''
+        def __get__(self):
+            return bool(self._rotated)
+
     def __repr__(self):
         return '<TextureRegion of %r hash=%r id=%d size=%r colorfmt=%r bufferfmt=%r source=%r observers=%d>' % (
             self.owner, id(self), self._id, self.size, self.colorfmt,
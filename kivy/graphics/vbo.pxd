@@ -4,10 +4,34 @@ from vertex cimport vertex_t, vertex_attr_t, VertexFormat
 
 cdef VertexFormat default_vertex
 
+cdef class BufferArena
+
+cdef class BufferPage:
+    cdef BufferArena arena
+    cdef GLuint id
+    cdef long size
+    cdef long used
+    cdef list free_ranges
+
+    cdef long alloc(self, long size)
+    cdef void release(self, long offset, long size)
+
+cdef class BufferArena:
+    cdef int target
+    cdef long page_size
+    cdef list pages
+
+    cdef BufferPage alloc(self, long size, long *offset)
+    cdef void release(self, BufferPage page, long offset, long size)
+    cdef void reload(self)
+
+cdef void reload_arenas()
+
 cdef class VBO:
     cdef object __weakref__
 
-    cdef GLuint id
+    cdef BufferPage page
+    cdef long offset
     cdef int usage
     cdef int target
     cdef vertex_attr_t *format
@@ -36,10 +60,12 @@ cdef class VertexBatch:
     cdef Buffer vbo_index
     cdef GLuint mode
     cdef str mode_str
-    cdef GLuint id
+    cdef BufferPage page
+    cdef long offset
     cdef int usage
     cdef short flags
     cdef long elements_size
+    cdef long revision
 
     cdef void clear_data(self)
     cdef void set_data(self, void *vertices, int vertices_count,
@@ -52,3 +78,19 @@ cdef class VertexBatch:
     cdef int count(self)
     cdef void reload(self)
     cdef int have_id(self)
+
+
+cdef class MergedVertexBatch(VertexBatch):
+    cdef list batches
+    cdef list revisions
+    cdef list vertex_offsets
+    cdef list vertex_counts
+    cdef list element_offsets
+    cdef list element_counts
+
+    cdef void set_batches(self, list batches)
+    cdef void rebuild(self)
+    cdef void refresh(self)
+    cdef void draw(self)
+
+cdef long merged_vertex_count(VertexBatch batch)
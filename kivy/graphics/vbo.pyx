@@ -16,12 +16,13 @@ Objects in OpenGL.
     at initialization, the default vertex format is used.
 '''
 
-__all__ = ('VBO', 'VertexBatch', 'VertexFormat')
+__all__ = ('VBO', 'VertexBatch', 'VertexFormat', 'get_arena_stats')
 
 include "config.pxi"
 include "common.pxi"
 
 from os import environ
+from bisect import bisect_left
 from kivy.graphics.buffer cimport Buffer
 from kivy.graphics.c_opengl cimport *
 IF USE_OPENGL_DEBUG == 1:
@@ -35,15 +36,153 @@ from kivy.graphics.shader cimport Shader
 cdef VertexFormat default_vertex = VertexFormat( (b'vPosition', 2, 'float'),
         (b'vTexCoords0', 2, 'float'))
 
-cdef short V_NEEDGEN = 1 << 0
 cdef short V_NEEDUPLOAD = 1 << 1
-cdef short V_HAVEID = 1 << 2
+
+# size of the GL buffers shared by the vbos and by the vertex batches.
+cdef long VERTEX_PAGE_SIZE = 1 << 20
+cdef long ELEMENT_PAGE_SIZE = 1 << 18
+
+
+cdef inline long align(long size):
+    # ranges are aligned on 16 bytes
+    return (size + 15) & ~15
+
+
+cdef class BufferPage:
+    '''(internal) A GL buffer of a :class:`BufferArena`, split in ranges.
+    '''
+    def __init__(self, BufferArena arena, long size):
+        self.arena = arena
+        self.size = size
+        self.used = 0
+        self.free_ranges = [(0, size)]
+        glGenBuffers(1, &self.id)
+        glBindBuffer(arena.target, self.id)
+        glBufferData(arena.target, size, NULL, GL_DYNAMIC_DRAW)
+
+    cdef long alloc(self, long size):
+        # first fit, return -1 if no free range is big enough.
+        cdef long i, offset, free
+        for i in xrange(len(self.free_ranges)):
+            offset, free = self.free_ranges[i]
+            if free < size:
+                continue
+            if free == size:
+                del self.free_ranges[i]
+            else:
+                self.free_ranges[i] = (offset + size, free - size)
+            self.used += size
+            return offset
+        return -1
+
+    cdef void release(self, long offset, long size):
+        # insert the range back, and merge it with the free ranges around.
+        cdef list ranges = self.free_ranges
+        cdef long i = bisect_left(ranges, (offset, 0))
+        self.used -= size
+        if i < len(ranges) and ranges[i][0] == offset + size:
+            size += ranges[i][1]
+            del ranges[i]
+        if i > 0 and ranges[i - 1][0] + ranges[i - 1][1] == offset:
+            i -= 1
+            offset = ranges[i][0]
+            size += ranges[i][1]
+            del ranges[i]
+        ranges.insert(i, (offset, size))
+
+
+cdef class BufferArena:
+    '''(internal) Sub-allocate ranges of a few big GL buffers, instead of
+    creating one GL buffer per :class:`VBO` or :class:`VertexBatch`.
+
+    .. versionadded:: 1.9.0
+    '''
+    def __init__(self, int target, long page_size):
+        self.target = target
+        self.page_size = page_size
+        self.pages = []
+
+    cdef BufferPage alloc(self, long size, long *offset):
+        cdef BufferPage page
+        size = align(size)
+        for page in self.pages:
+            offset[0] = page.alloc(size)
+            if offset[0] != -1:
+                return page
+        page = BufferPage(self, max(size, self.page_size))
+        self.pages.append(page)
+        offset[0] = page.alloc(size)
+        return page
+
+    cdef void release(self, BufferPage page, long offset, long size):
+        # the pages from before a reload are gone already
+        if page not in self.pages:
+            return
+        page.release(offset, align(size))
+        if page.used == 0 and len(self.pages) > 1:
+            self.pages.remove(page)
+            get_context().dealloc_buffer(page.id)
+
+    cdef void reload(self):
+        self.pages = []
+
+    def stats(self):
+        '''Return a dict with the number of pages, the total, used and free
+        sizes in bytes, the number of free ranges, the size of the largest
+        one, the occupancy (used / size) and the fragmentation (1 - largest
+        free range / free size).
+        '''
+        cdef BufferPage page
+        cdef long size = 0, used = 0, free_ranges = 0, largest = 0
+        for page in self.pages:
+            size += page.size
+            used += page.used
+            free_ranges += len(page.free_ranges)
+            for offset, free in page.free_ranges:
+                largest = max(largest, free)
+        return {
+            'pages': len(self.pages),
+            'size': size,
+            'used': used,
+            'free': size - used,
+            'free_ranges': free_ranges,
+            'largest_free': largest,
+            'occupancy': used / float(size) if size else 0.,
+            'fragmentation': 1. - largest / float(size - used)
+                             if size > used else 0.}
+
+
+cdef BufferArena vertex_arena = BufferArena(GL_ARRAY_BUFFER, VERTEX_PAGE_SIZE)
+cdef BufferArena element_arena = BufferArena(
+    GL_ELEMENT_ARRAY_BUFFER, ELEMENT_PAGE_SIZE)
+
+
+cdef void reload_arenas():
+    vertex_arena.reload()
+    element_arena.reload()
+
+
+def get_arena_stats():
+    '''Return the statistics of the shared buffers used for the vertices and
+    the elements, as a dict with the 'vertex' and 'element' keys. See
+    :meth:`BufferArena.stats` for the content of each one.
+
+    .. versionadded:: 1.9.0
+    '''
+    return {'vertex': vertex_arena.stats(),
+            'element': element_arena.stats()}
+
 
 cdef class VBO:
     '''
     .. versionchanged:: 1.6.0
         VBO now no longer has a fixed vertex format. If no VertexFormat is given
         at initialization, the default vertex format is used.
+
+    .. versionchanged:: 1.9.0
+        The vertices are stored in a range of a GL buffer shared with other
+        VBOs. Only the range of vertices changed since the last upload is
+        uploaded.
     '''
     def __cinit__(self, VertexFormat vertex_format=None):
         self.usage  = GL_DYNAMIC_DRAW
@@ -54,8 +193,9 @@ cdef class VBO:
         self.format = vertex_format.vattr
         self.format_count = vertex_format.vattr_count
         self.format_size = vertex_format.vbytesize
-        self.flags = V_NEEDGEN | V_NEEDUPLOAD
+        self.flags = V_NEEDUPLOAD
         self.vbo_size = 0
+        self.offset = 0
 
     def __dealloc__(self):
         get_context().dealloc_vbo(self)
@@ -64,65 +204,83 @@ cdef class VBO:
         self.data = Buffer(self.format_size)
 
     cdef int have_id(self):
-        return self.flags & V_HAVEID
+        return self.page is not None
 
     cdef void update_buffer(self):
-        # generate VBO if not done yet
-        if self.flags & V_NEEDGEN:
-            glGenBuffers(1, &self.id)
-            self.flags &= ~V_NEEDGEN
-            self.flags |= V_HAVEID
-
-        # if the size doesn't match, we need to reupload the whole data
-        if self.vbo_size < self.data.size():
-            self.vbo_size = self.data.size()
-            glBindBuffer(GL_ARRAY_BUFFER, self.id)
-            glBufferData(GL_ARRAY_BUFFER, self.vbo_size, self.data.pointer(), self.usage)
-            self.flags &= ~V_NEEDUPLOAD
+        cdef long size = self.data.size()
+        cdef long start, stop
+        if size == 0:
+            return
 
-        # if size match, update only what is needed
-        elif self.flags & V_NEEDUPLOAD:
-            glBindBuffer(GL_ARRAY_BUFFER, self.id)
-            glBufferSubData(GL_ARRAY_BUFFER, 0, self.data.size(), self.data.pointer())
+        # take a range of the arena, or a bigger one if the data grew. The
+        # whole data is uploaded into a new range.
+        if self.page is None or self.vbo_size < size:
+            if self.page is not None:
+                get_context().dealloc_range(self.page, self.offset,
+                                            self.vbo_size)
+            self.page = vertex_arena.alloc(size, &self.offset)
+            self.vbo_size = size
+            self.flags |= V_NEEDUPLOAD
+
+        if self.flags & V_NEEDUPLOAD:
+            glBindBuffer(GL_ARRAY_BUFFER, self.page.id)
+            glBufferSubData(GL_ARRAY_BUFFER, self.offset, size,
+                self.data.pointer())
             self.flags &= ~V_NEEDUPLOAD
 
+        # otherwise, update only the blocks written since the last upload
+        elif self.data.dirty_stop > self.data.dirty_start:
+            start = self.data.dirty_start * self.data.block_size
+            stop = self.data.dirty_stop * self.data.block_size
+            glBindBuffer(GL_ARRAY_BUFFER, self.page.id)
+            glBufferSubData(GL_ARRAY_BUFFER, self.offset + start, stop - start,
+                <char *>self.data.pointer() + start)
+        self.data.mark_clean()
+
     cdef void bind(self):
         cdef Shader shader = getActiveContext()._shader
         cdef vertex_attr_t *attr
-        cdef int offset = 0, i
+        cdef long offset
+        cdef int i
+        # the range may be allocated or moved by the update
         self.update_buffer()
-        glBindBuffer(GL_ARRAY_BUFFER, self.id)
+        if self.page is None:
+            return
+        offset = self.offset
+        glBindBuffer(GL_ARRAY_BUFFER, self.page.id)
         shader.bind_vertex_format(self.vertex_format)
         for i in xrange(self.format_count):
             attr = &self.format[i]
             if attr.per_vertex == 0:
                 continue
-            glVertexAttribPointer(attr.index, attr.size, attr.type,
-                    GL_FALSE, <GLsizei>self.format_size, <GLvoid*><long>offset)
+            if attr.index != <unsigned int>-1:
+                glVertexAttribPointer(attr.index, attr.size, attr.type,
+                        GL_FALSE, <GLsizei>self.format_size, <GLvoid*>offset)
             offset += attr.bytesize
 
     cdef void unbind(self):
         glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     cdef void add_vertex_data(self, void *v, unsigned short* indices, int count):
-        self.flags |= V_NEEDUPLOAD
         self.data.add(v, indices, count)
 
     cdef void update_vertex_data(self, int index, void* v, int count):
-        self.flags |= V_NEEDUPLOAD
         self.data.update(index, v, count)
 
     cdef void remove_vertex_data(self, unsigned short* indices, int count):
         self.data.remove(indices, count)
 
     cdef void reload(self):
-        self.flags = V_NEEDUPLOAD | V_NEEDGEN
+        # the pages of the arena are gone with the GL context
+        self.flags = V_NEEDUPLOAD
         self.vbo_size = 0
+        self.page = None
+        self.offset = 0
 
     def __repr__(self):
-        return '<VBO at %x id=%r count=%d size=%d>' % (
-                id(self), self.id if self.flags & V_HAVEID else None,
-                self.data.count(), self.data.size())
+        return '<VBO at %x id=%r offset=%d count=%d size=%d>' % (
+                id(self), self.page.id if self.page is not None else None,
+                self.offset, self.data.count(), self.data.size())
 
 cdef class VertexBatch:
     def __init__(self, **kwargs):
@@ -134,7 +292,8 @@ cdef class VertexBatch:
         self.vbo_index = Buffer(lushort) #index of every vertex in the vbo
         self.elements = Buffer(lushort) #indices translated to vbo indices
         self.elements_size = 0
-        self.flags = V_NEEDGEN | V_NEEDUPLOAD
+        self.offset = 0
+        self.flags = V_NEEDUPLOAD
 
         self.set_data(NULL, 0, NULL, 0)
         self.set_mode(kwargs.get('mode'))
@@ -143,11 +302,13 @@ cdef class VertexBatch:
         get_context().dealloc_vertexbatch(self)
 
     cdef int have_id(self):
-        return self.flags & V_HAVEID
+        return self.page is not None
 
     cdef void reload(self):
-        self.flags = V_NEEDGEN | V_NEEDUPLOAD
+        self.flags = V_NEEDUPLOAD
         self.elements_size = 0
+        self.page = None
+        self.offset = 0
 
     cdef void clear_data(self):
         # clear old vertices from vbo and then reset index buffer
@@ -155,6 +316,7 @@ cdef class VertexBatch:
                                     self.vbo_index.count())
         self.vbo_index.clear()
         self.elements.clear()
+        self.revision += 1
 
     cdef void set_data(self, void *vertices, int vertices_count,
                        unsigned short *indices, int indices_count):
@@ -165,7 +327,6 @@ cdef class VertexBatch:
         # now append the vertices and indices to vbo
         #vsize = self.vbo.vertex_format.vsize
         self.append_data(vertices, vertices_count, indices, indices_count)
-        self.flags |= V_NEEDUPLOAD
 
     cdef void append_data(self, void *vertices, int vertices_count,
                           unsigned short *indices, int indices_count):
@@ -185,41 +346,50 @@ cdef class VertexBatch:
         for i in xrange(indices_count):
             local_index = indices[i]
             self.elements.add(&vbi[local_index], NULL, 1)
-        self.flags |= V_NEEDUPLOAD
+        self.revision += 1
 
     cdef void draw(self):
         cdef int count = self.elements.count()
+        cdef long size = self.elements.size()
+        cdef long start, stop
         if count == 0:
             return
 
-        # create when needed
-        if self.flags & V_NEEDGEN:
-            glGenBuffers(1, &self.id)
-            self.flags &= ~V_NEEDGEN
-            self.flags |= V_HAVEID
+        # take a range of the arena, or a bigger one if the elements grew.
+        if self.page is None or self.elements_size < size:
+            if self.page is not None:
+                get_context().dealloc_range(self.page, self.offset,
+                                            self.elements_size)
+            self.page = element_arena.alloc(size, &self.offset)
+            self.elements_size = size
+            self.flags |= V_NEEDUPLOAD
 
         # bind to the current id
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.id)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.page.id)
 
-        # cache indices in a gpu buffer too
+        # cache indices in a gpu buffer too, only the changed ones when the
+        # range is already filled.
         if self.flags & V_NEEDUPLOAD:
-            if self.elements_size == self.elements.size():
-                glBufferSubData(GL_ELEMENT_ARRAY_BUFFER, 0, self.elements_size,
-                    self.elements.pointer())
-            else:
-                glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.elements.size(),
-                    self.elements.pointer(), self.usage)
-                self.elements_size = self.elements.size()
+            glBufferSubData(GL_ELEMENT_ARRAY_BUFFER, self.offset, size,
+                self.elements.pointer())
             self.flags &= ~V_NEEDUPLOAD
+        elif self.elements.dirty_stop > self.elements.dirty_start:
+            start = self.elements.dirty_start * self.elements.block_size
+            stop = self.elements.dirty_stop * self.elements.block_size
+            glBufferSubData(GL_ELEMENT_ARRAY_BUFFER, self.offset + start,
+                stop - start, <char *>self.elements.pointer() + start)
+        self.elements.mark_clean()
 
         self.vbo.bind()
 
         # draw the elements pointed by indices in ELEMENT ARRAY BUFFER.
-        glDrawElements(self.mode, count, GL_UNSIGNED_SHORT, NULL)
+        glDrawElements(self.mode, count, GL_UNSIGNED_SHORT,
+            <GLvoid*>self.offset)
 
     cdef void set_mode(self, str mode):
         # most common case in top;
         self.mode_str = mode
+        self.revision += 1
         if mode is None:
             self.mode = GL_TRIANGLES
         elif mode == 'points':
@@ -245,6 +415,155 @@ cdef class VertexBatch:
 
     def __repr__(self):
         return '<VertexBatch at %x id=%r vertex=%d size=%d mode=%s vbo=%x>' % (
-                id(self), self.id if self.flags & V_HAVEID else None,
+                id(self), self.page.id if self.page is not None else None,
                 self.elements.count(), self.elements.size(), self.get_mode(),
                 id(self.vbo))
+
+
+cdef long merged_vertex_count(VertexBatch batch):
+    # Return the number of vertices the batch takes in a MergedVertexBatch, or
+    # -1 if it cannot be merged. The vertices are copied from the start of the
+    # batch vbo up to the highest one used by the elements.
+    cdef long i, count = 0
+    cdef unsigned short *elements
+    if batch.vbo.vertex_format is not default_vertex:
+        return -1
+    if batch.mode != GL_TRIANGLES and batch.mode != GL_TRIANGLE_STRIP and \
+            batch.mode != GL_TRIANGLE_FAN:
+        return -1
+    elements = <unsigned short *>batch.elements.pointer()
+    for i in xrange(batch.elements.count()):
+        if elements[i] >= count:
+            count = elements[i] + 1
+    return count
+
+
+cdef long merged_element_count(VertexBatch batch):
+    # Return the number of elements of the batch once converted to triangles.
+    cdef long count = batch.elements.count()
+    if batch.mode == GL_TRIANGLES:
+        return count - count % 3
+    if count < 3:
+        return 0
+    return (count - 2) * 3
+
+
+cdef void merge_elements(VertexBatch batch, unsigned short *dst,
+                         unsigned short base):
+    # Write the elements of the batch as triangles, offset by base.
+    cdef unsigned short *src = <unsigned short *>batch.elements.pointer()
+    cdef long i, j = 0
+    cdef long count = batch.elements.count()
+    if batch.mode == GL_TRIANGLES:
+        for i in xrange(count - count % 3):
+            dst[i] = base + src[i]
+    elif batch.mode == GL_TRIANGLE_FAN:
+        for i in xrange(1, count - 1):
+            dst[j] = base + src[0]
+            dst[j + 1] = base + src[i]
+            dst[j + 2] = base + src[i + 1]
+            j += 3
+    else:
+        # keep the winding of the strip triangles
+        for i in xrange(count - 2):
+            if i % 2 == 0:
+                dst[j] = base + src[i]
+                dst[j + 1] = base + src[i + 1]
+            else:
+                dst[j] = base + src[i + 1]
+                dst[j + 1] = base + src[i]
+            dst[j + 2] = base + src[i + 2]
+            j += 3
+
+
+cdef class MergedVertexBatch(VertexBatch):
+    '''(internal) A VertexBatch drawing the vertices of several other batches
+    with a single call.
+
+    The vertices of every batch are copied into one vbo and their elements are
+    converted to triangles. When a batch changes without changing its number
+    of vertices and elements, only its own range is copied again, and only the
+    changed ranges of the vertices and elements are uploaded.
+
+    .. versionadded:: 1.9.0
+    '''
+    def __init__(self, **kwargs):
+        VertexBatch.__init__(self, **kwargs)
+        self.batches = []
+        self.revisions = []
+        self.vertex_offsets = []
+        self.vertex_counts = []
+        self.element_offsets = []
+        self.element_counts = []
+
+    cdef void set_batches(self, list batches):
+        self.batches = batches
+        self.rebuild()
+
+    cdef void rebuild(self):
+        cdef VertexBatch batch
+        cdef long vcount, icount, voffset = 0, ioffset = 0, total = 0
+        cdef unsigned short *elements = NULL
+
+        for batch in self.batches:
+            total += merged_element_count(batch)
+        if total:
+            elements = <unsigned short *>malloc(
+                sizeof(unsigned short) * total)
+            if elements == NULL:
+                raise MemoryError('merged elements allocation')
+
+        del self.revisions[:]
+        del self.vertex_offsets[:]
+        del self.vertex_counts[:]
+        del self.element_offsets[:]
+        del self.element_counts[:]
+        self.vbo.data.clear()
+        for batch in self.batches:
+            vcount = max(merged_vertex_count(batch), 0)
+            icount = merged_element_count(batch) if vcount else 0
+            self.vbo.add_vertex_data(batch.vbo.data.pointer(), NULL, vcount)
+            merge_elements(batch, elements + ioffset, voffset)
+            self.revisions.append(batch.revision)
+            self.vertex_offsets.append(voffset)
+            self.vertex_counts.append(vcount)
+            self.element_offsets.append(ioffset)
+            self.element_counts.append(icount)
+            voffset += vcount
+            ioffset += icount
+
+        self.elements.clear()
+        self.elements.add(elements, NULL, ioffset)
+        free(elements)
+
+    cdef void refresh(self):
+        cdef VertexBatch batch
+        cdef long i, vcount, icount, ioffset
+        for i in xrange(len(self.batches)):
+            batch = self.batches[i]
+            if batch.revision == self.revisions[i]:
+                continue
+            vcount = merged_vertex_count(batch)
+            icount = merged_element_count(batch)
+            if vcount != self.vertex_counts[i] or \
+                    icount != self.element_counts[i]:
+                self.rebuild()
+                return
+            ioffset = self.element_offsets[i]
+            self.vbo.update_vertex_data(self.vertex_offsets[i],
+                                        batch.vbo.data.pointer(), vcount)
+            merge_elements(batch,
+                <unsigned short *>self.elements.offset_pointer(ioffset),
+                self.vertex_offsets[i])
+            self.elements.mark_dirty(ioffset, ioffset + icount)
+            self.revisions[i] = batch.revision
+
+    cdef void draw(self):
+        # the batches are drawn as triangles, the default mode.
+        self.refresh()
+        VertexBatch.draw(self)
+
+    def __repr__(self):
+        return '<MergedVertexBatch at %x id=%r batches=%d vertex=%d>' % (
+                id(self), self.page.id if self.page is not None else None,
+                len(self.batches), self.elements.count())
@@ -19,10 +19,25 @@ cdef class StripMesh(VertexInstruction):
 
 
 cdef class Mesh(VertexInstruction):
-    cdef list _vertices
-    cdef list _indices
+    cdef object _vertices
+    cdef object _indices
+    cdef float [::1] _vview
+    cdef unsigned short [::1] _iview
+    cdef long _vcount
+    cdef int indices_changed
+    cdef long dirty_start, dirty_stop
     cdef VertexFormat vertex_format
     cdef int is_built
 
     cdef void build_triangle_fan(self, float *vertices, int vcount, int icount)
     cdef void build(self)
+
+
+cdef class SpriteBatch(VertexInstruction):
+    cdef object _instances
+    cdef float [::1] _view
+    cdef long _count
+    cdef long dirty_start, dirty_stop
+
+    cdef void expand(self, float *vertices, long start, long stop)
+    cdef void build(self)
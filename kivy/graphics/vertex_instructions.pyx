@@ -51,14 +51,17 @@ This module includes all the classes for drawing simple vertex objects.
 '''
 
 __all__ = ('Triangle', 'Quad', 'Rectangle', 'BorderImage', 'Ellipse', 'Line',
-           'Point', 'Mesh', 'GraphicException', 'Bezier', 'SmoothLine')
+           'Point', 'Mesh', 'GraphicException', 'Bezier', 'SmoothLine',
+           'SpriteBatch')
 
 
 include "config.pxi"
 include "common.pxi"
 
 from os import environ
+from cpython.array cimport array
 from kivy.graphics.vbo cimport *
+from kivy.graphics.buffer cimport Buffer
 from kivy.graphics.vertex cimport *
 from kivy.graphics.instructions cimport *
 from kivy.graphics.c_opengl cimport *
@@ -340,12 +343,33 @@ cdef class Mesh(VertexInstruction):
 
         indices = [0, 1, 2]
 
+    The vertices and indices can also be objects implementing the buffer
+    interface, such as `array.array`, `memoryview` or numpy arrays, with
+    float items for the vertices and unsigned short items for the indices.
+    They are used without any copy. After changing some vertices in place, or
+    to replace some of them, use :meth:`update_vertices`: only these vertices
+    are uploaded again::
+
+        from array import array
+
+        vertices = array('f', [0, 0, 0, 0, 100, 0, 1, 0, 100, 100, 1, 1])
+        mesh = Mesh(vertices=vertices, indices=array('H', [0, 1, 2]),
+                    mode='triangles')
+
+        # move the last vertex
+        mesh.update_vertices(2, [150, 100, 1, 1])
+
     .. versionadded:: 1.1.0
 
+    .. versionchanged:: 1.9.0
+        The vertices and indices can be objects implementing the buffer
+        interface, and :meth:`update_vertices` was added. Changing the
+        vertices without changing their number doesn't rebuild the indices.
+
     :Parameters:
-        `vertices`: list
+        `vertices`: iterable
             List of vertices in the format (x1, y1, u1, v1, x2, y2, u2, v2...).
-        `indices`: list
+        `indices`: iterable
             List of indices in the format (i1, i2, i3...).
         `mode`: str
             Mode of the vbo. Check :attr:`mode` for more information. Defaults to
@@ -372,6 +396,7 @@ cdef class Mesh(VertexInstruction):
     def __init__(self, **kwargs):
         cdef VBO vbo
         VertexInstruction.__init__(self, **kwargs)
+        self._vcount = -1
         v = kwargs.get('vertices')
         self.vertices = v if v is not None else []
         v = kwargs.get('indices')
@@ -413,61 +438,135 @@ cdef class Mesh(VertexInstruction):
     cdef void build(self):
         if self.is_built:
             return
-        cdef int i
-        cdef long vcount = len(self._vertices)
-        cdef long icount = len(self._indices)
-        cdef float *vertices = NULL
-        cdef unsigned short *indices = NULL
-        cdef list lvertices = self._vertices
-        cdef list lindices = self._indices
-        cdef vsize = self.batch.vbo.vertex_format.vsize
-
+        cdef long vsize = self.batch.vbo.vertex_format.vsize
+        cdef long vcount = self._vview.shape[0] // vsize
+        cdef long icount = self._iview.shape[0]
+        cdef long start = self.dirty_start, stop = self.dirty_stop
+        cdef VBO vbo = self.batch.vbo
+        cdef Buffer elements = self.batch.elements
+
+        self.dirty_start = self.dirty_stop = 0
+        self.batch.revision += 1
         if vcount == 0 or icount == 0:
-            self.batch.clear_data()
+            vbo.data.clear()
+            elements.clear()
+            self._vcount = -1
+            self.indices_changed = 1
             return
 
-        vertices = <float *>malloc(vcount * sizeof(float))
-        if vertices == NULL:
-            raise MemoryError('vertices')
-
-        indices = <unsigned short *>malloc(icount * sizeof(unsigned short))
-        if indices == NULL:
-            free(vertices)
-            raise MemoryError('indices')
-
-        for i in xrange(vcount):
-            vertices[i] = lvertices[i]
-        for i in xrange(icount):
-            indices[i] = lindices[i]
-
-        self.batch.set_data(vertices, <int>(vcount / vsize), indices, <int>icount)
+        # the vbo is owned by the mesh, and its blocks are laid out in the
+        # order of the vertices: the indices are used as they are, and don't
+        # depend on the vertices.
+        if vcount != self._vcount:
+            vbo.data.clear()
+            vbo.add_vertex_data(&self._vview[0], NULL, <int>vcount)
+            self._vcount = vcount
+        elif start < stop:
+            if stop > vcount:
+                stop = vcount
+            vbo.update_vertex_data(<int>start, &self._vview[start * vsize],
+                                   <int>(stop - start))
+
+        if self.indices_changed:
+            elements.clear()
+            elements.add(&self._iview[0], NULL, <int>icount)
+            self.indices_changed = 0
+
+    def update_vertices(self, long offset, data):
+        '''Replace the vertices starting at the vertex index *offset* by the
+        vertices in *data*, in the format of :attr:`vertices`. Only these
+        vertices are uploaded again, and the indices are kept.
+
+        *data* can be an object implementing the buffer interface with float
+        items, or a list. When the :attr:`vertices` are a buffer, *data* is
+        copied into it.
+
+        .. versionadded:: 1.9.0
+        '''
+        cdef long i, count, vsize = self.batch.vbo.vertex_format.vsize
+        cdef long start = offset * vsize
+        cdef float [::1] view
+        try:
+            view = data
+        except (TypeError, ValueError, BufferError):
+            view = array('f', data)
+        count = view.shape[0]
+        if count % vsize:
+            raise GraphicException(
+                'The vertices must have %d values per vertex' % vsize)
+        if start < 0 or start + count > self._vview.shape[0]:
+            raise GraphicException(
+                'Cannot update vertices %d to %d of a mesh of %d vertices' % (
+                    offset, offset + count // vsize,
+                    self._vview.shape[0] // vsize))
+        if count == 0:
+            return
 
-        free(vertices)
-        free(indices)
+        if isinstance(self._vertices, list):
+            values = []
+            for i in xrange(count):
+                values.append(view[i])
+            self._vertices[start:start + count] = values
+        # the data may be the vertices themselves, changed in place
+        if &self._vview[start] != &view[0]:
+            memcpy(&self._vview[start], &view[0], count * sizeof(float))
+
+        if self.dirty_start == self.dirty_stop:
+            self.dirty_start = offset
+            self.dirty_stop = offset + count // vsize
+        else:
+            self.dirty_start = min(self.dirty_start, offset)
+            self.dirty_stop = max(self.dirty_stop, offset + count // vsize)
+        self.flag_update()
 
     property vertices:
         '''List of x, y, u, v coordinates used to construct the Mesh. Right now,
         the Mesh instruction doesn't allow you to change the format of the
         vertices, which means it's only x, y + one texture coordinate.
+
+        An object implementing the buffer interface with float items is used
+        without copy. Other iterables are stored as a list.
         '''
         def __get__(self):
             return self._vertices
         def __set__(self, value):
-            self._vertices = list(value)
+            cdef float [::1] view
+            try:
+                view = value
+            except (TypeError, ValueError, BufferError):
+                value = list(value)
+                view = array('f', value)
+            self._vertices = value
+            self._vview = view
+            # all the vertices are uploaded again, but only a change in their
+            # number rebuilds the vbo. The range is clamped when building.
+            self.dirty_start = 0
+            self.dirty_stop = view.shape[0]
             self.flag_update()
 
     property indices:
         '''Vertex indices used to specify the order when drawing the
         mesh.
+
+        An object implementing the buffer interface with unsigned short items
+        is used without copy. Other iterables are stored as a list.
         '''
         def __get__(self):
             return self._indices
         def __set__(self, value):
-            if gles_limts and len(value) > 65535:
+            cdef unsigned short [::1] view
+            try:
+                view = value
+            except (TypeError, ValueError, BufferError):
+                value = list(value)
+                view = array('H', value)
+            if gles_limts and view.shape[0] > 65535:
                 raise GraphicException(
                     'Cannot upload more than 65535 indices (OpenGL ES 2'
                     ' limitation - consider setting KIVY_GLES_LIMITS)')
-            self._indices = list(value)
+            self._indices = value
+            self._iview = view
+            self.indices_changed = 1
             self.flag_update()
 
     property mode:
@@ -476,11 +575,224 @@ cdef class Mesh(VertexInstruction):
         'triangle_fan'.
         '''
         def __get__(self):
-            self.batch.get_mode()
+            return self.batch.get_mode()
         def __set__(self, mode):
             self.batch.set_mode(mode)
 
 
+# x, y, w, h, r, g, b, a, u, v, tw, th
+DEF SPRITE_SIZE = 12
+# each sprite is a quad of 4 vertices, indexed with unsigned shorts
+DEF SPRITE_MAX = 16383
+
+cdef VertexFormat sprite_vertex = VertexFormat(
+    (b'vPosition', 2, 'float'), (b'vTexCoords0', 2, 'float'),
+    (b'vColor', 4, 'float'))
+
+
+cdef class SpriteBatch(VertexInstruction):
+    '''Draw many textured and colored rectangles, the sprites, with a single
+    draw call.
+
+    The sprites are described by a flat buffer of floats, with 12 values per
+    sprite::
+
+        instances = [x1, y1, w1, h1, r1, g1, b1, a1, u1, v1, tw1, th1,
+                     x2, y2, w2, h2, ...]
+
+    where (x, y) and (w, h) are the position and size of the sprite,
+    (r, g, b, a) its color, and (u, v) and (tw, th) the position and size of
+    its region in the :attr:`~VertexInstruction.texture`, in texture
+    coordinates. Use (0, 0, 1, 1) for the whole texture, or the
+    :attr:`~kivy.graphics.texture.Texture.uvpos` and
+    :attr:`~kivy.graphics.texture.Texture.uvsize` of a texture region.
+
+    The instances can be any object implementing the buffer interface with
+    float items, such as an `array.array('f')`, a `memoryview` or a
+    contiguous numpy array of `float32` (use `.reshape(-1)` on a 2d array).
+    They are not copied: the instruction keeps a view of the buffer. After
+    changing the buffer in place, call :meth:`update` with the range of the
+    changed sprites, and only these sprites are uploaded again::
+
+        import numpy as np
+
+        sprites = np.zeros((1000, 12), dtype=np.float32)
+        ...
+        with self.canvas:
+            batch = SpriteBatch(texture=texture, instances=sprites.reshape(-1))
+
+        # later, move the first 10 sprites
+        sprites[:10, 0] += 5
+        batch.update(0, 10)
+
+    The sprites are expanded into a single vbo, with up to 16383 sprites per
+    instruction. The default shader ignores the colors of the sprites, they
+    are tinted by the current :class:`~kivy.graphics.Color` only. To use
+    them, draw the batch in a :class:`~kivy.graphics.RenderContext` using the
+    `sprites.vs` vertex shader::
+
+        from os.path import join
+        from kivy import kivy_shader_dir
+
+        with open(join(kivy_shader_dir, 'sprites.vs')) as fd:
+            vs = fd.read()
+        with self.canvas:
+            rc = RenderContext(vs=vs, use_parent_projection=True,
+                               use_parent_modelview=True)
+        with rc:
+            SpriteBatch(texture=texture, instances=sprites.reshape(-1))
+
+    .. versionadded:: 1.9.0
+
+    :Parameters:
+        `instances`: buffer or list
+            The description of the sprites, 12 floats per sprite.
+    '''
+
+    def __init__(self, **kwargs):
+        VertexInstruction.__init__(self, **kwargs)
+        self.batch = VertexBatch(vbo=VBO(sprite_vertex))
+        self._count = -1
+        v = kwargs.get('instances')
+        self.instances = v if v is not None else []
+
+    cdef void expand(self, float *vertices, long start, long stop):
+        cdef long i
+        cdef float x, y, w, h, u, v, tw, th
+        cdef float *src
+        cdef float *dst = vertices
+        for i in xrange(start, stop):
+            src = &self._view[i * SPRITE_SIZE]
+            x, y, w, h = src[0], src[1], src[2], src[3]
+            u, v, tw, th = src[8], src[9], src[10], src[11]
+            dst[0] = x
+            dst[1] = y
+            dst[2] = u
+            dst[3] = v
+            dst[8] = x + w
+            dst[9] = y
+            dst[10] = u + tw
+            dst[11] = v
+            dst[16] = x + w
+            dst[17] = y + h
+            dst[18] = u + tw
+            dst[19] = v + th
+            dst[24] = x
+            dst[25] = y + h
+            dst[26] = u
+            dst[27] = v + th
+            # the color is the same for the 4 vertices
+            memcpy(&dst[4], &src[4], 4 * sizeof(float))
+            memcpy(&dst[12], &src[4], 4 * sizeof(float))
+            memcpy(&dst[20], &src[4], 4 * sizeof(float))
+            memcpy(&dst[28], &src[4], 4 * sizeof(float))
+            dst += 32
+
+    cdef void build(self):
+        cdef long i, count = self._view.shape[0] // SPRITE_SIZE
+        cdef long start = self.dirty_start, stop = self.dirty_stop
+        cdef float *vertices = NULL
+        cdef unsigned short *indices = NULL
+        cdef VBO vbo = self.batch.vbo
+        cdef Buffer elements = self.batch.elements
+
+        if count == self._count:
+            # same number of sprites, update the vertices of the changed ones
+            if stop > count:
+                stop = count
+            if start < stop:
+                vertices = <float *>malloc(
+                    (stop - start) * 32 * sizeof(float))
+                if vertices == NULL:
+                    raise MemoryError('vertices')
+                self.expand(vertices, start, stop)
+                vbo.update_vertex_data(start * 4, vertices,
+                                       (stop - start) * 4)
+                free(vertices)
+            self.dirty_start = self.dirty_stop = 0
+            return
+
+        # the vbo is owned by this instruction, its blocks are laid out in
+        # order, 4 per sprite.
+        vbo.data.clear()
+        elements.clear()
+        self._count = count
+        self.dirty_start = self.dirty_stop = 0
+        if count == 0:
+            return
+
+        vertices = <float *>malloc(count * 32 * sizeof(float))
+        if vertices == NULL:
+            raise MemoryError('vertices')
+        indices = <unsigned short *>malloc(count * 6 * sizeof(unsigned short))
+        if indices == NULL:
+            free(vertices)
+            raise MemoryError('indices')
+
+        self.expand(vertices, 0, count)
+        for i in xrange(count):
+            indices[i * 6] = i * 4
+            indices[i * 6 + 1] = i * 4 + 1
+            indices[i * 6 + 2] = i * 4 + 2
+            indices[i * 6 + 3] = i * 4 + 2
+            indices[i * 6 + 4] = i * 4 + 3
+            indices[i * 6 + 5] = i * 4
+        vbo.add_vertex_data(vertices, NULL, count * 4)
+        elements.add(indices, NULL, count * 6)
+        self.batch.revision += 1
+
+        free(vertices)
+        free(indices)
+
+    def update(self, long start=0, long count=-1):
+        '''Tell the instruction that the sprites from *start* to
+        *start* + *count* were changed in the :attr:`instances` buffer. If
+        *count* is -1, all the sprites after *start* are updated.
+        '''
+        cdef long stop = self._view.shape[0] // SPRITE_SIZE
+        if count >= 0 and start + count < stop:
+            stop = start + count
+        if start >= stop:
+            return
+        if self.dirty_start == self.dirty_stop:
+            self.dirty_start = start
+            self.dirty_stop = stop
+        else:
+            self.dirty_start = min(self.dirty_start, start)
+            self.dirty_stop = max(self.dirty_stop, stop)
+        self.flag_update()
+
+    property instances:
+        '''Buffer of 12 floats per sprite: x, y, w, h, r, g, b, a, u, v, tw,
+        th. A list is converted to an `array.array('f')`, other objects are
+        used without any copy.
+        '''
+        def __get__(self):
+            return self._instances
+        def __set__(self, value):
+            if isinstance(value, (list, tuple)):
+                value = array('f', value)
+            cdef float [::1] view = value
+            if view.shape[0] % SPRITE_SIZE:
+                raise GraphicException(
+                    'SpriteBatch needs 12 floats per sprite, got %d floats'
+                    % view.shape[0])
+            if view.shape[0] // SPRITE_SIZE > SPRITE_MAX:
+                raise GraphicException(
+                    'Cannot draw more than %d sprites in one SpriteBatch'
+                    % SPRITE_MAX)
+            self._instances = value
+            self._view = view
+            # rebuild everything
+            self._count = -1
+            self.flag_update()
+
+    property count:
+        '''Number of sprites in :attr:`instances` (read-only).
+        '''
+        def __get__(self):
+            return self._view.shape[0] // SPRITE_SIZE
+
 
 cdef class Point(VertexInstruction):
     '''A 2d line.
@@ -748,6 +748,89 @@ will first be unloaded and then reloaded again. For example:
                 pos: self.pos
                 size: (self.size[0]/4, self.size[1]/4)
 
+.. _kv-cache:
+
+Kv cache
+--------
+
+.. versionadded:: 1.9.0
+
+Parsing a kv file and compiling its expressions takes time, especially on
+mobile devices. Like Python does with ``.pyc`` files, the result can be saved
+in a cache and reused the next time the same content is loaded, with the same
+Python version. The cache is disabled by default. Enable it with the
+`kv_cache` token of the kivy section of the :mod:`~kivy.config`, or with the
+`KIVY_KV_CACHE` environment variable set to 1 (or 0 to disable it)::
+
+    KIVY_KV_CACHE=1 python main.py
+
+The cache of the kv files and strings is written to the ``kvcache`` directory
+of the :attr:`~kivy.kivy_home_dir`.
+
+To ship an application with the cache already built, run the
+:mod:`~kivy.tools.kvcache` tool on your kv files when packaging it::
+
+    $ python -m kivy.tools.kvcache myapp/
+
+It writes the cache of each file to a ``__kvcache__`` directory next to it,
+which is read before the one of the user directory when the cache is
+enabled.
+
+.. _kv-defer-build:
+
+Deferred build
+--------------
+
+.. versionadded:: 1.9.0
+
+Applying the rules of a widget creates its children, its canvas instructions
+and its bindings, even when the widget is not displayed yet, like the screens
+of a :class:`~kivy.uix.screenmanager.ScreenManager` that are not the current
+one. For a large application, it can slow down the startup a lot.
+
+When the :attr:`~kivy.uix.widget.Widget.defer_build` property of a widget is
+True when it is created without a parent, the application of all its rules is
+deferred until the widget is added to a parent, or to the window. A screen is
+added to its manager when it is displayed for the first time, and a content
+widget of a collapsed :class:`~kivy.uix.accordion.AccordionItem` when the item
+is expanded for the first time. The property can be set in the class rule,
+or in the rule creating the widget::
+
+    <SettingsScreen@Screen>:
+        defer_build: True
+        BoxLayout:
+            # ... lots of widgets
+
+The rules are applied in the usual order: the rules of the widget class, then
+the rule of its parent that creates it. The properties set by the rules are
+not available before the widget is added to a parent, but the id given to the
+widget by the rule of its parent is. The ids defined in the content of the
+widget are available only after it is built. Call
+:meth:`BuilderBase.apply_deferred` to build the widget explicitly.
+
+.. _kv-delayed-expressions:
+
+Delayed expressions
+-------------------
+
+.. versionadded:: 1.9.0
+
+By default, a kv expression setting a widget property is evaluated again as
+soon as one of the properties it uses changes. An expression like::
+
+    text: '%s %s' % (self.a, root.b)
+
+is evaluated twice, and `text` dispatched twice, when `a` and `b` both change
+during the same frame.
+
+When the `kv_delayed_expressions` token of the kivy section of the
+:mod:`~kivy.config` is 1, or the `delayed_expressions` attribute of the
+:attr:`Builder` is True when the rules are applied, the expressions are
+only marked as dirty when the properties they use change. Like the canvas
+expressions, they are evaluated once per frame, before drawing, or when
+:meth:`Builder.sync <BuilderBase.sync>` is called. Until then, the
+properties they set keep their previous value.
+
 '''
 import os
 
@@ -755,23 +838,27 @@ __all__ = ('Observable', 'Builder', 'BuilderBase', 'BuilderException', 'Parser',
            'ParserException')
 
 import codecs
+import marshal
 import re
 import sys
 import traceback
 import types
+from hashlib import sha1
 from re import sub, findall
 from os import environ
-from os.path import join
+from os.path import join, dirname, basename, exists
 from copy import copy
 from types import CodeType
 from functools import partial
+from operator import itemgetter
 from collections import OrderedDict, defaultdict
 
 from kivy.factory import Factory
 from kivy.logger import Logger
 from kivy.utils import QueryDict
 from kivy.cache import Cache
-from kivy import kivy_data_dir, require
+from kivy.config import Config
+from kivy import kivy_data_dir, kivy_home_dir, require
 from kivy.compat import PY2, iteritems, iterkeys
 from kivy.context import register_context
 from kivy.resources import resource_find
@@ -971,6 +1058,20 @@ class ParserRuleProperty(object):
             else:
                 self.watched_keys = [['_']]
 
+    def _dump(self):
+        # marshallable state, see the kv cache
+        return (self.line, self.name, self.value, self.co_value, self.mode,
+                self.watched_keys)
+
+    @staticmethod
+    def _load(ctx, data):
+        line, name, value, co_value, mode, watched_keys = data
+        prop = ParserRuleProperty(ctx, line, name, value)
+        prop.co_value = co_value
+        prop.mode = mode
+        prop.watched_keys = watched_keys
+        return prop
+
     def __repr__(self):
         return '<ParserRuleProperty name=%r filename=%s:%d ' \
                'value=%r watched_keys=%r>' % (
@@ -984,7 +1085,8 @@ class ParserRule(object):
 
     __slots__ = ('ctx', 'line', 'name', 'children', 'id', 'properties',
                  'canvas_before', 'canvas_root', 'canvas_after',
-                 'handlers', 'level', 'cache_marked', 'avoid_previous_rules')
+                 'handlers', 'level', 'cache_marked', 'avoid_previous_rules',
+                 '_plan')
 
     def __init__(self, ctx, line, name, level):
         super(ParserRule, self).__init__()
@@ -1014,6 +1116,8 @@ class ParserRule(object):
         self.cache_marked = []
         #: Indicate if any previous rules should be avoided.
         self.avoid_previous_rules = False
+        # instantiation plan, built on the first application of the rule
+        self._plan = None
 
         if level == 0:
             self._detect_selectors()
@@ -1034,6 +1138,52 @@ class ParserRule(object):
         if self.canvas_after:
             self.canvas_after.precompile()
 
+    def _dump(self):
+        # marshallable state, see the kv cache
+        return (self.line, self.name, self.level, self.id,
+                self.avoid_previous_rules,
+                [x._dump() for x in self.properties.values()],
+                [x._dump() for x in self.handlers],
+                [x._dump() for x in self.children],
+                [x._dump() if x else None for x in (
+                    self.canvas_before, self.canvas_root, self.canvas_after)])
+
+    @staticmethod
+    def _load(ctx, data):
+        # the selectors are not detected again, the parser restores them
+        (line, name, level, rule_id, avoid_previous_rules, properties,
+         handlers, children, canvas) = data
+        rule = ParserRule.__new__(ParserRule)
+        rule.ctx = ctx
+        rule.line = line
+        rule.name = name
+        rule.level = level
+        rule.id = rule_id
+        rule.avoid_previous_rules = avoid_previous_rules
+        rule.properties = OrderedDict()
+        for x in properties:
+            prop = ParserRuleProperty._load(ctx, x)
+            rule.properties[prop.name] = prop
+        rule.handlers = [ParserRuleProperty._load(ctx, x) for x in handlers]
+        rule.children = [ParserRule._load(ctx, x) for x in children]
+        rule.canvas_before, rule.canvas_root, rule.canvas_after = [
+            ParserRule._load(ctx, x) if x else None for x in canvas]
+        rule.cache_marked = []
+        rule._plan = None
+        return rule
+
+    @property
+    def plan(self):
+        '''The :class:`ParserRulePlan` of the rule, built once when the rule
+        is first applied.
+
+        .. versionadded:: 1.9.0
+        '''
+        plan = self._plan
+        if plan is None:
+            plan = self._plan = ParserRulePlan(self)
+        return plan
+
     def create_missing(self, widget):
         # check first if the widget class already been processed by this rule
         cls = widget.__class__
@@ -1132,6 +1282,48 @@ class ParserRule(object):
         return '<ParserRule name=%r>' % (self.name, )
 
 
+class ParserRulePlan(object):
+    '''Instantiation plan of a :class:`ParserRule`: the analysis of the rule
+    needed by :meth:`BuilderBase._apply_rule`, done once per rule instead of
+    once per widget instance.
+
+    .. versionadded:: 1.9.0
+    '''
+
+    __slots__ = ('id', 'children', 'properties', 'expressions', 'handlers',
+                 'defer_build')
+
+    def __init__(self, rule):
+        super(ParserRulePlan, self).__init__()
+        #: Id of the rule, only the first word is used
+        self.id = ParserRulePlan.get_id(rule)
+        #: List of (rule, id) of the children to create
+        self.children = [(x, ParserRulePlan.get_id(x)) for x in rule.children]
+        #: List of (name, value, is_expression, property rule) of the
+        #: properties to set, in the rule order
+        self.properties = [
+            (x.name, x.co_value, type(x.co_value) is CodeType, x)
+            for x in rule.properties.values()]
+        #: True if any property value is an expression to bind
+        self.expressions = any(x[2] for x in self.properties)
+        #: List of (name, event, property rule) of the handlers to bind,
+        #: `event` is the name without the `on_` prefix
+        self.handlers = [(x.name, x.name[3:], x) for x in rule.handlers]
+        #: True if the rule sets `defer_build` to True, see
+        #: :ref:`kv-defer-build`. Names are compiled, so `True` is compared
+        #: as a string
+        prop = rule.properties.get('defer_build')
+        self.defer_build = prop is not None and (
+            prop.value.strip() == 'True' if type(prop.co_value) is CodeType
+            else bool(prop.co_value))
+
+    @staticmethod
+    def get_id(rule):
+        if rule.id:
+            return rule.id.split('#', 1)[0].strip()
+        return rule.id
+
+
 class Parser(object):
     '''Create a Parser object to parse a Kivy language file or Kivy content.
     '''
@@ -1250,6 +1442,18 @@ class Parser(object):
         lines = list(zip(list(range(num_lines)), lines))
         self.sourcecode = lines[:]
 
+        # Reuse the rules already parsed from the same content
+        digest = None
+        if _kv_cache_enabled():
+            digest = _kv_cache_digest(content)
+            data = _kv_cache_read(self.filename, digest)
+            if data is not None:
+                if __debug__:
+                    trace('Parser: using the cache of %d lines' % num_lines)
+                self._load_cache(data)
+                self.execute_directives()
+                return
+
         if __debug__:
             trace('Parser: parsing %d lines' % num_lines)
 
@@ -1272,6 +1476,34 @@ class Parser(object):
             ln, content = remaining_lines[0]
             raise ParserException(self, ln, 'Invalid data (not parsed)')
 
+        if digest is not None:
+            _kv_cache_write(self.filename, digest, self._dump_cache(objects))
+
+    def _dump_cache(self, objects):
+        # the first level objects, and the selectors, templates and root
+        # referencing them by index
+        index = dict([(id(rule), i) for i, rule in enumerate(objects)])
+        return {
+            'directives': self.directives,
+            'objects': [rule._dump() for rule in objects],
+            'rules': [(selector.__class__.__name__, selector.key,
+                       index[id(rule)]) for selector, rule in self.rules],
+            'templates': [(name, cls, index[id(rule)])
+                          for name, cls, rule in self.templates],
+            'root': index[id(self.root)] if self.root else None,
+            'dynamic_classes': self.dynamic_classes}
+
+    def _load_cache(self, data):
+        objects = [ParserRule._load(self, x) for x in data['objects']]
+        self.directives = data['directives']
+        self.rules = [(_kv_selectors[selector](key), objects[i])
+                      for selector, key, i in data['rules']]
+        self.templates = [(name, cls, objects[i])
+                          for name, cls, i in data['templates']]
+        root = data['root']
+        self.root = objects[root] if root is not None else None
+        self.dynamic_classes = data['dynamic_classes']
+
     def strip_comments(self, lines):
         '''Remove all comments from all lines in-place.
            Comments need to be on a single line and not at the end of a line.
@@ -1429,6 +1661,85 @@ class Parser(object):
         return objects, []
 
 
+# version of the kv cache content, to increase when the parser changes
+_kv_cache_version = 1
+try:
+    from importlib.util import MAGIC_NUMBER as _kv_cache_magic
+except ImportError:
+    from imp import get_magic
+    _kv_cache_magic = get_magic()
+_kv_cache_tag = getattr(getattr(sys, 'implementation', None), 'cache_tag',
+                        None) or 'py%d%d' % sys.version_info[:2]
+
+
+def _kv_cache_enabled():
+    value = environ.get('KIVY_KV_CACHE')
+    if value:
+        return value.lower() in ('true', '1', 'yes', 'yup')
+    return Config is not None and Config.getdefaultint('kivy', 'kv_cache', 0)
+
+
+def _kv_cache_digest(content):
+    if not isinstance(content, bytes):
+        content = content.encode('utf-8')
+    return sha1(content).hexdigest()
+
+
+def _kv_cache_filenames(filename, digest):
+    # the cache of a file may be shipped next to it by kivy.tools.kvcache,
+    # otherwise it's in the user directory
+    dirs = []
+    if filename:
+        dirs.append(join(dirname(filename), '__kvcache__'))
+    if kivy_home_dir:
+        dirs.append(join(kivy_home_dir, 'kvcache'))
+    return [join(d, '%s.%s.kvc' % (digest, _kv_cache_tag)) for d in dirs]
+
+
+def _kv_cache_read(filename, digest):
+    for fn in _kv_cache_filenames(filename, digest):
+        if not exists(fn):
+            continue
+        try:
+            with open(fn, 'rb') as fd:
+                version, magic, data = marshal.load(fd)
+        except Exception:
+            Logger.warning('Lang: ignoring invalid kv cache %s' % fn)
+            continue
+        if version == _kv_cache_version and magic == _kv_cache_magic:
+            return data
+    return None
+
+
+def _kv_cache_write(filename, digest, data, shipped=False):
+    # the cache is written to the user directory, or next to the file if it
+    # is shipped with it
+    try:
+        data = marshal.dumps((_kv_cache_version, _kv_cache_magic, data))
+    except ValueError:
+        # a constant value is not marshallable
+        Logger.debug('Lang: unable to cache %s' % (filename or '<string>'))
+        return None
+    filenames = _kv_cache_filenames(filename, digest)
+    if filename:
+        filenames = filenames[:1] if shipped else filenames[1:]
+    for fn in filenames:
+        tmpfn = '%s.%d' % (fn, os.getpid())
+        try:
+            if not exists(dirname(fn)):
+                os.makedirs(dirname(fn))
+            with open(tmpfn, 'wb') as fd:
+                fd.write(data)
+            if exists(fn):
+                os.remove(fn)
+            os.rename(tmpfn, fn)
+            return fn
+        except (IOError, OSError):
+            if exists(tmpfn):
+                os.remove(tmpfn)
+    return None
+
+
 def get_proxy(widget):
     try:
         return widget.proxy_ref
@@ -1562,6 +1873,12 @@ def create_handler(iself, element, key, value, rule, idmap, delayed=False):
     idmap = copy(idmap)
     idmap.update(global_idmap)
     idmap['self'] = iself.proxy_ref
+    return bind_handler(iself, element, key, value, rule, idmap, delayed)
+
+
+def bind_handler(iself, element, key, value, rule, idmap, delayed=False):
+    # same as create_handler, with an idmap already containing the global
+    # idmap and `self`, which can be shared by the expressions of a widget
     handler_append = _handlers[iself.uid].append
 
     # we need a hash for when delayed, so we don't execute duplicate canvas
@@ -1659,24 +1976,33 @@ class ParserSelectorName(ParserSelector):
 
     parents = {}
 
-    def get_bases(self, cls):
+    @staticmethod
+    def get_bases(cls):
         for base in cls.__bases__:
             if base.__name__ == 'object':
                 break
             yield base
             if base.__name__ == 'Widget':
                 break
-            for cbase in self.get_bases(base):
+            for cbase in ParserSelectorName.get_bases(base):
                 yield cbase
 
     def match(self, widget):
+        return self.key in self.get_names(widget.__class__)
+
+    @staticmethod
+    def get_names(cls):
+        # lower case names of the class and its bases, as matched by rules
         parents = ParserSelectorName.parents
-        cls = widget.__class__
         if not cls in parents:
             classes = [x.__name__.lower() for x in
-                       [cls] + list(self.get_bases(cls))]
+                       [cls] + list(ParserSelectorName.get_bases(cls))]
             parents[cls] = classes
-        return self.key in parents[cls]
+        return parents[cls]
+
+
+_kv_selectors = dict([(cls.__name__, cls) for cls in (
+    ParserSelectorId, ParserSelectorClass, ParserSelectorName)])
 
 
 class BuilderBase(object):
@@ -1687,8 +2013,6 @@ class BuilderBase(object):
     that you can use to load other kv files in addition to the default ones.
     '''
 
-    _match_cache = {}
-
     def __init__(self):
         super(BuilderBase, self).__init__()
         self.files = []
@@ -1696,6 +2020,18 @@ class BuilderBase(object):
         self.templates = {}
         self.rules = []
         self.rulectx = {}
+        # rules matched by a (class, id, cls) key
+        self._match_cache = {}
+        # (order, rule) of the rules by selector type and key
+        self._rules_index = {
+            ParserSelectorName: defaultdict(list),
+            ParserSelectorId: defaultdict(list),
+            ParserSelectorClass: defaultdict(list)}
+        self._rules_count = 0
+        # if True, the expressions of the widget properties are evaluated in
+        # sync(), see kv-delayed-expressions
+        self.delayed_expressions = Config is not None and bool(
+            Config.getdefaultint('kivy', 'kv_delayed_expressions', 0))
 
     def load_file(self, filename, **kwargs):
         '''Insert a file into the language builder and return the root widget
@@ -1736,8 +2072,12 @@ class BuilderBase(object):
             template invocation.
         '''
         # remove rules and templates
-        self.rules = [x for x in self.rules if x[1].ctx.filename != filename]
-        self._clear_matchcache()
+        removed = [x for x in self.rules if x[1].ctx.filename == filename]
+        if removed:
+            self.rules = [x for x in self.rules
+                          if x[1].ctx.filename != filename]
+            self._unindex_rules(removed)
+            self._clear_matchcache([selector for selector, rule in removed])
         templates = {}
         for x, y in self.templates.items():
             if y[2] != filename:
@@ -1773,7 +2113,8 @@ class BuilderBase(object):
 
             # merge rules with our rules
             self.rules.extend(parser.rules)
-            self._clear_matchcache()
+            self._index_rules(parser.rules)
+            self._clear_matchcache([x[0] for x in parser.rules])
 
             # add the template found by the parser into ours
             for name, cls, template in parser.templates:
@@ -1801,7 +2142,12 @@ class BuilderBase(object):
 
             if parser.root:
                 widget = Factory.get(parser.root.name)()
-                self._apply_rule(widget, parser.root, parser.root)
+                pending = getattr(widget, '_build_pending', None)
+                if pending is not None:
+                    # the rules of its class are deferred, this one follows
+                    pending.append((parser.root, None))
+                else:
+                    self._apply_rule(widget, parser.root, parser.root)
                 return widget
         finally:
             self._current_filename = None
@@ -1844,22 +2190,108 @@ class BuilderBase(object):
             trace('Builder: Found %d rules for %s' % (len(rules), widget))
         if not rules:
             return
+        if getattr(widget, 'parent', None) is None and \
+                self._is_build_deferred(widget, rules):
+            # keep the rules, they are applied when the widget is added to a
+            # parent, see apply_deferred()
+            widget._build_pending = [(rule, None) for rule in rules]
+            return
         for rule in rules:
             self._apply_rule(widget, rule, rule)
 
-    def _clear_matchcache(self):
-        BuilderBase._match_cache = {}
+    def apply_deferred(self, widget):
+        '''Apply the rules of a widget whose build was deferred by
+        :meth:`apply`, and return True, or False if there is nothing to
+        apply. See :ref:`kv-defer-build`.
 
-    def _apply_rule(self, widget, rule, rootrule, template_ctx=None):
+        .. versionadded:: 1.9.0
+        '''
+        pending = getattr(widget, '_build_pending', None)
+        if pending is None:
+            return False
+        widget._build_pending = None
+        if __debug__:
+            trace('Builder: Apply %d deferred rules for %s' % (
+                len(pending), widget))
+        # a rule of a parent rule is applied with the ids of the parent rule
+        for rule, ids in pending:
+            self._apply_rule(widget, rule, rule, ids=ids)
+        return True
+
+    @staticmethod
+    def _is_build_deferred(widget, rules):
+        # the build is deferred if the widget or one of its rules sets
+        # defer_build. It's set before the widget gets a parent, so that the
+        # parent knows it, see AccordionItem.add_widget()
+        if not (getattr(widget, 'defer_build', False) or
+                any(rule.plan.defer_build for rule in rules)):
+            return False
+        widget.defer_build = True
+        return True
+
+    @staticmethod
+    def _set_id(ids, id, widget):
+        ids[id] = widget.proxy_ref
+        # set id name as a attribute for root widget so one can in python
+        # code simply access root_widget.id_name
+        _ids = dict(ids)
+        _root = _ids.pop('root')
+        _new_ids = _root.ids
+        for _key in iterkeys(_ids):
+            if _ids[_key] == _root:
+                # skip on self
+                continue
+            _new_ids[_key] = _ids[_key]
+        _root.ids = _new_ids
+
+    def _clear_matchcache(self, selectors=None):
+        # forget the matches the selectors may change, or all of them
+        if selectors is None:
+            self._match_cache = {}
+            return
+        cache = self._match_cache
+        get_names = ParserSelectorName.get_names
+        for key in list(cache.keys()):
+            cls, wid, wcls = key
+            for selector in selectors:
+                skey = selector.key
+                if isinstance(selector, ParserSelectorName):
+                    if skey in get_names(cls):
+                        break
+                elif isinstance(selector, ParserSelectorId):
+                    if wid and wid.lower() == skey:
+                        break
+                elif skey in wcls:
+                    break
+            else:
+                continue
+            del cache[key]
+
+    def _index_rules(self, rules):
+        index = self._rules_index
+        for selector, rule in rules:
+            index[selector.__class__][selector.key].append(
+                (self._rules_count, rule))
+            self._rules_count += 1
+
+    def _unindex_rules(self, rules):
+        index = self._rules_index
+        for selector, rule in rules:
+            entries = index[selector.__class__][selector.key]
+            entries[:] = [x for x in entries if x[1] is not rule]
+
+    def _apply_rule(self, widget, rule, rootrule, template_ctx=None,
+                    ids=None):
         # widget: the current instantiated widget
         # rule: the current rule
         # rootrule: the current root rule (for children of a rule)
+        # ids: the ids of the parent rule, for a deferred rule of a child
 
         # will collect reference to all the id in children
         assert(rule not in self.rulectx)
-        self.rulectx[rule] = rctx = {
-            'ids': {'root': widget.proxy_ref},
-            'set': [], 'hdl': []}
+        if ids is None:
+            ids = {'root': widget.proxy_ref}
+        self.rulectx[rule] = rctx = {'ids': ids, 'set': [], 'hdl': []}
 
         # extract the context of the rootrule (not rule!)
         assert(rootrule in self.rulectx)
@@ -1869,22 +2301,12 @@ class BuilderBase(object):
         if template_ctx is not None:
             rctx['ids']['ctx'] = QueryDict(template_ctx)
 
+        # the analysis of the rule is done once, in its plan
+        plan = rule.plan
+
         # if we got an id, put it in the root rule for a later global usage
-        if rule.id:
-            # use only the first word as `id` discard the rest.
-            rule.id = rule.id.split('#', 1)[0].strip()
-            rctx['ids'][rule.id] = widget.proxy_ref
-            # set id name as a attribute for root widget so one can in python
-            # code simply access root_widget.id_name
-            _ids = dict(rctx['ids'])
-            _root = _ids.pop('root')
-            _new_ids = _root.ids
-            for _key in iterkeys(_ids):
-                if _ids[_key] == _root:
-                    # skip on self
-                    continue
-                _new_ids[_key] = _ids[_key]
-            _root.ids = _new_ids
+        if plan.id:
+            self._set_id(rctx['ids'], plan.id, widget)
 
         # first, ensure that the widget have all the properties used in
         # the rule if not, they will be created as ObjectProperty.
@@ -1907,7 +2329,7 @@ class BuilderBase(object):
         # create children tree
         Factory_get = Factory.get
         Factory_is_template = Factory.is_template
-        for crule in rule.children:
+        for crule, cid in plan.children:
             cname = crule.name
 
             # depending if the child rule is a template or not, we are not
@@ -1922,12 +2344,12 @@ class BuilderBase(object):
                 idmap.update({'root': rctx['ids']['root']})
                 if 'ctx' in rctx['ids']:
                     idmap.update({'ctx': rctx['ids']['ctx']})
+                prule = None
                 try:
-                    for prule in crule.properties.values():
-                        value = prule.co_value
-                        if type(value) is CodeType:
+                    for key, value, is_expr, prule in crule.plan.properties:
+                        if is_expr:
                             value = eval(value, idmap)
-                        ctx[prule.name] = value
+                        ctx[key] = value
                     for prule in crule.handlers:
                         value = eval(prule.value, idmap)
                         ctx[prule.name] = value
@@ -1942,8 +2364,8 @@ class BuilderBase(object):
                 widget.add_widget(child)
 
                 # reference it on our root rule context
-                if crule.id:
-                    rctx['ids'][crule.id] = child
+                if cid:
+                    rctx['ids'][cid] = child
 
             else:
                 # we got a "normal" rule, construct it manually
@@ -1951,16 +2373,34 @@ class BuilderBase(object):
                 # previous implementation was doing the add_widget() before
                 # apply(), and so, we could use "self.parent".
                 child = cls(__no_builder=True)
+                crules = self.match(child) + [crule]
+                deferred = self._is_build_deferred(child, crules)
                 widget.add_widget(child)
-                self.apply(child)
+                if deferred and child.parent is None:
+                    # the rules of its class and this rule are applied when
+                    # the child is added to a parent, see apply_deferred().
+                    # The id is known by the root rule already.
+                    child._build_pending = [(x, None) for x in crules[:-1]]
+                    child._build_pending.append((crule, rctx['ids']))
+                    if cid:
+                        self._set_id(rctx['ids'], cid, child)
+                    # the values of this rule are set now too, so that the
+                    # parent knows them, like the name of a screen. They are
+                    # set again when the rules are applied.
+                    crule.create_missing(child)
+                    for key, value, is_expr, prule in crule.plan.properties:
+                        if not is_expr:
+                            setattr(child, key, value)
+                    continue
+                for x in crules[:-1]:
+                    self._apply_rule(child, x, x)
                 self._apply_rule(child, crule, rootrule)
 
         # append the properties and handlers to our final resolution task
-        if rule.properties:
-            rctx['set'].append((widget.proxy_ref,
-                                list(rule.properties.values())))
-        if rule.handlers:
-            rctx['hdl'].append((widget.proxy_ref, rule.handlers))
+        if plan.properties:
+            rctx['set'].append((widget.proxy_ref, plan))
+        if plan.handlers:
+            rctx['hdl'].append((widget.proxy_ref, plan))
 
         # if we are applying another rule that the root one, then it's done for
         # us!
@@ -1968,17 +2408,21 @@ class BuilderBase(object):
             del self.rulectx[rule]
             return
 
-        # normally, we can apply a list of properties with a proper context
+        # normally, we can apply a list of properties with a proper context.
+        # The expressions of a widget share the same idmap.
+        ids = rctx['ids']
+        delayed = self.delayed_expressions
         try:
             rule = None
-            for widget_set, rules in reversed(rctx['set']):
-                for rule in rules:
-                    assert(isinstance(rule, ParserRuleProperty))
-                    key = rule.name
-                    value = rule.co_value
-                    if type(value) is CodeType:
-                        value = create_handler(widget_set, widget_set, key,
-                                               value, rule, rctx['ids'])
+            for widget_set, plan in reversed(rctx['set']):
+                if plan.expressions:
+                    idmap = copy(ids)
+                    idmap.update(global_idmap)
+                    idmap['self'] = widget_set.proxy_ref
+                for key, value, is_expr, rule in plan.properties:
+                    if is_expr:
+                        value = bind_handler(widget_set, widget_set, key,
+                                             value, rule, idmap, delayed)
                     setattr(widget_set, key, value)
         except Exception as e:
             if rule is not None:
@@ -1991,16 +2435,16 @@ class BuilderBase(object):
         # build handlers
         try:
             crule = None
-            for widget_set, rules in rctx['hdl']:
-                for crule in rules:
-                    assert(isinstance(crule, ParserRuleProperty))
-                    assert(crule.name.startswith('on_'))
-                    key = crule.name
-                    if not widget_set.is_event_type(key):
-                        key = key[3:]
-                    idmap = copy(global_idmap)
-                    idmap.update(rctx['ids'])
-                    idmap['self'] = widget_set.proxy_ref
+            for widget_set, plan in rctx['hdl']:
+                base_idmap = copy(global_idmap)
+                base_idmap.update(ids)
+                base_idmap['self'] = widget_set.proxy_ref
+                is_event_type = widget_set.is_event_type
+                for key, event, crule in plan.handlers:
+                    if not is_event_type(key):
+                        key = event
+                    # handlers are executed, each one needs its own idmap
+                    idmap = copy(base_idmap)
                     if not widget_set.fast_bind(key, custom_callback, crule,
                                                 idmap):
                         raise AttributeError(key)
@@ -2021,16 +2465,31 @@ class BuilderBase(object):
     def match(self, widget):
         '''Return a list of :class:`ParserRule` objects matching the widget.
         '''
-        cache = BuilderBase._match_cache
+        cache = self._match_cache
         k = (widget.__class__, widget.id, tuple(widget.cls))
         if k in cache:
             return cache[k]
+
+        # collect the rules of each selector matching the widget, and sort
+        # them in the loading order
+        index = self._rules_index
+        matched = []
+        rules = index[ParserSelectorName]
+        for name in set(ParserSelectorName.get_names(widget.__class__)):
+            matched.extend(rules.get(name, ()))
+        if widget.id:
+            matched.extend(
+                index[ParserSelectorId].get(widget.id.lower(), ()))
+        rules = index[ParserSelectorClass]
+        for name in set(widget.cls):
+            matched.extend(rules.get(name, ()))
+        matched.sort(key=itemgetter(0))
+
         rules = []
-        for selector, rule in self.rules:
-            if selector.match(widget):
-                if rule.avoid_previous_rules:
-                    del rules[:]
-                rules.append(rule)
+        for order, rule in matched:
+            if rule.avoid_previous_rules:
+                del rules[:]
+            rules.append(rule)
         cache[k] = rules
         return rules
 
@@ -2039,23 +2498,35 @@ class BuilderBase(object):
         expressions related to the canvas.
 
         .. versionadded:: 1.7.0
+
+        .. versionchanged:: 1.9.0
+            The expressions delayed while executing the waiting ones are
+            executed too, see :ref:`kv-delayed-expressions`.
         '''
         global _delayed_start
-        next_args = _delayed_start
-        if next_args is None:
-            return
+        passes = 0
+        while _delayed_start is not None:
+            # executing an expression can delay others, they are linked in a
+            # new list executed in the next pass. Expressions depending on
+            # each other would never end, leave them for the next frame.
+            passes += 1
+            if passes > 100:
+                Logger.warning('Builder: Delayed expressions are still '
+                               'changing after 100 passes')
+                return
+            next_args = _delayed_start
+            _delayed_start = None
 
-        while next_args is not StopIteration:
-            # is this try/except still needed? yes, in case widget died in this
-            # frame after the call was scheduled
-            try:
-                call_fn(next_args[:-1], None, None)
-            except ReferenceError:
-                pass
-            args = next_args
-            next_args = args[-1]
-            args[-1] = None
-        _delayed_start = None
+            while next_args is not StopIteration:
+                # is this try/except still needed? yes, in case widget died in
+                # this frame after the call was scheduled
+                try:
+                    call_fn(next_args[:-1], None, None)
+                except ReferenceError:
+                    pass
+                args = next_args
+                next_args = args[-1]
+                args[-1] = None
 
     def unbind_widget(self, uid):
         '''(internal) Unbind all the handlers created by the rules of the
@@ -7,12 +7,26 @@ application :
 
 * FPS
 * Graph of input events
+* Most dispatched properties and events, with the `dispatch` option
+* GL state changes avoided per frame, with the `glstate` option
 
 Usage
 -----
 
 For normal module usage, please see the :mod:`~kivy.modules` documentation.
 
+.. versionchanged:: 1.9.0
+    With the `dispatch` option, e.g. ``-m monitor:dispatch``, the tracing of
+    the dispatches is started, and the properties and events dispatched the
+    most during the last second are shown below the toolbar. See
+    :ref:`event-tracing`.
+
+.. versionchanged:: 1.9.0
+    With the `glstate` option, e.g. ``-m monitor:glstate``, the GL state
+    changes (program, texture and blending changes and uniform uploads)
+    issued and avoided per frame are shown below the toolbar. See
+    :meth:`~kivy.graphics.context.Context.get_gl_state_stats`.
+
 '''
 
 __all__ = ('start', 'stop')
@@ -20,6 +34,8 @@ __all__ = ('start', 'stop')
 from kivy.uix.label import Label
 from kivy.graphics import Rectangle, Color
 from kivy.clock import Clock
+from kivy.event import start_tracing, stop_tracing
+from kivy.graphics.context import get_context
 from functools import partial
 
 _statsinput = 0
@@ -32,6 +48,29 @@ def update_fps(ctx, *largs):
     ctx.rectangle.size = ctx.label.texture_size
 
 
+def update_dispatches(ctx, *largs):
+    tracer = ctx.tracer
+    names = ['%s.%s: %d' % (cls.rsplit('.', 1)[-1], name, count)
+             for (cls, name), count in tracer.get_dispatches()[:3]]
+    tracer.reset()
+    ctx.dispatch_label.text = 'Dispatches/s: ' + ', '.join(names)
+    ctx.dispatch_rectangle.texture = ctx.dispatch_label.texture
+    ctx.dispatch_rectangle.size = ctx.dispatch_label.texture_size
+
+
+def update_glstate(ctx, *largs):
+    frames = Clock.frames_displayed
+    count = max(1, frames - ctx.glstate_frames)
+    ctx.glstate_frames = frames
+    stats = get_context().get_gl_state_stats(reset=True)
+    calls = sum(c for c, a in stats.values())
+    avoided = sum(a for c, a in stats.values())
+    ctx.glstate_label.text = 'GL calls/frame: %d, avoided: %d' % (
+        calls // count, avoided // count)
+    ctx.glstate_rectangle.texture = ctx.glstate_label.texture
+    ctx.glstate_rectangle.size = ctx.glstate_label.texture_size
+
+
 def update_stats(ctx, *largs):
     global _statsinput
     ctx.stats = ctx.stats[1:] + [_statsinput]
@@ -75,6 +114,37 @@ def start(win, ctx):
     Clock.schedule_interval(partial(update_fps, ctx), .5)
     Clock.schedule_interval(partial(update_stats, ctx), 1 / 60.)
 
+    if ctx.config.get('dispatch'):
+        ctx.tracer = start_tracing()
+        ctx.dispatch_label = Label(text='Dispatches/s:')
+        with win.canvas.after:
+            Color(1, 0, 0, .5)
+            Rectangle(pos=(0, win.height - 50), size=(win.width, 25))
+            Color(1, 1, 1)
+            ctx.dispatch_rectangle = Rectangle(pos=(5, win.height - 45))
+        ctx.dispatch_event = Clock.schedule_interval(
+            partial(update_dispatches, ctx), 1.)
+
+    if ctx.config.get('glstate'):
+        top = win.height - (75 if ctx.config.get('dispatch') else 50)
+        get_context().get_gl_state_stats(reset=True)
+        ctx.glstate_frames = Clock.frames_displayed
+        ctx.glstate_label = Label(text='GL calls/frame:')
+        with win.canvas.after:
+            Color(1, 0, 0, .5)
+            Rectangle(pos=(0, top), size=(win.width, 25))
+            Color(1, 1, 1)
+            ctx.glstate_rectangle = Rectangle(pos=(5, top + 5))
+        ctx.glstate_event = Clock.schedule_interval(
+            partial(update_glstate, ctx), 1.)
+
 
 def stop(win, ctx):
+    if getattr(ctx, 'tracer', None) is not None:
+        ctx.dispatch_event.cancel()
+        stop_tracing()
+        ctx.tracer = None
+    if getattr(ctx, 'glstate_event', None) is not None:
+        ctx.glstate_event.cancel()
+        ctx.glstate_event = None
     win.canvas.remove(ctx.label)
@@ -1,21 +1,24 @@
 from kivy._event cimport EventDispatcher, EventObservers
 
 cdef class PropertyStorage:
+    # the per-instance state of a property. Only what can differ between
+    # instances is stored here, the rest is kept by the property itself.
     cdef object value
+    # created on the first binding, see get_observers()
     cdef EventObservers observers
     cdef object numeric_fmt
+    cdef int stop_event
+    cdef int alias_initial
+    cdef int batch_pending
+    cdef inline EventObservers get_observers(self)
+
+cdef class BoundedPropertyStorage(PropertyStorage):
     cdef long bnum_min
     cdef long bnum_max
     cdef float bnum_f_min
     cdef float bnum_f_max
     cdef int bnum_use_min
     cdef int bnum_use_max
-    cdef list options
-    cdef tuple properties
-    cdef int stop_event
-    cdef object getter
-    cdef object setter
-    cdef int alias_initial
 
 cdef class Property:
     cdef str _name
@@ -25,6 +28,7 @@ cdef class Property:
     cdef object errorhandler
     cdef int errorvalue_set
     cdef public object defaultvalue
+    cdef PropertyStorage create_storage(self)
     cdef init_storage(self, EventDispatcher obj, PropertyStorage storage)
     cpdef link(self, EventDispatcher obj, str name)
     cpdef link_deps(self, EventDispatcher obj, str name)
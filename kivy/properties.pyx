@@ -240,6 +240,20 @@ cpdef float dpi2px(value, ext):
     elif ext == 'mm':
         return rv * g_dpi / 25.4
 
+cdef class PropertyStorage:
+
+    cdef inline EventObservers get_observers(self):
+        # most properties are never bound, their observers are only created
+        # when needed
+        if self.observers is None:
+            self.observers = EventObservers()
+        return self.observers
+
+
+cdef class BoundedPropertyStorage(PropertyStorage):
+    pass
+
+
 cdef class Property:
     '''Base class for building more complex properties.
 
@@ -322,9 +336,11 @@ cdef class Property:
         def __get__(self):
             return self._name
 
+    cdef PropertyStorage create_storage(self):
+        return PropertyStorage()
+
     cdef init_storage(self, EventDispatcher obj, PropertyStorage storage):
         storage.value = self.convert(obj, self.defaultvalue)
-        storage.observers = EventObservers()
 
     cpdef link(self, EventDispatcher obj, str name):
         '''Link the instance with its real name.
@@ -345,11 +361,11 @@ cdef class Property:
         used in `Widget.__new__`. The link function is also used to create the
         storage space of the property for this specific widget instance.
         '''
-        cdef PropertyStorage d
+        cdef PropertyStorage d = None
         if self._name != '' and name != self._name:
-            d = obj.__storage.get(self._name, PropertyStorage())
-        else:
-            d = PropertyStorage()
+            d = obj.__storage.get(self._name)
+        if d is None:
+            d = self.create_storage()
         self._name = name
         obj.__storage[name] = d
         self.init_storage(obj, d)
@@ -361,7 +377,7 @@ cdef class Property:
         '''Add a new observer to be called only when the value is changed.
         '''
         cdef PropertyStorage ps = obj.__storage[self._name]
-        ps.observers.bind(WeakMethod(observer), 1)
+        ps.get_observers().bind(WeakMethod(observer), 1)
 
     cpdef fast_bind(self, EventDispatcher obj, observer, tuple largs=(), dict kwargs={}):
         '''Similar to bind, except it doesn't check if the observer already
@@ -370,13 +386,14 @@ cdef class Property:
         It returns a unique positive uid to be used with unbind_uid.
         '''
         cdef PropertyStorage ps = obj.__storage[self._name]
-        return ps.observers.fast_bind(observer, largs, kwargs, 0)
+        return ps.get_observers().fast_bind(observer, largs, kwargs, 0)
 
     cpdef unbind(self, EventDispatcher obj, observer):
         '''Remove the observer from our widget observer list.
         '''
         cdef PropertyStorage ps = obj.__storage[self._name]
-        ps.observers.unbind(observer, 1, 0)
+        if ps.observers is not None:
+            ps.observers.unbind(observer, 1, 0)
 
     cpdef fast_unbind(self, EventDispatcher obj, observer, tuple largs=(), dict kwargs={}):
         '''Remove the observer from our widget observer list bound with
@@ -384,14 +401,16 @@ cdef class Property:
         which searches for all matches.
         '''
         cdef PropertyStorage ps = obj.__storage[self._name]
-        ps.observers.fast_unbind(observer, largs, kwargs)
+        if ps.observers is not None:
+            ps.observers.fast_unbind(observer, largs, kwargs)
 
     cpdef unbind_uid(self, EventDispatcher obj, object uid):
         '''Remove the observer from our widget observer list bound with
         fast_bind using the uid.
         '''
         cdef PropertyStorage ps = obj.__storage[self._name]
-        ps.observers.unbind_uid(uid)
+        if ps.observers is not None:
+            ps.observers.unbind_uid(uid)
 
     def __set__(self, EventDispatcher obj, val):
         self.set(obj, val)
@@ -475,9 +494,19 @@ cdef class Property:
             # dispatch this property on the button instance
             prop.dispatch(button)
 
+        .. versionchanged:: 1.9.0
+            Within :meth:`~kivy.event.EventDispatcher.batch`, the dispatch is
+            delayed until the end of the batch.
+
         '''
         cdef PropertyStorage ps = obj.__storage[self._name]
-        ps.observers.dispatch(obj, ps.value, None, None, 0)
+        if obj._batch_depth:
+            if not ps.batch_pending:
+                ps.batch_pending = 1
+                obj._batch_pending.append(self)
+            return
+        if ps.observers is not None:
+            ps.observers.dispatch(obj, ps.value, None, None, 0, self._name)
 
 
 cdef class NumericProperty(Property):
@@ -577,72 +606,192 @@ cdef class StringProperty(Property):
                 obj.__class__.__name__,
                 self.name))
 
-cdef inline void observable_list_dispatch(object self):
+cdef inline object observable_token(object self, EventDispatcher obj):
+    # identify the dispatch that will notify the changes being made, None if
+    # they are dispatched right away
+    if obj is not None and obj._batch_depth:
+        return obj._batch_pending
+    if self._batch_depth:
+        return self._batch_token
+    return None
+
+
+cdef inline void observable_add_changes(
+        object self, EventDispatcher obj, list changes):
+    # the changes are kept until the next change that is dispatched apart
+    token = observable_token(self, obj)
+    if token is None or token is not self._changes_token:
+        self.changes = []
+        self._changes_token = token
+    self.changes.extend(changes)
+    if self._batch_depth:
+        self._batch_changed = True
+
+
+cdef class _ObservableBatch(object):
+    # context manager returned by ObservableList/ObservableDict.batch()
+    cdef object observable
+
+    def __cinit__(self, observable):
+        self.observable = observable
+
+    def __enter__(self):
+        observable = self.observable
+        if not observable._batch_depth:
+            observable._batch_token = self
+            observable._batch_changed = False
+        observable._batch_depth += 1
+        return observable
+
+    def __exit__(self, *largs):
+        observable = self.observable
+        observable._batch_depth -= 1
+        if observable._batch_depth:
+            return
+        observable._batch_token = None
+        if observable._batch_changed:
+            observable._batch_changed = False
+            observable._dispatch()
+
+
+cdef list list_slice_changes(
+        Py_ssize_t length, object key, Py_ssize_t new_length):
+    # changes made by setting or deleting a slice of a list of length items
+    cdef Py_ssize_t start, stop, step, removed, inserted
+    start, stop, step = key.indices(length)
+    if step != 1:
+        return [('reset', 0, new_length)]
+    stop = max(start, stop)
+    removed = stop - start
+    inserted = new_length - length + removed
+    if removed == inserted:
+        return [('set', start, stop)] if removed else []
+    changes = []
+    if removed:
+        changes.append(('remove', start, stop))
+    if inserted:
+        changes.append(('insert', start, start + inserted))
+    return changes
+
+
+cdef inline Py_ssize_t list_index(Py_ssize_t length, Py_ssize_t index):
+    # positive index of an item, clamped like list.insert does
+    if index < 0:
+        return max(0, index + length)
+    return min(index, length)
+
+
+cdef inline void observable_list_dispatch(object self, list changes):
     cdef Property prop = self.prop
     obj = self.obj()
-    if obj is not None:
+    if changes is not None:
+        observable_add_changes(self, obj, changes)
+    if obj is not None and not self._batch_depth:
         prop.dispatch(obj)
 
 
 class ObservableList(list):
     # Internal class to observe changes inside a native python list.
+
+    # the changes since the last dispatch, see the ListProperty documentation
+    changes = ()
+    _changes_token = None
+    _batch_depth = 0
+    _batch_token = None
+    _batch_changed = False
+
     def __init__(self, *largs):
         self.prop = largs[0]
         self.obj = ref(largs[1])
         super(ObservableList, self).__init__(*largs[2:])
+        self.changes = [('reset', 0, len(self))]
+
+    def batch(self):
+        return _ObservableBatch(self)
+
+    def _dispatch(self):
+        observable_list_dispatch(self, None)
 
     def __setitem__(self, key, value):
+        cdef Py_ssize_t length = len(self)
         list.__setitem__(self, key, value)
-        observable_list_dispatch(self)
+        if isinstance(key, slice):
+            changes = list_slice_changes(length, key, len(self))
+        else:
+            key = list_index(length, key)
+            changes = [('set', key, key + 1)]
+        observable_list_dispatch(self, changes)
 
     def __delitem__(self, key):
+        cdef Py_ssize_t length = len(self)
         list.__delitem__(self, key)
-        observable_list_dispatch(self)
+        if isinstance(key, slice):
+            changes = list_slice_changes(length, key, len(self))
+        else:
+            key = list_index(length, key)
+            changes = [('remove', key, key + 1)]
+        observable_list_dispatch(self, changes)
 
     def __setslice__(self, *largs):
+        cdef Py_ssize_t length = len(self)
         list.__setslice__(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, list_slice_changes(
+            length, slice(largs[0], largs[1]), len(self)))
 
     def __delslice__(self, *largs):
+        cdef Py_ssize_t length = len(self)
         list.__delslice__(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, list_slice_changes(
+            length, slice(largs[0], largs[1]), len(self)))
 
     def __iadd__(self, *largs):
+        cdef Py_ssize_t length = len(self)
         list.__iadd__(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, [('insert', length, len(self))])
 
     def __imul__(self, *largs):
+        cdef Py_ssize_t length = len(self)
         list.__imul__(self, *largs)
-        observable_list_dispatch(self)
+        if len(self) < length:
+            changes = [('remove', len(self), length)]
+        else:
+            changes = [('insert', length, len(self))]
+        observable_list_dispatch(self, changes)
 
     def append(self, *largs):
+        cdef Py_ssize_t length = len(self)
         list.append(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, [('insert', length, length + 1)])
 
     def remove(self, *largs):
+        cdef Py_ssize_t index = list.index(self, *largs)
         list.remove(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, [('remove', index, index + 1)])
 
     def insert(self, *largs):
+        cdef Py_ssize_t index = list_index(len(self), largs[0])
         list.insert(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, [('insert', index, index + 1)])
 
     def pop(self, *largs):
+        cdef Py_ssize_t length = len(self)
         cdef object result = list.pop(self, *largs)
-        observable_list_dispatch(self)
+        cdef Py_ssize_t index = list_index(length, largs[0] if largs else -1)
+        observable_list_dispatch(self, [('remove', index, index + 1)])
         return result
 
     def extend(self, *largs):
+        cdef Py_ssize_t length = len(self)
         list.extend(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, [('insert', length, len(self))])
 
-    def sort(self, *largs):
-        list.sort(self, *largs)
-        observable_list_dispatch(self)
+    def sort(self, *largs, **kwargs):
+        list.sort(self, *largs, **kwargs)
+        observable_list_dispatch(self, [('reset', 0, len(self))])
 
     def reverse(self, *largs):
         list.reverse(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, [('reset', 0, len(self))])
 
 
 cdef class ListProperty(Property):
@@ -668,6 +817,38 @@ cdef class ListProperty(Property):
             >>> my_list.append(10)
             >>> print(my_list, widget.my_list)
             [1, 5, 7, 10], [1, 5, 7]
+
+    .. versionadded:: 1.9.0
+
+    The list stored in the property has a `changes` attribute, listing the
+    changes made since the previous dispatch. Each change is a tuple
+    ``(op, start, stop)``, where `op` is one of:
+
+        - 'insert': the items from `start` to `stop` were inserted.
+        - 'remove': the items from `start` to `stop` were removed.
+        - 'set': the items from `start` to `stop` were replaced.
+        - 'reset': the list was replaced, sorted or reversed. All the items
+          may have changed.
+
+    The indices of a change are relative to the list after the previous
+    changes. Observers can use them to update incrementally instead of
+    processing the whole list::
+
+        def on_my_list(self, instance, value):
+            for op, start, stop in value.changes:
+                ...
+
+    Every change of the list dispatches the property. To dispatch only once
+    for many changes, use the `batch()` context manager of the list::
+
+        with widget.my_list.batch():
+            for i in range(10000):
+                widget.my_list.append(i)
+        # the property was dispatched once, with
+        # [('insert', 0, 1), ('insert', 1, 2), ...] as changes
+
+    The changes made within :meth:`~kivy.event.EventDispatcher.batch` are
+    coalesced the same way.
     '''
     def __init__(self, defaultvalue=None, **kw):
         defaultvalue = defaultvalue or []
@@ -691,17 +872,35 @@ cdef class ListProperty(Property):
         value = ObservableList(self, obj, value)
         Property.set(self, obj, value)
 
-cdef inline void observable_dict_dispatch(object self):
+cdef inline void observable_dict_dispatch(object self, list changes):
     cdef Property prop = self.prop
-    prop.dispatch(self.obj)
+    if changes is not None:
+        observable_add_changes(self, self.obj, changes)
+    if not self._batch_depth:
+        prop.dispatch(self.obj)
 
 
 class ObservableDict(dict):
     # Internal class to observe changes inside a native python dict.
+
+    # the changes since the last dispatch, see the DictProperty documentation
+    changes = ()
+    _changes_token = None
+    _batch_depth = 0
+    _batch_token = None
+    _batch_changed = False
+
     def __init__(self, *largs):
         self.prop = largs[0]
         self.obj = largs[1]
         super(ObservableDict, self).__init__(*largs[2:])
+        self.changes = [('reset', None)]
+
+    def batch(self):
+        return _ObservableBatch(self)
+
+    def _dispatch(self):
+        observable_dict_dispatch(self, None)
 
     def _weak_return(self, item):
         if isinstance(item, ref):
@@ -716,45 +915,50 @@ class ObservableDict(dict):
                             super(ObservableDict, self).__getattr__(attr))
 
     def __setattr__(self, attr, value):
-        if attr in ('prop', 'obj'):
+        if attr in ('prop', 'obj', 'changes', '_changes_token',
+                    '_batch_depth', '_batch_token', '_batch_changed'):
             super(ObservableDict, self).__setattr__(attr, value)
             return
         self.__setitem__(attr, value)
 
     def __setitem__(self, key, value):
         dict.__setitem__(self, key, value)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, [('set', key)])
 
     def __delitem__(self, key):
         dict.__delitem__(self, key)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, [('remove', key)])
 
     def clear(self, *largs):
         dict.clear(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, [('reset', None)])
 
     def remove(self, *largs):
         dict.remove(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, [('remove', largs[0])])
 
     def pop(self, *largs):
+        cdef int missing = largs[0] not in self
         cdef object result = dict.pop(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(
+            self, [] if missing else [('remove', largs[0])])
         return result
 
     def popitem(self, *largs):
         cdef object result = dict.popitem(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, [('remove', result[0])])
         return result
 
     def setdefault(self, *largs):
+        cdef int missing = largs[0] not in self
         cdef object result = dict.setdefault(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, [('set', largs[0])] if missing else [])
         return result
 
     def update(self, *largs):
-        dict.update(self, *largs)
-        observable_dict_dispatch(self)
+        items = dict(*largs)
+        dict.update(self, items)
+        observable_dict_dispatch(self, [('set', key) for key in items])
 
 
 cdef class DictProperty(Property):
@@ -774,6 +978,13 @@ cdef class DictProperty(Property):
         Similar to :class:`ListProperty`, when assigning a dict to a
         :class:`DictProperty`, the dict stored in the property is a copy of the
         dict and not the original dict. See :class:`ListProperty` for details.
+
+    .. versionadded:: 1.9.0
+
+    Like the :class:`ListProperty` list, the dict stored in the property has
+    a `batch()` context manager and a `changes` attribute. The changes are
+    tuples ``(op, key)``, where `op` is 'set' or 'remove', or
+    ``('reset', None)`` when the dict was replaced or cleared.
     '''
     def __init__(self, defaultvalue=None, rebind=False, **kw):
         defaultvalue = defaultvalue or {}
@@ -920,7 +1131,11 @@ cdef class BoundedNumericProperty(Property):
 
         Property.__init__(self, *largs, **kw)
 
-    cdef init_storage(self, EventDispatcher obj, PropertyStorage storage):
+    cdef PropertyStorage create_storage(self):
+        return BoundedPropertyStorage()
+
+    cdef init_storage(self, EventDispatcher obj, PropertyStorage _storage):
+        cdef BoundedPropertyStorage storage = _storage
         Property.init_storage(self, obj, storage)
         storage.bnum_min = self.min
         storage.bnum_max = self.max
@@ -948,7 +1163,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef BoundedPropertyStorage ps = obj.__storage[self._name]
         if value is None:
             ps.bnum_use_min = 0
         elif type(value) is float:
@@ -971,7 +1186,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef BoundedPropertyStorage ps = obj.__storage[self._name]
         if ps.bnum_use_min == 1:
             return ps.bnum_min
         elif ps.bnum_use_min == 2:
@@ -988,7 +1203,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef BoundedPropertyStorage ps = obj.__storage[self._name]
         if value is None:
             ps.bnum_use_max = 0
         elif type(value) is float:
@@ -1005,7 +1220,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef BoundedPropertyStorage ps = obj.__storage[self._name]
         if ps.bnum_use_max == 1:
             return ps.bnum_max
         if ps.bnum_use_max == 2:
@@ -1014,7 +1229,7 @@ cdef class BoundedNumericProperty(Property):
     cdef check(self, EventDispatcher obj, value):
         if Property.check(self, obj, value):
             return True
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef BoundedPropertyStorage ps = obj.__storage[self._name]
         if ps.bnum_use_min == 1:
             _min = ps.bnum_min
             if value < _min:
@@ -1092,20 +1307,15 @@ cdef class OptionProperty(Property):
         self.options = list(kw.get('options', []))
         super(OptionProperty, self).__init__(*largs, **kw)
 
-    cdef init_storage(self, EventDispatcher obj, PropertyStorage storage):
-        Property.init_storage(self, obj, storage)
-        storage.options = self.options[:]
-
     cdef check(self, EventDispatcher obj, value):
         if Property.check(self, obj, value):
             return True
-        cdef PropertyStorage ps = obj.__storage[self._name]
-        if value not in ps.options:
+        if value not in self.options:
             raise ValueError('%s.%s is set to an invalid option %r. '
                              'Must be one of: %s' % (
                              obj.__class__.__name__,
                              self.name,
-                             value, ps.options))
+                             value, self.options))
 
     property options:
         '''Return the options available.
@@ -1154,7 +1364,6 @@ cdef class ReferenceListProperty(Property):
 
     cdef init_storage(self, EventDispatcher obj, PropertyStorage storage):
         Property.init_storage(self, obj, storage)
-        storage.properties = tuple(self.properties)
         storage.stop_event = 0
 
     cpdef link(self, EventDispatcher obj, str name):
@@ -1172,7 +1381,7 @@ cdef class ReferenceListProperty(Property):
         cdef PropertyStorage ps = obj.__storage[self._name]
         if ps.stop_event:
             return
-        p = ps.properties
+        p = self.properties
 
         try:
             ps.value.__setslice__(0, len(p),
@@ -1194,7 +1403,7 @@ cdef class ReferenceListProperty(Property):
 
     cdef check(self, EventDispatcher obj, value):
         cdef PropertyStorage ps = obj.__storage[self._name]
-        if len(value) != len(ps.properties):
+        if len(value) != len(self.properties):
             raise ValueError('%s.%s value length is immutable' % (
                 obj.__class__.__name__,
                 self.name))
@@ -1204,12 +1413,14 @@ cdef class ReferenceListProperty(Property):
         cdef list value
         cdef PropertyStorage ps = obj.__storage[self._name]
         value = self.convert(obj, _value)
-        if not self.force_dispatch and self.compare_value(ps.value, value):
+        # within a batch, ps.value is not updated yet by trigger_change
+        if not self.force_dispatch and self.compare_value(self.get(obj),
+                                                          value):
             return False
         self.check(obj, value)
         # prevent dependency loop
         ps.stop_event = 1
-        props = ps.properties
+        props = self.properties
         for idx in xrange(len(props)):
             prop = props[idx]
             x = value[idx]
@@ -1230,13 +1441,13 @@ cdef class ReferenceListProperty(Property):
 
         ps.stop_event = 1
         if isinstance(key, slice):
-            props = ps.properties[key]
+            props = self.properties[key]
             for index in xrange(len(props)):
                 prop = props[index]
                 x = value[index]
                 res = prop.set(obj, x) or res
         else:
-            prop = ps.properties[key]
+            prop = self.properties[key]
             res = prop.set(obj, value)
         ps.stop_event = 0
         if res:
@@ -1244,7 +1455,7 @@ cdef class ReferenceListProperty(Property):
 
     cpdef get(self, EventDispatcher obj):
         cdef PropertyStorage ps = obj.__storage[self._name]
-        cdef tuple p = ps.properties
+        cdef list p = self.properties
         try:
             ps.value.__setslice__(0, len(p),
                     [prop.get(obj) for prop in p],
@@ -1311,8 +1522,6 @@ cdef class AliasProperty(Property):
 
     cdef init_storage(self, EventDispatcher obj, PropertyStorage storage):
         Property.init_storage(self, obj, storage)
-        storage.getter = self.getter
-        storage.setter = self.setter
         storage.alias_initial = 1
 
     cpdef link_deps(self, EventDispatcher obj, str name):
@@ -1336,14 +1545,14 @@ cdef class AliasProperty(Property):
         cdef PropertyStorage ps = obj.__storage[self._name]
         if self.use_cache:
             if ps.alias_initial:
-                ps.value = ps.getter(obj)
+                ps.value = self.getter(obj)
                 ps.alias_initial = 0
             return ps.value
-        return ps.getter(obj)
+        return self.getter(obj)
 
     cpdef set(self, EventDispatcher obj, value):
         cdef PropertyStorage ps = obj.__storage[self._name]
-        if ps.setter(obj, value):
+        if self.setter(obj, value):
             ps.value = self.get(obj)
             self.dispatch(obj)
 
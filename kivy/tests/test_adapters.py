@@ -1056,6 +1056,67 @@ class AdaptersTestCase(unittest.TestCase):
         self.assertEqual(list_adapter.data, ['cat'])
         self.assertEqual(pet_listener.current_pet, ['cat'])
 
+    def test_list_adapter_update_cache(self):
+        list_item_args_converter = \
+                lambda row_index, rec: {'text': rec,
+                                        'size_hint_y': None,
+                                        'height': 25}
+
+        list_adapter = ListAdapter(data=['a', 'b', 'c'],
+                                   args_converter=list_item_args_converter,
+                                   selection_mode='single',
+                                   allow_empty_selection=True,
+                                   cls=ListItemButton)
+
+        # The views before the first changed index are kept.
+        views = [list_adapter.get_view(i) for i in range(3)]
+        list_adapter.data.append('d')
+        self.assertEqual(sorted(list_adapter.cached_views), [0, 1, 2])
+
+        list_adapter.data.insert(1, 'e')
+        self.assertEqual(sorted(list_adapter.cached_views), [0])
+        self.assertTrue(list_adapter.get_view(0) is views[0])
+        self.assertEqual(list_adapter.get_view(1).text, 'e')
+
+        # The changes of a batch are dispatched at once.
+        for i in range(5):
+            list_adapter.get_view(i)
+        with list_adapter.data.batch():
+            list_adapter.data[4] = 'f'
+            list_adapter.data[2] = 'g'
+        self.assertEqual(sorted(list_adapter.cached_views), [0, 1])
+
+        list_adapter.data = ['h', 'i']
+        self.assertEqual(list_adapter.cached_views, {})
+
+    def test_list_adapter_update_cache_with_selection(self):
+        list_item_args_converter = \
+                lambda row_index, rec: {'text': rec,
+                                        'size_hint_y': None,
+                                        'height': 25}
+
+        list_adapter = ListAdapter(data=['a', 'b', 'c'],
+                                   args_converter=list_item_args_converter,
+                                   selection_mode='single',
+                                   allow_empty_selection=True,
+                                   cls=ListItemButton)
+
+        for i in range(3):
+            list_adapter.get_view(i)
+        view = list_adapter.get_view(1)
+        list_adapter.handle_selection(view)
+        self.assertEqual(list_adapter.selection, [view])
+
+        # A change after the selection keeps it.
+        list_adapter.data[2] = 'd'
+        self.assertEqual(sorted(list_adapter.cached_views), [0, 1])
+        self.assertEqual(list_adapter.selection, [view])
+
+        # A change of the selected view resets the cache and the selection.
+        list_adapter.data[1] = 'e'
+        self.assertEqual(list_adapter.cached_views, {})
+        self.assertEqual(list_adapter.selection, [])
+
     def test_dict_adapter_composite(self):
         item_strings = ["{0}".format(index) for index in range(100)]
 
@@ -1189,6 +1250,26 @@ class AdaptersTestCase(unittest.TestCase):
         self.assertIsNone(dict_adapter.get_data_item(-1))
         self.assertIsNone(dict_adapter.get_data_item(2))
 
+    def test_dict_adapter_update_for_new_data(self):
+        # The changes of a dict are keys, DictAdapter handles them itself.
+        data = dict((str(i), {'name': str(i)}) for i in range(3))
+        dict_adapter = DictAdapter(data=data,
+                                   args_converter=self.args_converter,
+                                   selection_mode='single',
+                                   allow_empty_selection=True,
+                                   cls=ListItemButton)
+
+        dict_adapter.get_view(0)
+        dict_adapter.data['3'] = {'name': '3'}
+        self.assertEqual(dict_adapter.sorted_keys, ['0', '1', '2', '3'])
+        self.assertEqual(dict_adapter.cached_views, {})
+
+        dict_adapter.get_view(0)
+        del dict_adapter.data['0']
+        self.assertEqual(dict_adapter.sorted_keys, ['1', '2', '3'])
+        self.assertEqual(dict_adapter.cached_views, {})
+        self.assertEqual(dict_adapter.get_view(0).text, '1')
+
     def test_dict_adapter_selection_mode_single_without_propagation(self):
 
         list_item_args_converter = \
@@ -0,0 +1,209 @@
+'''
+Atlas tests
+===========
+'''
+
+import unittest
+import random
+
+
+class AtlasPackingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rnd = random.Random(0)
+        self.sizes = [(rnd.randint(1, 100), rnd.randint(1, 100))
+                      for i in range(100)]
+
+    def check_packing(self, sizes, width, height, algorithm, rotation):
+        from kivy.atlas import _pack
+        placements, pages = _pack(sizes, width, height, algorithm, rotation)
+        rects = [[] for i in range(pages)]
+        for (w, h), (page, x, y, rotated) in zip(sizes, placements):
+            if rotated:
+                self.assertTrue(rotation)
+                w, h = h, w
+            self.assertTrue(0 <= x and x + w <= width)
+            self.assertTrue(0 <= y and y + h <= height)
+            for ox, oy, ow, oh in rects[page]:
+                self.assertTrue(x >= ox + ow or ox >= x + w or
+                                y >= oy + oh or oy >= y + h)
+            rects[page].append((x, y, w, h))
+        return pages
+
+    def test_algorithms(self):
+        for algorithm in ('guillotine', 'maxrects', 'skyline'):
+            for rotation in (False, True):
+                pages = self.check_packing(
+                    self.sizes, 256, 256, algorithm, rotation)
+                self.assertTrue(pages >= 1)
+
+    def test_maxrects_denser(self):
+        guillotine = self.check_packing(
+            self.sizes, 256, 256, 'guillotine', False)
+        maxrects = self.check_packing(self.sizes, 256, 256, 'maxrects', False)
+        self.assertTrue(maxrects <= guillotine)
+
+    def test_rotation(self):
+        pages = self.check_packing([(100, 10), (10, 100)], 100, 20,
+                                   'maxrects', True)
+        self.assertEqual(pages, 1)
+
+    def test_find_size(self):
+        from kivy.atlas import _find_size, _pack
+        w, h = _find_size(self.sizes, 'maxrects', False)
+        self.assertEqual(w & (w - 1), 0)
+        self.assertEqual(h & (h - 1), 0)
+        self.assertEqual(_pack(self.sizes, w, h, 'maxrects', False)[1], 1)
+        self.assertEqual(_find_size([(30, 30)], 'skyline', False), (32, 32))
+
+
+class AtlasManifestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, content):
+        from os.path import join
+        filename = join(self.tmpdir, name)
+        with open(filename, 'wb') as fd:
+            fd.write(content)
+        return filename
+
+    def test_digest(self):
+        from kivy.atlas import _get_digest
+        a = self.write('a.png', b'a')
+        b = self.write('b.png', b'b')
+        digest = _get_digest([a, b], (512, 2))
+        self.assertEqual(digest, _get_digest([a, b], (512, 2)))
+        self.assertNotEqual(digest, _get_digest([a, b], (256, 2)))
+        self.assertNotEqual(digest, _get_digest([a], (512, 2)))
+        self.write('b.png', b'c')
+        self.assertNotEqual(digest, _get_digest([a, b], (512, 2)))
+
+    def test_uptodate(self):
+        import json
+        from os.path import join
+        from kivy.atlas import _get_uptodate_meta, _read_manifest
+        outname = join(self.tmpdir, 'out')
+        self.assertEqual(_read_manifest(join(self.tmpdir, 'none.json')), {})
+        self.assertEqual(_get_uptodate_meta(outname, 'x', 'x'), None)
+        meta = {'out-0.png': {'a': [0, 0, 1, 1]}}
+        self.write('out.atlas', json.dumps(meta).encode('utf-8'))
+        self.assertEqual(_get_uptodate_meta(outname, 'x', 'x'), None)
+        self.write('out-0.png', b'')
+        self.assertEqual(_get_uptodate_meta(outname, 'x', 'x'), meta)
+        self.assertEqual(_get_uptodate_meta(outname, 'x', 'y'), None)
+
+
+class AtlasLazyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import json
+        import tempfile
+        from os.path import join
+        self.tmpdir = tempfile.mkdtemp()
+        self.write_png(join(self.tmpdir, 'test-0.png'), 32, 32)
+        self.write_png(join(self.tmpdir, 'test-1.png'), 16, 16)
+        meta = {'test-0.png': {'a': [0, 0, 16, 16], 'b': [16, 0, 16, 16]},
+                'test-1.png': {'c': [0, 0, 16, 16]}}
+        self.filename = join(self.tmpdir, 'test.atlas')
+        with open(self.filename, 'w') as fd:
+            json.dump(meta, fd)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def write_png(self, filename, width, height):
+        # write a white RGB image, without needing an image library
+        import struct
+        import zlib
+
+        def chunk(tag, data):
+            return (struct.pack('>I', len(data)) + tag + data +
+                    struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+        rows = (b'\x00' + b'\xff' * (width * 3)) * height
+        with open(filename, 'wb') as fd:
+            fd.write(b'\x89PNG\r\n\x1a\n')
+            fd.write(chunk(b'IHDR', struct.pack(
+                '>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+            fd.write(chunk(b'IDAT', zlib.compress(rows)))
+            fd.write(chunk(b'IEND', b''))
+
+    def page_name(self, name):
+        from os.path import join
+        return join(self.tmpdir, name)
+
+    def page(self, atlas, name):
+        # the loaded texture of a page, or None. The regions share its id
+        texture = atlas._pages.get(self.page_name(name))
+        return texture() if texture is not None else None
+
+    def test_index(self):
+        from kivy.atlas import Atlas
+        atlas = Atlas(self.filename, lazy=True)
+        self.assertTrue(atlas.lazy)
+        self.assertEqual(sorted(atlas.keys()), ['a', 'b', 'c'])
+        self.assertEqual(atlas._pages, {})
+        self.assertEqual(atlas.textures, {})
+
+    def test_load_page(self):
+        from kivy.atlas import Atlas
+        atlas = Atlas(self.filename, lazy=True)
+        a = atlas['a']
+        self.assertEqual(a.size, (16, 16))
+        self.assertEqual(list(atlas._pages.keys()),
+                         [self.page_name('test-0.png')])
+        b = atlas['b']
+        self.assertEqual(a.id, b.id)
+        self.assertEqual(len(atlas._pages), 1)
+        self.assertEqual(self.page(atlas, 'test-0.png').id, a.id)
+        self.assertTrue(atlas['a'] is a)
+        self.assertEqual(self.page(atlas, 'test-1.png'), None)
+
+    def test_release_page(self):
+        import gc
+        from kivy.atlas import Atlas
+        atlas = Atlas(self.filename, lazy=True)
+        a = atlas['a']
+        b = atlas['b']
+        del a
+        gc.collect()
+        self.assertEqual(self.page(atlas, 'test-0.png').id, b.id)
+        del b
+        gc.collect()
+        self.assertEqual(self.page(atlas, 'test-0.png'), None)
+
+        # the page is loaded again on the next access
+        a = atlas['a']
+        self.assertEqual(self.page(atlas, 'test-0.png').id, a.id)
+
+    def test_atlas_url(self):
+        from os.path import join
+        from kivy.cache import Cache
+        from kivy.config import Config
+        from kivy.core.image import Image as CoreImage
+        rfn = join(self.tmpdir, 'test')
+        lazy = Config.get('kivy', 'atlas_lazy')
+        Config.set('kivy', 'atlas_lazy', '1')
+        try:
+            a = CoreImage('atlas://%s/a' % rfn).texture
+            atlas = Cache.get('kv.atlas', rfn)
+            self.assertTrue(atlas.lazy)
+            self.assertEqual(sorted(atlas.keys()), ['a', 'b', 'c'])
+            self.assertEqual(list(atlas._pages.keys()),
+                             [self.page_name('test-0.png')])
+            self.assertEqual(self.page(atlas, 'test-0.png').id, a.id)
+            b = CoreImage('atlas://%s/b' % rfn).texture
+            self.assertEqual(b.id, a.id)
+            self.assertEqual(self.page(atlas, 'test-1.png'), None)
+        finally:
+            Config.set('kivy', 'atlas_lazy', lazy)
+            Cache.remove('kv.atlas', rfn)
+            for uid in ('a', 'b'):
+                Cache.remove('kv.texture', 'atlas://%s/%s|0|0' % (rfn, uid))
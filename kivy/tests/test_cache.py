@@ -0,0 +1,138 @@
+'''
+Cache tests
+===========
+'''
+
+import unittest
+
+
+class FakeTexture(object):
+
+    def __init__(self, width, height, colorfmt='rgba'):
+        self.width = width
+        self.height = height
+        self.colorfmt = colorfmt
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.clock import Clock
+        self.last_tick = Clock._last_tick
+
+    def tearDown(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        Clock._last_tick = self.last_tick
+        Cache._categories.pop('test', None)
+        Cache._objects.pop('test', None)
+
+    def test_append_get(self):
+        from kivy.cache import Cache
+        Cache.register('test')
+        Cache.append('test', 'a', 1)
+        self.assertEqual(Cache.get('test', 'a'), 1)
+        self.assertEqual(Cache.get('test', 'b', 2), 2)
+        self.assertEqual(Cache.get('unknown', 'a', 3), 3)
+        stats = Cache._categories['test']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_limit_lru(self):
+        from kivy.cache import Cache
+        Cache.register('test', limit=2)
+        Cache.append('test', 'a', 1)
+        Cache.append('test', 'b', 2)
+        # a becomes the most recently used
+        Cache.get('test', 'a')
+        Cache.append('test', 'c', 3)
+        self.assertEqual(Cache.get('test', 'b'), None)
+        self.assertEqual(Cache.get('test', 'a'), 1)
+        self.assertEqual(Cache.get('test', 'c'), 3)
+        self.assertEqual(Cache._categories['test']['evictions'], 1)
+
+    def test_max_size(self):
+        from kivy.cache import Cache
+        Cache.register('test', max_size=100)
+        Cache.append('test', 'a', 'a', size=60)
+        Cache.append('test', 'b', 'b', size=30)
+        self.assertEqual(Cache._categories['test']['size'], 90)
+        Cache.append('test', 'c', 'c', size=30)
+        self.assertEqual(Cache.get('test', 'a'), None)
+        self.assertEqual(Cache._categories['test']['size'], 60)
+        Cache.remove('test', 'b')
+        self.assertEqual(Cache._categories['test']['size'], 30)
+        Cache.remove('test')
+        self.assertEqual(Cache._categories['test']['size'], 0)
+
+    def test_estimated_size(self):
+        from kivy.cache import Cache
+        Cache.register('test')
+        Cache.append('test', 'rgba', FakeTexture(10, 10))
+        Cache.append('test', 'rgb', FakeTexture(10, 10, 'rgb'))
+        Cache.append('test', 'other', object())
+        self.assertEqual(Cache._categories['test']['size'], 700)
+
+    def test_replace(self):
+        from kivy.cache import Cache
+        Cache.register('test', limit=2)
+        Cache.append('test', 'a', 1, size=10)
+        Cache.append('test', 'a', 2, size=20)
+        self.assertEqual(Cache.get('test', 'a'), 2)
+        self.assertEqual(Cache._categories['test']['size'], 20)
+        self.assertEqual(len(Cache._objects['test']), 1)
+
+    def test_timeout(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        Cache.register('test', timeout=10)
+        Clock._last_tick = 100.
+        Cache.append('test', 'a', 1)
+        Cache.append('test', 'b', 2, timeout=30)
+        Clock._last_tick = 105.
+        Cache.append('test', 'c', 3)
+        Clock._last_tick = 112.
+        Cache._purge_by_timeout(0)
+        self.assertEqual(list(Cache._objects['test'].keys()), ['b', 'c'])
+        Clock._last_tick = 131.
+        Cache._purge_by_timeout(0)
+        self.assertEqual(list(Cache._objects['test'].keys()), [])
+        self.assertEqual(Cache._categories['test']['evictions'], 3)
+
+    def test_stats(self):
+        from kivy.cache import Cache
+        Cache.register('test', limit=1)
+        self.assertEqual(Cache.get_stats('unknown'), None)
+        Cache.append('test', 'a', 1, size=10)
+        Cache.get('test', 'a')
+        Cache.get('test', 'a')
+        Cache.get('test', 'b')
+        Cache.append('test', 'c', 3, size=5)
+        stats = Cache.get_stats('test')
+        self.assertEqual(stats['count'], 1)
+        self.assertEqual(stats['size'], 5)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3.)
+        self.assertAlmostEqual(stats['miss_rate'], 1 / 3.)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(Cache.get_stats()['test'], stats)
+
+    def test_trim(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        Cache.register('test')
+        Cache.register('test.other')
+        try:
+            for i in range(4):
+                Clock._last_tick = float(i)
+                Cache.append('test' if i % 2 else 'test.other', i, i)
+            Clock._last_tick = 10.
+            Cache.get('test.other', 0)
+            self.assertEqual(Cache.trim(.5, ['test', 'test.*']), 2)
+            self.assertEqual(list(Cache._objects['test'].keys()), [3])
+            self.assertEqual(list(Cache._objects['test.other'].keys()), [0])
+            self.assertEqual(Cache.trim(categories=['test*']), 2)
+            self.assertEqual(Cache.trim(categories=['test*']), 0)
+        finally:
+            Cache._categories.pop('test.other')
+            Cache._objects.pop('test.other')
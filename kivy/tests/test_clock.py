@@ -20,6 +20,7 @@ class ClockTestCase(unittest.TestCase):
         global counter
         counter = 0
         Clock._events = [[] for i in range(256)]
+        Clock._callbacks = {}
 
     def test_schedule_once(self):
         from kivy.clock import Clock
@@ -73,3 +74,278 @@ class ClockTestCase(unittest.TestCase):
         Clock.unschedule(callback)
         Clock.tick()
         self.assertEqual(counter, 0)
+
+    def test_unschedule_not_all(self):
+        from kivy.clock import Clock
+        Clock.schedule_once(callback)
+        Clock.schedule_once(callback)
+        Clock.unschedule(callback, all=False)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_unschedule_many(self):
+        from kivy.clock import Clock
+
+        def callback2(dt):
+            callback(dt)
+        event = Clock.schedule_once(callback2)
+        Clock.schedule_interval(callback, 0)
+        Clock.unschedule_many([event, callback])
+        Clock.tick()
+        self.assertEqual(counter, 0)
+        self.assertEqual(Clock._callbacks, {})
+
+    def test_cancel_retrigger(self):
+        from kivy.clock import Clock
+        trigger = Clock.create_trigger(callback)
+        for i in range(10):
+            trigger()
+            trigger.cancel()
+        trigger()
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        self.assertEqual(sum(map(len, Clock._events)), 0)
+
+
+class ClockTaskTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.clock import ClockBase
+        self.clock = ClockBase()
+        self.clock._max_fps = 0
+        self.clock.task_budget = 0
+        self.log = []
+
+    def steps(self, name, count):
+        for i in range(count):
+            self.log.append((name, i))
+            yield
+
+    def test_callable(self):
+        task = self.clock.schedule_task(lambda: self.log.append('a'))
+        self.assertFalse(task.is_done)
+        self.clock.tick()
+        self.assertEqual(self.log, ['a'])
+        self.assertTrue(task.is_done)
+        self.clock.tick()
+        self.assertEqual(self.log, ['a'])
+
+    def test_generator_one_step_per_frame(self):
+        self.clock.schedule_task(self.steps('a', 3))
+        self.clock.tick()
+        self.assertEqual(self.log, [('a', 0)])
+        self.clock.tick()
+        self.clock.tick()
+        self.clock.tick()
+        self.assertEqual(self.log, [('a', 0), ('a', 1), ('a', 2)])
+        self.assertEqual(self.clock._tasks, [])
+
+    def test_callable_returning_generator(self):
+        self.clock.task_budget = 10
+        self.clock.schedule_task(lambda: self.steps('a', 3))
+        self.clock.tick()
+        self.assertEqual(self.log, [('a', 0), ('a', 1), ('a', 2)])
+
+    def test_priority(self):
+        self.clock.task_budget = 10
+        self.clock.schedule_task(self.steps('low', 1), priority=-1)
+        self.clock.schedule_task(self.steps('a', 1))
+        self.clock.schedule_task(self.steps('b', 1))
+        self.clock.schedule_task(self.steps('high', 1), priority=1)
+        self.clock.tick()
+        self.assertEqual(
+            self.log, [('high', 0), ('a', 0), ('b', 0), ('low', 0)])
+
+    def test_cancel(self):
+        task = self.clock.schedule_task(self.steps('a', 3))
+        self.clock.tick()
+        task.cancel()
+        self.clock.tick()
+        self.assertEqual(self.log, [('a', 0)])
+        self.assertTrue(task.is_done)
+
+    def test_invalid_task(self):
+        self.assertRaises(ValueError, self.clock.schedule_task, 42)
+
+
+class ClockProfilerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.clock import ClockBase
+        global counter
+        counter = 0
+        self.clock = ClockBase()
+        self.clock._max_fps = 0
+
+    def test_disabled(self):
+        self.assertIsNone(self.clock.profiler)
+        self.assertIsNone(self.clock.stop_profiling())
+
+    def test_stats(self):
+        profiler = self.clock.start_profiling(slowest_ticks=2)
+        self.assertIs(self.clock.profiler, profiler)
+        self.clock.schedule_interval(callback, 0)
+        for i in range(3):
+            self.clock.tick()
+        self.assertIs(self.clock.stop_profiling(), profiler)
+        self.clock.tick()
+        self.assertEqual(counter, 4)
+
+        stats = profiler.get_stats()
+        self.assertEqual(len(stats), 1)
+        name, values = stats[0]
+        self.assertTrue(name.endswith('test_clock.callback'))
+        self.assertEqual(values['count'], 3)
+        self.assertTrue(values['total'] >= values['max'])
+
+        ticks = profiler.get_slowest_ticks()
+        self.assertEqual(len(ticks), 2)
+        self.assertTrue(ticks[0]['duration'] >= ticks[1]['duration'])
+        self.assertEqual(ticks[0]['callbacks'][0][0], name)
+
+    def test_method_name(self):
+        from kivy.clock import _callback_name
+
+        class Foo(object):
+            def bar(self, dt):
+                pass
+        self.assertEqual(_callback_name(Foo().bar),
+                         '%s.Foo.bar' % __name__)
+
+    def test_dump(self):
+        import json
+        import os
+        import tempfile
+        profiler = self.clock.start_profiling()
+        self.clock.schedule_once(callback)
+        self.clock.tick()
+        fd, filename = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            profiler.dump(filename)
+            with open(filename) as fd:
+                data = json.load(fd)
+        finally:
+            os.unlink(filename)
+        self.assertEqual(data['callbacks'][0][1]['count'], 1)
+        self.assertEqual(len(data['slowest_ticks']), 1)
+
+
+class ClockHeapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.clock import ClockBaseHeap
+        global counter
+        counter = 0
+        self.clock = ClockBaseHeap()
+
+    def test_schedule_once(self):
+        self.clock.schedule_once(callback)
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_schedule_once_draw_after(self):
+        self.clock.schedule_once(callback, 0)
+        self.clock.tick_draw()
+        self.assertEqual(counter, 0)
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_schedule_once_draw_before(self):
+        self.clock.schedule_once(callback, -1)
+        self.clock.tick_draw()
+        self.assertEqual(counter, 1)
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_schedule_later(self):
+        self.clock.schedule_once(callback, 5.)
+        self.clock.tick()
+        self.assertEqual(counter, 0)
+        self.assertEqual(len(self.clock._heap), 1)
+
+    def test_schedule_interval(self):
+        self.clock.schedule_interval(callback, 0)
+        self.clock.tick()
+        self.clock.tick()
+        self.assertEqual(counter, 2)
+        self.clock.unschedule(callback)
+        self.clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_interval_return_false(self):
+        def stop(dt):
+            callback(dt)
+            return False
+        self.clock.schedule_interval(stop, 0)
+        self.clock.tick()
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_unschedule(self):
+        self.clock.schedule_once(callback)
+        self.clock.unschedule(callback)
+        self.clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_unschedule_after_tick(self):
+        self.clock.schedule_once(callback, 5.)
+        self.clock.tick()
+        self.clock.unschedule(callback)
+        self.clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_trigger(self):
+        trigger = self.clock.create_trigger(callback)
+        trigger()
+        trigger()
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+        trigger()
+        trigger.cancel()
+        trigger()
+        self.clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_retrigger_in_callback(self):
+        def retrigger(dt):
+            callback(dt)
+            trigger()
+        trigger = self.clock.create_trigger(retrigger)
+        trigger()
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+        self.clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_unschedule_many(self):
+        def callback2(dt):
+            callback(dt)
+        event = self.clock.schedule_once(callback2, -1)
+        self.clock.schedule_interval(callback, 0)
+        self.clock.unschedule_many([event, callback])
+        self.clock.tick_draw()
+        self.clock.tick()
+        self.assertEqual(counter, 0)
+        self.assertEqual(self.clock._callbacks, {})
+        self.assertEqual(self.clock._events_before_frame, [])
+
+    def test_cancel_shared_key(self):
+        class Obj(object):
+            def cb1(self, dt):
+                callback(dt)
+
+            def cb2(self, dt):
+                callback(dt)
+        obj = Obj()
+        events = [self.clock.schedule_once(obj.cb1),
+                  self.clock.schedule_once(obj.cb2),
+                  self.clock.schedule_once(obj.cb1)]
+        events[0].cancel()
+        self.clock.unschedule(obj.cb2)
+        self.assertEqual(self.clock._callbacks, {id(obj): [events[2]]})
+        self.clock.tick()
+        self.assertEqual(counter, 1)
+        self.assertEqual(self.clock._callbacks, {})
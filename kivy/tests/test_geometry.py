@@ -0,0 +1,106 @@
+'''
+Geometry tests
+==============
+'''
+
+import unittest
+import random
+
+
+class BoxIndexTestCase(unittest.TestCase):
+
+    def check_index(self, boxes, points):
+        from kivy.geometry import BoxIndex
+        index = BoxIndex(boxes)
+        for x, y in points:
+            expected = [i for i, (bx, by, right, top) in enumerate(boxes)
+                        if bx <= x <= right and by <= y <= top]
+            self.assertEqual(index.query(x, y), expected)
+
+    def test_random(self):
+        rnd = random.Random(0)
+        boxes = []
+        for i in range(500):
+            x, y = rnd.uniform(-100, 900), rnd.uniform(-100, 900)
+            boxes.append((x, y, x + rnd.uniform(0, 60),
+                          y + rnd.uniform(0, 60)))
+        # a few boxes covering most of the area
+        boxes[10] = (-50, -50, 800, 800)
+        boxes[300] = (0, 0, 1000, 10)
+        points = [(rnd.uniform(-200, 1000), rnd.uniform(-200, 1000))
+                  for i in range(1000)]
+        # the corners of the boxes
+        points += [(b[0], b[1]) for b in boxes] + [(b[2], b[3]) for b in boxes]
+        self.check_index(boxes, points)
+
+    def test_grid(self):
+        # adjacent cells, the borders are shared
+        boxes = [(x * 10, y * 10, x * 10 + 10, y * 10 + 10)
+                 for y in range(20) for x in range(20)]
+        points = [(x * 5, y * 5) for x in range(-1, 42) for y in range(-1, 42)]
+        self.check_index(boxes, points)
+
+    def test_degenerate(self):
+        from kivy.geometry import BoxIndex
+        self.assertEqual(BoxIndex([]).query(0, 0), [])
+        # empty and inverted boxes
+        boxes = [(5, 5, 5, 5), (10, 10, 10, 10), (0, 0, 0, 0), (3, 3, 1, 1)]
+        self.check_index(boxes, [(5, 5), (10, 10), (0, 0), (2, 2), (7, 3)])
+
+
+class LayoutTouchIndexTestCase(unittest.TestCase):
+
+    def make_layout(self, touch_index):
+        from kivy.uix.floatlayout import FloatLayout
+        from kivy.uix.widget import Widget
+
+        class Child(Widget):
+            def on_touch_down(self, touch):
+                touch.received.append(self)
+                return self.collide_point(*touch.pos) and self.grab_touches
+
+        rnd = random.Random(0)
+        layout = FloatLayout(touch_index=touch_index)
+        for i in range(200):
+            child = Child(size_hint=(None, None),
+                          pos=(rnd.uniform(0, 500), rnd.uniform(0, 500)),
+                          size=(rnd.uniform(1, 80), rnd.uniform(1, 80)))
+            child.grab_touches = i % 3 == 0
+            layout.add_widget(child)
+        return layout
+
+    def dispatch(self, layout, x, y):
+        class Touch(object):
+            pass
+        touch = Touch()
+        touch.x, touch.y = touch.pos = (x, y)
+        touch.received = []
+        result = layout.dispatch('on_touch_down', touch)
+        # indices of the children colliding with the touch, in dispatch order
+        received = [layout.children.index(c) for c in touch.received
+                    if c.collide_point(x, y)]
+        return bool(result), received
+
+    def test_touch_index(self):
+        linear = self.make_layout(False)
+        indexed = self.make_layout(True)
+        rnd = random.Random(1)
+        points = [(rnd.uniform(-10, 600), rnd.uniform(-10, 600))
+                  for i in range(300)]
+        for x, y in points:
+            self.assertEqual(self.dispatch(indexed, x, y),
+                             self.dispatch(linear, x, y))
+
+        # the index follows the children
+        points.append((1001, 1001))
+        for layout in (linear, indexed):
+            layout.children[0].pos = (1000, 1000)
+        self.assertEqual(self.dispatch(indexed, 1001, 1001), (False, [0]))
+        for layout in (linear, indexed):
+            layout.remove_widget(layout.children[5])
+            child = layout.children[-1]
+            layout.remove_widget(child)
+            layout.add_widget(child, index=3)
+        for x, y in points:
+            self.assertEqual(self.dispatch(indexed, x, y),
+                             self.dispatch(linear, x, y))
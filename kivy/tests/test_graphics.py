@@ -110,3 +110,317 @@ class FBOInstructionTestCase(unittest.TestCase):
         import os
         if os.path.exists('results.png'):
             os.unlink('results.png')
+
+
+class BatchingTestCase(unittest.TestCase):
+
+    def build(self, batching):
+        from kivy.graphics import (Fbo, ClearColor, ClearBuffers, Color,
+                                   Rectangle, Ellipse, InstructionGroup)
+        fbo = Fbo(size=(128, 128))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+        group = InstructionGroup(batching=batching)
+        shapes = []
+        for i in range(64):
+            if i % 16 == 0:
+                group.add(Color(1, i / 64., 0))
+            cls = Ellipse if i % 5 == 0 else Rectangle
+            shape = cls(pos=(i % 8 * 16, i // 8 * 16), size=(12, 12))
+            group.add(shape)
+            shapes.append(shape)
+        fbo.add(group)
+        return fbo, group, shapes
+
+    def draw(self, fbo):
+        # draw twice, the second frame uses the batched instructions
+        fbo.draw()
+        fbo.draw()
+        return fbo.pixels
+
+    def test_batching_pixels(self):
+        fbo, group, shapes = self.build(False)
+        bfbo, bgroup, bshapes = self.build(True)
+        self.assertTrue(bgroup.batching)
+        self.assertEqual(self.draw(fbo), self.draw(bfbo))
+
+        # same number of vertices, only the range of the shape is updated
+        shapes[10].pos = bshapes[10].pos = (3, 5)
+        self.assertEqual(self.draw(fbo), self.draw(bfbo))
+
+        # different number of vertices, the run is rebuilt
+        shapes[20].segments = bshapes[20].segments = 5
+        self.assertEqual(self.draw(fbo), self.draw(bfbo))
+
+        # removing a shape changes the runs
+        group.remove(shapes[30])
+        bgroup.remove(bshapes[30])
+        self.assertEqual(self.draw(fbo), self.draw(bfbo))
+
+        bgroup.batching = False
+        self.assertEqual(self.draw(fbo), self.draw(bfbo))
+
+
+class BufferArenaTestCase(unittest.TestCase):
+
+    def test_arena_stats(self):
+        import gc
+        from kivy.graphics import Fbo, Rectangle
+        from kivy.graphics.context import get_context
+        from kivy.graphics.vbo import get_arena_stats
+
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            rects = [Rectangle(pos=(i % 64, i // 64), size=(4, 4))
+                     for i in range(500)]
+        fbo.draw()
+
+        stats = get_arena_stats()
+        for name in ('vertex', 'element'):
+            arena = stats[name]
+            # all the rectangles share a few buffers
+            self.assertGreaterEqual(arena['pages'], 1)
+            self.assertLess(arena['pages'], 10)
+            self.assertEqual(arena['size'], arena['used'] + arena['free'])
+            self.assertTrue(0 < arena['occupancy'] <= 1)
+            self.assertTrue(0 <= arena['fragmentation'] <= 1)
+        # 4 vertices of 16 bytes per rectangle
+        self.assertGreaterEqual(stats['vertex']['used'], 500 * 4 * 16)
+
+        # releasing the rectangles releases their ranges
+        used = stats['vertex']['used']
+        fbo.clear()
+        del rects
+        gc.collect()
+        # the ranges are released with the other gl resources
+        get_context().gl_dealloc()
+        self.assertLess(get_arena_stats()['vertex']['used'], used)
+
+    def test_first_draw(self):
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Mesh
+
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            Mesh(vertices=[0, 0, 0, 0, 20, 0, 1, 0, 20, 30, 1, 1],
+                 indices=[0, 1, 2], mode='triangles')
+            # a bigger vertex format, in a new range of the buffer
+            Mesh(vertices=[30, 0, 0, 0, 0, 0, 0, 0,
+                           60, 0, 1, 0, 0, 0, 0, 0,
+                           60, 50, 1, 1, 0, 0, 0, 0,
+                           30, 50, 0, 1, 0, 0, 0, 0],
+                 indices=[0, 1, 2, 2, 3, 0], mode='triangles',
+                 fmt=[(b'vPosition', 2, 'float'),
+                      (b'vTexCoords0', 2, 'float'),
+                      (b'vUnused', 4, 'float')])
+        # a single draw, the vertices must be read from their new range
+        fbo.draw()
+        pixels = fbo.pixels
+
+        def pixel(x, y):
+            i = (y * 64 + x) * 4
+            return tuple(bytearray(pixels[i:i + 4]))
+
+        white, black = (255, 255, 255, 255), (0, 0, 0, 255)
+        self.assertEqual(pixel(15, 5), white)
+        self.assertEqual(pixel(5, 25), black)
+        self.assertEqual(pixel(45, 25), white)
+        self.assertEqual(pixel(58, 2), white)
+        self.assertEqual(pixel(45, 55), black)
+
+
+class GLStateTestCase(unittest.TestCase):
+
+    def test_gl_state_stats(self):
+        from kivy.graphics import Fbo, Color, Rectangle
+        from kivy.graphics.context import get_context
+
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            for i in range(10):
+                Color(1, i / 10., 0)
+                Rectangle(pos=(i * 6, 0), size=(4, 4))
+        fbo.draw()
+        pixels = fbo.pixels
+
+        ctx = get_context()
+        ctx.get_gl_state_stats(reset=True)
+        fbo.ask_update()
+        fbo.draw()
+        stats = ctx.get_gl_state_stats()
+        self.assertEqual(sorted(stats.keys()), [
+            'active_texture', 'blend', 'program', 'texture', 'uniform'])
+        # all the rectangles use the default texture, it is bound only once
+        calls, avoided = stats['texture']
+        self.assertLess(calls, avoided)
+        self.assertEqual(fbo.pixels, pixels)
+
+        ctx.get_gl_state_stats(reset=True)
+        for calls, avoided in ctx.get_gl_state_stats().values():
+            self.assertEqual((calls, avoided), (0, 0))
+
+    def test_uniforms_after_reset(self):
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, \
+            Rectangle, Callback
+
+        red = bytearray([255, 0, 0, 255])
+        for callback in (False, True):
+            fbo = Fbo(size=(16, 16))
+            with fbo:
+                ClearColor(0, 0, 0, 1)
+                ClearBuffers()
+                if callback:
+                    # forgets the GL state, the uniforms must still be set
+                    Callback(lambda instr: None)
+                Color(1, 0, 0)
+                Rectangle(size=(16, 16))
+            for frame in range(3):
+                fbo.ask_update()
+                fbo.draw()
+                self.assertEqual(bytearray(fbo.pixels), red * 256)
+
+
+class SpriteBatchTestCase(unittest.TestCase):
+
+    def render(self, sprites, batch):
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Rectangle, \
+            SpriteBatch
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            if batch:
+                SpriteBatch(instances=sprites)
+            else:
+                for i in range(0, len(sprites), 12):
+                    Rectangle(pos=sprites[i:i + 2], size=sprites[i + 2:i + 4])
+        fbo.draw()
+        return fbo.pixels
+
+    def test_sprite_batch(self):
+        from array import array
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, SpriteBatch
+
+        sprites = array('f')
+        for i in range(20):
+            sprites.extend([i * 3, i * 2, 4, 6, 1, 1, 1, 1, 0, 0, 1, 1])
+        self.assertEqual(self.render(sprites, True),
+                         self.render(sprites, False))
+
+        # the buffer is not copied, only the updated range is built again
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            batch = SpriteBatch(instances=sprites)
+        self.assertIs(batch.instances, sprites)
+        self.assertEqual(batch.count, 20)
+        fbo.draw()
+        sprites[12 * 5] = 40
+        sprites[12 * 6 + 1] = 50
+        batch.update(5, 2)
+        fbo.draw()
+        self.assertEqual(fbo.pixels, self.render(sprites, False))
+
+    def test_sprite_colors(self):
+        from array import array
+        from os.path import join
+        from kivy import kivy_shader_dir
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, \
+            RenderContext, SpriteBatch
+
+        with open(join(kivy_shader_dir, 'sprites.vs')) as fd:
+            vs = fd.read()
+        fbo = Fbo(size=(16, 16))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            rc = RenderContext(vs=vs, use_parent_projection=True,
+                               use_parent_modelview=True)
+        with rc:
+            SpriteBatch(instances=array('f', [
+                0, 0, 8, 16, 1, 0, 0, 1, 0, 0, 1, 1,
+                8, 0, 8, 16, 0, 0, 1, 1, 0, 0, 1, 1]))
+        fbo.draw()
+        row = bytearray(fbo.pixels)[:16 * 4]
+        self.assertEqual(row, bytearray([255, 0, 0, 255] * 8 +
+                                        [0, 0, 255, 255] * 8))
+
+    def test_sprite_batch_errors(self):
+        from kivy.graphics import SpriteBatch, GraphicException
+        batch = SpriteBatch()
+        self.assertEqual(batch.count, 0)
+        batch.instances = [0.] * 24
+        self.assertEqual(batch.count, 2)
+        with self.assertRaises(GraphicException):
+            batch.instances = [0.] * 13
+
+
+class MeshTestCase(unittest.TestCase):
+
+    def render(self, vertices, indices):
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Mesh
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            Mesh(vertices=vertices, indices=indices, mode='triangles')
+        fbo.draw()
+        return fbo.pixels
+
+    def test_mesh_buffers(self):
+        from array import array
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Mesh, \
+            GraphicException
+
+        vertices = [0, 0, 0, 0, 40, 0, 1, 0, 40, 40, 1, 1, 0, 40, 0, 1]
+        indices = [0, 1, 2, 2, 3, 0]
+        pixels = self.render(vertices, indices)
+        self.assertEqual(
+            self.render(array('f', vertices), array('H', indices)), pixels)
+
+        # buffers are not copied, lists are kept as lists
+        fvertices = array('f', vertices)
+        mesh = Mesh(vertices=fvertices, indices=indices, mode='triangles')
+        self.assertIs(mesh.vertices, fvertices)
+        self.assertEqual(mesh.indices, indices)
+        self.assertEqual(mesh.mode, 'triangles')
+
+        # partial updates are written into the vertices
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+        fbo.add(mesh)
+        fbo.draw()
+        mesh.update_vertices(1, [60, 0, 1, 0, 60, 50, 1, 1])
+        self.assertEqual(list(fvertices[4:12]), [60, 0, 1, 0, 60, 50, 1, 1])
+        fbo.draw()
+        vertices[4:12] = [60, 0, 1, 0, 60, 50, 1, 1]
+        self.assertEqual(fbo.pixels, self.render(vertices, indices))
+
+        # the buffer changed in place
+        fvertices[13] = 60
+        mesh.update_vertices(0, fvertices)
+        fbo.draw()
+        vertices[13] = 60
+        self.assertEqual(fbo.pixels, self.render(vertices, indices))
+
+        # new vertices, then new indices
+        vertices[8:10] = [30, 30]
+        mesh.vertices = array('f', vertices)
+        fbo.draw()
+        self.assertEqual(fbo.pixels, self.render(vertices, indices))
+        mesh.indices = array('H', [0, 1, 2])
+        fbo.draw()
+        self.assertEqual(fbo.pixels, self.render(vertices, [0, 1, 2]))
+
+        lmesh = Mesh(vertices=[0.] * 8, indices=[0, 1])
+        lmesh.update_vertices(1, array('f', [1, 2, 3, 4]))
+        self.assertEqual(lmesh.vertices, [0, 0, 0, 0, 1, 2, 3, 4])
+        with self.assertRaises(GraphicException):
+            lmesh.update_vertices(2, [0, 0, 0, 0])
+        with self.assertRaises(GraphicException):
+            lmesh.update_vertices(0, [0, 0, 0])
@@ -0,0 +1,108 @@
+'''
+Incremental layout tests
+========================
+'''
+
+import unittest
+import random
+
+
+class IncrementalLayoutTestCase(unittest.TestCase):
+
+    def build(self, cls, **kwargs):
+        from kivy.uix.widget import Widget
+        rnd = random.Random(0)
+        layout = cls(pos=(10, 20), size=(800, 600), **kwargs)
+        for i in range(60):
+            layout.add_widget(Widget(
+                size=(rnd.randint(10, 100), rnd.randint(10, 100)),
+                size_hint=(rnd.choice((None, .1, .2)),
+                           rnd.choice((None, .1, .3)))))
+        return layout
+
+    def do_layout(self, layout, full=False):
+        # lay out until no child changes, as the layout trigger would do
+        for i in range(10):
+            if full:
+                layout._layout_state = None
+            layout.do_layout()
+            if not layout._dirty_children:
+                return
+        self.fail('The layout does not converge')
+
+    def change(self, rnd, layouts):
+        index = rnd.randrange(len(layouts[0].children))
+        kind = rnd.randrange(5)
+        value = rnd.randint(5, 150)
+        hint = rnd.choice((None, .05, .1, .5))
+        pos_hint = rnd.choice(({}, {'x': .1}, {'top': .8}, {'center_y': .5}))
+        for layout in layouts:
+            c = layout.children[index]
+            if kind == 0:
+                c.width = value
+            elif kind == 1:
+                c.height = value
+            elif kind == 2:
+                c.size_hint_x = hint
+            elif kind == 3:
+                c.size_hint_y = hint
+            else:
+                c.pos_hint = pos_hint
+
+    def check_layout(self, cls, **kwargs):
+        layout = self.build(cls, **kwargs)
+        reference = self.build(cls, **kwargs)
+        self.do_layout(layout)
+        self.do_layout(reference, True)
+        rnd = random.Random(1)
+        for step in range(40):
+            for i in range(rnd.randint(1, 3)):
+                self.change(rnd, (layout, reference))
+            self.do_layout(layout)
+            self.do_layout(reference, True)
+            self.assertEqual(
+                [(c.x, c.y, c.width, c.height) for c in layout.children],
+                [(c.x, c.y, c.width, c.height) for c in reference.children])
+            if hasattr(layout, 'minimum_size'):
+                self.assertEqual(layout.minimum_size, reference.minimum_size)
+
+    def test_boxlayout(self):
+        from kivy.uix.boxlayout import BoxLayout
+        for orientation in ('horizontal', 'vertical'):
+            self.check_layout(BoxLayout, orientation=orientation, spacing=3,
+                              padding=[1, 2, 3, 4])
+
+    def test_gridlayout(self):
+        from kivy.uix.gridlayout import GridLayout
+        self.check_layout(GridLayout, cols=7, spacing=[2, 3], padding=5)
+        self.check_layout(GridLayout, rows=9, row_default_height=20)
+        self.check_layout(GridLayout, cols=6, cols_minimum={2: 40},
+                          col_force_default=True, col_default_width=30)
+
+    def test_stacklayout(self):
+        from kivy.uix.stacklayout import StackLayout
+        for orientation in ('lr-tb', 'tb-lr', 'rl-tb', 'tb-rl', 'lr-bt',
+                            'bt-lr', 'rl-bt', 'bt-rl'):
+            self.check_layout(StackLayout, orientation=orientation,
+                              spacing=[4, 2], padding=[1, 2, 3, 4])
+
+    def test_partial(self):
+        from kivy.uix.gridlayout import GridLayout
+        from kivy.uix.stacklayout import StackLayout
+        for layout in (GridLayout(cols=10), StackLayout()):
+            layout.size = (1000, 1000)
+            for i in range(100):
+                layout.add_widget(self.build_child())
+            self.do_layout(layout)
+            state = dict(layout._layout_state)
+            # the last child is in the last row and line
+            layout.children[0].height = 50
+            self.do_layout(layout)
+            kept = [c for c in layout.children
+                    if layout._layout_state[c] is state[c]]
+            self.assertTrue(len(kept) >= 80)
+            self.assertEqual(layout.children[0].height, 50)
+
+    def build_child(self):
+        from kivy.uix.widget import Widget
+        return Widget(size_hint=(None, None), size=(100, 10))
@@ -226,3 +226,210 @@ class LangTestCase(unittest.TestCase):
         self.assertTrue('on_press' in wid.binded_func)
         wid.binded_func['on_press']()
         self.assertEquals(wid.a, 1)
+
+    def test_kv_cache(self):
+        import os
+        import shutil
+        import tempfile
+        from kivy.lang import _kv_cache_digest, _kv_cache_filenames
+        content = '''
+#:set answer 42
+<TestClass>:
+    obj: answer
+    on_press: self.a = 1
+    TestClass2:
+        id: child
+        obj: root.uid
+'''
+        import kivy.lang
+        tmpdir = tempfile.mkdtemp()
+        home_dir = kivy.lang.kivy_home_dir
+        # the cache is opt-in, and written to the user directory
+        os.environ['KIVY_KV_CACHE'] = '1'
+        kivy.lang.kivy_home_dir = os.path.join(tmpdir, 'home')
+        try:
+            filename = os.path.join(tmpdir, 'test.kv')
+            with open(filename, 'w') as fd:
+                fd.write(content)
+            local_fn, cache_fn = _kv_cache_filenames(
+                filename, _kv_cache_digest(content))
+            for i in range(2):
+                Builder = self.import_builder()
+                Builder.load_file(filename)
+                self.assertTrue(os.path.exists(cache_fn))
+                self.assertFalse(os.path.exists(local_fn))
+                wid = TestClass()
+                Builder.apply(wid)
+                self.assertEqual(wid.obj, 42)
+                self.assertEqual(wid.children[0].obj, wid.uid)
+                self.assertTrue('on_press' in wid.binded_func)
+        finally:
+            del os.environ['KIVY_KV_CACHE']
+            kivy.lang.kivy_home_dir = home_dir
+            shutil.rmtree(tmpdir)
+
+    def test_match(self):
+        Builder = self.import_builder()
+        Builder.load_string('''
+<TestClass,BaseClass>:
+    a: 1
+<.mycls>:
+    b: 2
+<#myid>:
+    c: 3
+''')
+        wid = TestClass()
+        self.assertEqual([list(rule.properties)
+                          for rule in Builder.match(wid)], [['a'], ['a']])
+        wid = TestClass()
+        wid.id = 'MyId'
+        wid.cls = ['mycls']
+        self.assertEqual([list(rule.properties)
+                          for rule in Builder.match(wid)],
+                         [['a'], ['a'], ['b'], ['c']])
+
+        # the cached matches are updated when files are loaded and unloaded
+        import os
+        import shutil
+        import tempfile
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'test.kv')
+            Builder.load_string('<-TestClass>:\n    d: 4\n',
+                                filename=filename)
+            self.assertEqual([list(rule.properties)
+                              for rule in Builder.match(wid)], [['d']])
+            Builder.unload_file(filename)
+            self.assertEqual(len(Builder.match(wid)), 4)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_rule_plan(self):
+        Builder = self.import_builder()
+        Builder.load_string('''
+<TestClass>:
+    obj: child
+    on_press: self.obj.pressed = True
+    TestClass2:
+        id: child
+        obj: 'child'
+''')
+        widgets = []
+        for i in range(2):
+            wid = TestClass()
+            Builder.apply(wid)
+            widgets.append(wid)
+            child = wid.children[0]
+            # ids are proxies, compare the uids
+            self.assertEqual(list(wid.ids.keys()), ['child'])
+            self.assertEqual(wid.ids['child'].uid, child.uid)
+            self.assertEqual(wid.obj.uid, child.uid)
+            self.assertEqual(child.obj, 'child')
+            self.assertTrue('on_press' in wid.binded_func)
+
+        # the plan of the rule is built once, and shared by the instances
+        rule = Builder.match(widgets[0])[0]
+        plan = rule.plan
+        self.assertTrue(plan is rule.plan)
+        self.assertEqual([x[0] for x in plan.properties], ['obj'])
+        self.assertTrue(plan.expressions)
+        self.assertEqual([x[:2] for x in plan.handlers], [('on_press', 'press')])
+        self.assertEqual(plan.children[0][1], 'child')
+
+    def test_defer_build(self):
+        Builder = self.import_builder()
+        Builder.load_string('''
+<TestClass>:
+    obj: 'built'
+    TestClass3:
+<TestClass2>:
+    defer_build: True
+    obj: 'built'
+''')
+        wid = TestClass()
+        wid.defer_build = True
+        Builder.apply(wid)
+        self.assertEqual((wid.obj, wid.children), (None, []))
+        self.assertTrue(Builder.apply_deferred(wid))
+        self.assertEqual(wid.obj, 'built')
+        self.assertEqual(len(wid.children), 1)
+        self.assertFalse(Builder.apply_deferred(wid))
+
+        # the build is deferred by the rule, but not for a widget that
+        # already has a parent
+        wid = TestClass2()
+        Builder.apply(wid)
+        self.assertEqual(wid.obj, None)
+        self.assertTrue(Builder.apply_deferred(wid))
+        self.assertEqual(wid.obj, 'built')
+        wid = TestClass2()
+        wid.parent = TestClass()
+        Builder.apply(wid)
+        self.assertEqual(wid.obj, 'built')
+
+    def test_defer_build_rules_order(self):
+        from kivy.factory import Factory
+
+        class TestHolder(BaseClass):
+            # doesn't attach its children, like a ScreenManager
+            def add_widget(self, widget):
+                self.children.append(widget)
+
+        Builder = self.import_builder()
+        Factory.register('TestHolder', cls=TestHolder)
+        try:
+            Builder.load_string('''
+<TestClass2>:
+    obj: 'class'
+    TestClass3:
+        id: inner
+<TestHolder>:
+    TestClass2:
+        id: child
+        defer_build: True
+        obj: 'instance'
+''')
+            holder = TestHolder()
+            Builder.apply(holder)
+        finally:
+            Factory.unregister('TestHolder')
+        # the values of the parent rule are known before the build
+        child = holder.children[0]
+        self.assertEqual((child.obj, child.children), ('instance', []))
+        self.assertEqual(holder.ids['child'].uid, child.uid)
+
+        # the rule of the class is applied first, then the one of the parent
+        self.assertTrue(Builder.apply_deferred(child))
+        self.assertEqual(child.obj, 'instance')
+        self.assertEqual(len(child.children), 1)
+        self.assertEqual(holder.ids['child'].uid, child.uid)
+
+    def test_delayed_expressions(self):
+        Builder = self.import_builder()
+        Builder.delayed_expressions = True
+        Builder.load_string('''
+<TestClass>:
+    obj: '%s %s' % (self.a, self.b)
+''')
+        from kivy.event import Observable
+
+        class DelayedClass(TestClass, Observable):
+            a = b = proxy_ref = None
+
+        wid = DelayedClass()
+        wid.a, wid.b = 1, 2
+        Builder.apply(wid)
+        self.assertEqual(wid.obj, '1 2')
+
+        # the expression is only evaluated by sync, once, with the last
+        # values
+        rule = Builder.match(wid)[0].properties['obj']
+        count = rule.count
+        wid.a = 3
+        wid.binded_func['a'](wid, 3)
+        wid.b = 4
+        wid.binded_func['b'](wid, 4)
+        self.assertEqual(wid.obj, '1 2')
+        Builder.sync()
+        self.assertEqual(wid.obj, '3 4')
+        self.assertEqual(rule.count, count + 1)
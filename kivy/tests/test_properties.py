@@ -518,3 +518,189 @@ class PropertiesTestCase(unittest.TestCase):
         self.assertEqual(dict_rebind.text, 'Unset')
         self.assertEqual(dict_false.text, 'Unset')
         self.assertEqual(alias_rebind.text, 'Unset')
+
+    def test_batch(self):
+        from kivy.properties import NumericProperty, ReferenceListProperty
+
+        class Event(EventDispatcher):
+            x = NumericProperty(0)
+            y = NumericProperty(0)
+            pos = ReferenceListProperty(x, y)
+            size = NumericProperty(0)
+
+        calls = []
+        obj = Event()
+        obj.bind(x=lambda o, v: calls.append(('x', v)),
+                 y=lambda o, v: calls.append(('y', v)),
+                 pos=lambda o, v: calls.append(('pos', list(v))))
+
+        with obj.batch():
+            obj.x = 1
+            obj.x = 2
+            obj.y = 3
+            with obj.batch():
+                obj.pos = 4, 5
+            self.assertEqual(calls, [])
+            self.assertEqual(obj.pos, [4, 5])
+        self.assertEqual(calls, [('x', 4), ('y', 5), ('pos', [4, 5])])
+
+        # changes made by the observers are coalesced too
+        del calls[:]
+        obj.bind(x=lambda o, v: setattr(o, 'size', v),
+                 y=lambda o, v: setattr(o, 'size', o.size + v),
+                 size=lambda o, v: calls.append(('size', v)))
+        with obj.batch():
+            obj.x = 10
+            obj.y = 20
+        self.assertEqual(calls, [('x', 10), ('y', 20), ('pos', [10, 20]),
+                                 ('size', 30)])
+
+        # and no dispatch is delayed once the batch is over
+        del calls[:]
+        obj.y = 0
+        self.assertEqual(calls, [('pos', [10, 0]), ('y', 0)])
+
+    def test_list_changes(self):
+        from kivy.properties import ListProperty
+
+        class Event(EventDispatcher):
+            a = ListProperty([1, 2, 3])
+
+        calls = []
+        obj = Event()
+        obj.bind(a=lambda o, v: calls.append(list(v.changes)))
+        self.assertEqual(obj.a.changes, [('reset', 0, 3)])
+
+        obj.a.append(4)
+        obj.a.insert(-1, 5)
+        obj.a[0] = 0
+        obj.a[1:3] = [6]
+        del obj.a[-1]
+        obj.a.pop(0)
+        obj.a.remove(5)
+        obj.a.extend([7, 8])
+        obj.a.sort()
+        self.assertEqual(calls, [
+            [('insert', 3, 4)], [('insert', 3, 4)], [('set', 0, 1)],
+            [('remove', 1, 3), ('insert', 1, 2)], [('remove', 3, 4)],
+            [('remove', 0, 1)], [('remove', 1, 2)], [('insert', 1, 3)],
+            [('reset', 0, 3)]])
+        self.assertEqual(obj.a, [6, 7, 8])
+
+        del calls[:]
+        with obj.a.batch():
+            obj.a.append(9)
+            with obj.a.batch():
+                obj.a[0] = 5
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [[('insert', 3, 4), ('set', 0, 1)]])
+
+        # the changes are coalesced within a batch of the dispatcher too
+        del calls[:]
+        with obj.batch():
+            obj.a.append(10)
+            obj.a.append(11)
+        obj.a.append(12)
+        self.assertEqual(calls, [[('insert', 4, 5), ('insert', 5, 6)],
+                                 [('insert', 6, 7)]])
+
+    def test_dict_changes(self):
+        from kivy.properties import DictProperty
+
+        class Event(EventDispatcher):
+            a = DictProperty({})
+
+        calls = []
+        obj = Event()
+        obj.bind(a=lambda o, v: calls.append(list(v.changes)))
+        obj.a['x'] = 1
+        with obj.a.batch():
+            obj.a.update({'y': 2})
+            del obj.a['x']
+        obj.a.clear()
+        self.assertEqual(calls, [[('set', 'x')],
+                                 [('set', 'y'), ('remove', 'x')],
+                                 [('reset', None)]])
+
+    def test_storage(self):
+        from kivy.properties import (
+            NumericProperty, BoundedNumericProperty, OptionProperty)
+
+        class Event(EventDispatcher):
+            a = NumericProperty(0)
+            b = BoundedNumericProperty(0, min=0, max=10)
+            c = OptionProperty('x', options=['x', 'y'])
+
+        calls = []
+
+        def callback(obj, value):
+            calls.append(value)
+
+        # unbinding and dispatching work before the observers are created
+        obj = Event()
+        self.assertEqual(obj.get_property_observers('a'), [])
+        obj.unbind(a=callback)
+        obj.fast_unbind('a', callback)
+        obj.unbind_uid('a', 1)
+        obj.property('a').dispatch(obj)
+        obj.a = 1
+        obj.bind(a=callback)
+        obj.a = 2
+        self.assertEqual(len(obj.get_property_observers('a')), 1)
+        obj.unbind(a=callback)
+        obj.a = 3
+        self.assertEqual(calls, [2])
+
+        # the bounds stay per instance
+        other = Event()
+        obj.property('b').set_min(obj, -5)
+        self.assertEqual(obj.property('b').get_min(obj), -5)
+        self.assertEqual(other.property('b').get_min(other), 0)
+        obj.b = -5
+        self.assertRaises(ValueError, setattr, other, 'b', -5)
+        self.assertRaises(ValueError, setattr, obj, 'c', 'z')
+        obj.c = 'y'
+        self.assertEqual((obj.c, other.c), ('y', 'x'))
+
+    def test_tracing(self):
+        from kivy.event import start_tracing, stop_tracing, get_tracer
+        from kivy.properties import NumericProperty
+
+        class Event(EventDispatcher):
+            a = NumericProperty(0)
+            b = NumericProperty(0)
+            __events__ = ('on_test', )
+
+            def on_test(self):
+                pass
+
+            def callback(self, *largs):
+                pass
+
+        obj = Event()
+        obj.bind(a=obj.callback, b=obj.callback)
+        self.assertEqual(get_tracer(), None)
+        tracer = start_tracing()
+        try:
+            self.assertTrue(start_tracing() is tracer)
+            self.assertTrue(get_tracer() is tracer)
+            for i in range(3):
+                obj.a += 1
+            obj.b = 1
+            obj.dispatch('on_test')
+        finally:
+            self.assertTrue(stop_tracing() is tracer)
+        obj.a += 1
+        self.assertEqual(get_tracer(), None)
+
+        cls = '%s.Event' % __name__
+        # the ties are sorted by name
+        self.assertEqual(tracer.get_dispatches(), [
+            ((cls, 'a'), 3), ((cls, 'b'), 1), ((cls, 'on_test'), 1)])
+        stats = dict(tracer.get_stats())
+        self.assertEqual(sorted(stats.keys()), [
+            (cls, 'a', cls + '.callback'), (cls, 'b', cls + '.callback'),
+            (cls, 'on_test', cls + '.on_test')])
+        self.assertEqual(stats[(cls, 'a', cls + '.callback')]['count'], 3)
+        tracer.reset()
+        self.assertEqual(tracer.get_dispatches(), [])
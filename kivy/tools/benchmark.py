@@ -24,6 +24,7 @@ from kivy.input.motionevent import MotionEvent
 from kivy.cache import Cache
 from kivy.clock import Clock
 from kivy.compat import PY2
+from kivy.lang import Builder
 
 if not PY2:
     xrange = range
@@ -88,6 +89,42 @@ class bench_widget_dispatch:
         self.root.dispatch('on_touch_up', touch)
 
 
+class bench_widget_creation_with_rule:
+    '''Widget: creation from kv rule (1000 rows of 4 bound widgets)'''
+
+    def __init__(self):
+        Builder.load_string('''
+<BenchRow@Widget>:
+    index: 0
+    label: label
+    Label:
+        id: label
+        pos: root.pos
+        text: 'row %d' % root.index
+    Button:
+        x: label.right
+        y: root.y
+        text: label.text
+        on_press: root.index += 1
+    Widget:
+        size: root.width / 2., root.height
+        canvas:
+            Color:
+                rgba: 1, 1, 1, root.index % 2
+            Rectangle:
+                pos: self.pos
+                size: self.size
+''')
+        from kivy.factory import Factory
+        self.cls = Factory.BenchRow
+
+    def run(self):
+        o = []
+        cls = self.cls
+        for x in range(1000):
+            o.append(cls(index=x))
+
+
 class bench_label_creation:
     '''Core: label creation (10000 * 10 a-z)'''
 
@@ -156,6 +193,27 @@ class bench_button_creation_with_tick:
         Clock.tick()
 
 
+def measure_memory(factory, count=1000):
+    '''Return the memory allocated for each object created by `factory`, in
+    bytes, or None if it can't be measured (tracemalloc needs Python 3.4).
+    '''
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    # the first object creates the class caches, don't count them
+    factory()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        objects = [factory() for x in range(count)]
+        stats = tracemalloc.take_snapshot().compare_to(snapshot, 'filename')
+    finally:
+        tracemalloc.stop()
+    return sum(stat.size_diff for stat in stats) / float(count)
+
+
 if __name__ == '__main__':
 
     report = []
@@ -245,6 +303,17 @@ if __name__ == '__main__':
     log('Result: %.6f' % clock_total)
     log('')
 
+    log('Memory')
+    log('------')
+
+    for cls in (Widget, Label, Button):
+        size = measure_memory(cls)
+        if size is None:
+            log('Memory usage can be measured only with Python 3.4+')
+            break
+        log('%-20s %d bytes per instance' % (cls.__name__ + ':', size))
+    log('')
+
 try:
     reply = input(
         'Do you want to send benchmark to gist.github.com (Y/n) : ')
@@ -0,0 +1,96 @@
+'''
+Kv cache tool
+=============
+
+.. versionadded:: 1.9.0
+
+This tool builds the cache of kv files, in a ``__kvcache__`` directory next to
+each file, so that an application doesn't need to parse them when it starts.
+The cache is read only if it is enabled, see :ref:`kv-cache`.
+
+Usage
+-----
+
+Run it on kv files, or on directories to search for kv files in, when
+packaging your application::
+
+    $ python -m kivy.tools.kvcache myapp/ otherdir/other.kv
+
+The cache depends on the Python version: run the tool with the same Python
+version as the one used by the packaged application. The directives of the kv
+files are not executed.
+'''
+
+import os
+import sys
+from os.path import isdir, join
+
+os.environ['KIVY_NO_ARGS'] = '1'
+# the cache is written by this tool only, next to the kv files
+os.environ['KIVY_KV_CACHE'] = '0'
+
+from kivy.lang import (
+    Parser, _kv_cache_digest, _kv_cache_filenames, _kv_cache_write)
+
+
+class CacheParser(Parser):
+    # parse a kv file and keep its first level objects. The directives are
+    # not needed to parse the rules.
+    __slots__ = ('objects', )
+
+    def __init__(self, **kwargs):
+        self.objects = []
+        super(CacheParser, self).__init__(**kwargs)
+
+    def execute_directives(self):
+        pass
+
+    def parse_level(self, level, lines, spaces=0):
+        objects, lines = super(CacheParser, self).parse_level(
+            level, lines, spaces)
+        if level == 0:
+            self.objects = objects
+        return objects, lines
+
+
+def find_kv_files(paths):
+    for path in paths:
+        if not isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if d != '__kvcache__']
+            for fn in sorted(files):
+                if fn.endswith('.kv'):
+                    yield join(root, fn)
+
+
+def build(filename):
+    '''Build the cache of a kv file next to it, and return the cache
+    filename, or None if it could not be written.
+    '''
+    with open(filename, 'r') as fd:
+        content = fd.read()
+    parser = CacheParser(content=content, filename=filename)
+    digest = _kv_cache_digest(content)
+    fn = _kv_cache_write(filename, digest, parser._dump_cache(parser.objects),
+                         shipped=True)
+    if fn != _kv_cache_filenames(filename, digest)[0]:
+        return None
+    return fn
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python -m kivy.tools.kvcache <file.kv|directory> ...')
+        sys.exit(1)
+
+    failed = False
+    for filename in find_kv_files(sys.argv[1:]):
+        fn = build(filename)
+        if fn is None:
+            print('Unable to cache {}'.format(filename))
+            failed = True
+        else:
+            print('Cached {} in {}'.format(filename, fn))
+    sys.exit(1 if failed else 0)
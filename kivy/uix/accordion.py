@@ -56,6 +56,10 @@ template to customize the design of the title bar.
     increase the space for the accordion or reduce the number of children. You
     can also reduce the :attr:`Accordion.min_space`.
 
+The build of a content widget can be deferred until its item is expanded for
+the first time, by setting its :attr:`~kivy.uix.widget.Widget.defer_build`
+property to True. See :ref:`kv-defer-build`.
+
 Simple example
 --------------
 
@@ -256,6 +260,8 @@ class AccordionItem(FloatLayout):
     def __init__(self, **kwargs):
         self._trigger_title = Clock.create_trigger(self._update_title, -1)
         self._anim_collapse = None
+        # content with a deferred build, added when the item is expanded
+        self._deferred_content = []
         super(AccordionItem, self).__init__(**kwargs)
         self.bind(title=self._trigger_title,
                   title_template=self._trigger_title,
@@ -265,14 +271,26 @@ class AccordionItem(FloatLayout):
     def add_widget(self, widget):
         if self.container is None:
             return super(AccordionItem, self).add_widget(widget)
+        if self.collapse and widget.defer_build:
+            if widget not in self._deferred_content:
+                self._deferred_content.append(widget)
+            return
         return self.container.add_widget(widget)
 
     def remove_widget(self, widget):
+        if widget in self._deferred_content:
+            self._deferred_content.remove(widget)
+            return
         if self.container:
             self.container.remove_widget(widget)
         super(AccordionItem, self).remove_widget(widget)
 
     def on_collapse(self, instance, value):
+        if not value and self._deferred_content:
+            content = self._deferred_content
+            self._deferred_content = []
+            for widget in content:
+                self.container.add_widget(widget)
         accordion = self.accordion
         if accordion is None:
             return
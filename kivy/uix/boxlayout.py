@@ -109,11 +109,32 @@ class BoxLayout(Layout):
             size=self._trigger_layout,
             pos=self._trigger_layout)
 
+    _incremental_layout = True
+
+    @staticmethod
+    def _get_child_inputs(c):
+        # what the layout of a child depends on, see _start_layout
+        shw, shh = c.size_hint
+        return (shw, shh, None if shw else c.width, None if shh else c.height,
+                dict(c.pos_hint))
+
     def do_layout(self, *largs):
         # optimize layout by preventing looking at the same attribute in a loop
         len_children = len(self.children)
         if len_children == 0:
             return
+        dirty = self._start_layout((
+            self.x, self.y, self.width, self.height, tuple(self.padding),
+            self.spacing, self.orientation))
+        if dirty is not None:
+            # the position and size of every child depend on the size of the
+            # others, lay out everything if one of them changed
+            changed = self._layout_unchanged_children(
+                dirty, self._get_child_inputs)
+            if changed is not None and not changed:
+                return
+        get_inputs = self._get_child_inputs
+        state = {}
         selfx = self.x
         selfy = self.y
         selfw = self.width
@@ -169,6 +190,7 @@ class BoxLayout(Layout):
                     elif key == 'center_y':
                         cy += posy - (h / 2.)
 
+                state[c] = (get_inputs(c), (cx, cy, w, h))
                 c.x = cx
                 c.y = cy
                 c.width = w
@@ -200,18 +222,21 @@ class BoxLayout(Layout):
                     elif key == 'center_x':
                         cx += posx - (w / 2.)
 
+                state[c] = (get_inputs(c), (cx, cy, w, h))
                 c.x = cx
                 c.y = cy
                 c.width = w
                 c.height = h
                 y += h + spacing
 
+        self._layout_state = state
+
     def add_widget(self, widget, index=0):
         widget.bind(
-            pos_hint=self._trigger_layout)
+            pos_hint=self._trigger_child_layout)
         return super(BoxLayout, self).add_widget(widget, index)
 
     def remove_widget(self, widget):
         widget.unbind(
-            pos_hint=self._trigger_layout)
+            pos_hint=self._trigger_child_layout)
         return super(BoxLayout, self).remove_widget(widget)
@@ -341,27 +341,85 @@ class GridLayout(Layout):
                 # next child
                 i = i - 1
 
+        # remember for layout
+        self._cols = cols
+        self._rows = rows
+        self._cols_sh = cols_sh
+        self._rows_sh = rows_sh
+
+        # finally, set the minimum size
+        self._update_minimum_size_from_cells()
+
+    def _update_minimum_size_from_cells(self):
         # calculate minimum width/height needed, starting from padding +
         # spacing
+        cols = self._cols
+        rows = self._rows
         padding_x = self.padding[0] + self.padding[2]
         padding_y = self.padding[1] + self.padding[3]
         spacing_x, spacing_y = self.spacing
-        width = padding_x + spacing_x * (current_cols - 1)
-        height = padding_y + spacing_y * (current_rows - 1)
+        width = padding_x + spacing_x * (len(cols) - 1)
+        height = padding_y + spacing_y * (len(rows) - 1)
         # then add the cell size
         width += sum(cols)
         height += sum(rows)
+        self.minimum_size = (width, height)
 
-        # remember for layout
-        self._cols = cols
-        self._rows = rows
-        self._cols_sh = cols_sh
-        self._rows_sh = rows_sh
+    def _update_cells(self, cols, rows):
+        # calculate again the minimum size and stretch of some columns and
+        # rows, as update_minimum_size() does for all of them
+        children = self.children
+        len_children = len(children)
+        current_cols = len(self._cols)
+        current_rows = len(self._rows)
+        cols_minimum = self.cols_minimum
+        rows_minimum = self.rows_minimum
+        for col in cols:
+            width = cols_minimum.get(col, self.col_default_width)
+            stretch = None
+            for i in range(col, len_children, current_cols):
+                c = children[len_children - 1 - i]
+                shw = c.size_hint_x
+                if shw is None:
+                    width = nmax(width, c.width)
+                else:
+                    stretch = nmax(stretch, shw)
+            self._cols[col] = width
+            self._cols_sh[col] = stretch
+        for row in rows:
+            height = rows_minimum.get(row, self.row_default_height)
+            stretch = None
+            start = row * current_cols
+            for i in range(start, min(start + current_cols, len_children)):
+                c = children[len_children - 1 - i]
+                shh = c.size_hint_y
+                if shh is None:
+                    height = nmax(height, c.height)
+                else:
+                    stretch = nmax(stretch, shh)
+            self._rows[row] = height
+            self._rows_sh[row] = stretch
+        self._update_minimum_size_from_cells()
 
-        # finally, set the minimum size
-        self.minimum_size = (width, height)
+    _incremental_layout = True
+
+    @staticmethod
+    def _get_child_inputs(c):
+        # what the layout of a child depends on, see _start_layout
+        shw, shh = c.size_hint
+        return (shw, shh, c.width if shw is None else None,
+                c.height if shh is None else None)
 
     def do_layout(self, *largs):
+        dirty = self._start_layout((
+            self.x, self.y, self.width, self.height, tuple(self.padding),
+            tuple(self.spacing), self.cols, self.rows, self.col_default_width,
+            self.row_default_height, self.col_force_default,
+            self.row_force_default, dict(self.cols_minimum),
+            dict(self.rows_minimum)))
+        if dirty is not None and self._do_layout_dirty(dirty):
+            return
+
         self.update_minimum_size()
         if self._cols is None:
             return
@@ -373,11 +431,34 @@ class GridLayout(Layout):
         if len_children == 0:
             return
 
-        # speedup
+        cols, rows, xs, ys = self._get_cells()
+
+        # reposition every child
+        get_inputs = self._get_child_inputs
+        state = {}
+        i = len_children - 1
+        for row, row_height in enumerate(rows):
+            y = ys[row]
+            for col, col_width in enumerate(cols):
+                if i < 0:
+                    break
+                c = children[i]
+                x = xs[col]
+                state[c] = (get_inputs(c), (x, y, col_width, row_height),
+                            (row, col))
+                c.x = x
+                c.y = y
+                c.width = col_width
+                c.height = row_height
+                i = i - 1
+        self._layout_cells = cols, rows, xs, ys
+        self._layout_state = state
+
+    def _get_cells(self):
+        # return the size and position of the columns and rows
         padding_left = self.padding[0]
         padding_top = self.padding[1]
         spacing_x, spacing_y = self.spacing
-        selfx = self.x
         selfw = self.width
         selfh = self.height
 
@@ -425,19 +506,66 @@ class GridLayout(Layout):
                                  strech_h * row_stretch / rows_weigth)
                 rows[index] = row_height
 
-        # reposition every child
-        i = len_children - 1
+        # position of the columns and rows
+        xs = []
+        x = self.x + padding_left
+        for col_width in cols:
+            xs.append(x)
+            x = x + col_width + spacing_x
+        ys = []
         y = self.top - padding_top
         for row_height in rows:
-            x = selfx + padding_left
-            for col_width in cols:
-                if i < 0:
-                    break
-                c = children[i]
-                c.x = x
-                c.y = y - row_height
-                c.width = col_width
-                c.height = row_height
-                i = i - 1
-                x = x + col_width + spacing_x
+            ys.append(y - row_height)
             y -= row_height + spacing_y
+        return cols, rows, xs, ys
+
+    def _do_layout_dirty(self, dirty):
+        # lay out the changed children, and the columns and rows they moved.
+        # Return False if a complete layout is needed.
+        changed = self._layout_unchanged_children(
+            dirty, self._get_child_inputs)
+        if changed is None:
+            return False
+        if not changed:
+            return True
+
+        state = self._layout_state
+        self._update_cells(
+            set([state[c][2][1] for c in changed]),
+            set([state[c][2][0] for c in changed]))
+        cols, rows, xs, ys = self._get_cells()
+        old_cols, old_rows, old_xs, old_ys = self._layout_cells
+        moved_cols = [col for col in range(len(cols))
+                      if cols[col] != old_cols[col] or xs[col] != old_xs[col]]
+        moved_rows = [row for row in range(len(rows))
+                      if rows[row] != old_rows[row] or ys[row] != old_ys[row]]
+
+        children = self.children
+        len_children = len(children)
+        current_cols = len(cols)
+        cells = set()
+        for col in moved_cols:
+            cells.update(range(col, len_children, current_cols))
+        for row in moved_rows:
+            start = row * current_cols
+            cells.update(range(start, min(start + current_cols, len_children)))
+        for c in changed:
+            row, col = state[c][2]
+            cells.add(row * current_cols + col)
+
+        get_inputs = self._get_child_inputs
+        for i in cells:
+            c = children[len_children - 1 - i]
+            row, col = divmod(i, current_cols)
+            x = xs[col]
+            y = ys[row]
+            col_width = cols[col]
+            row_height = rows[row]
+            state[c] = (get_inputs(c), (x, y, col_width, row_height),
+                        (row, col))
+            c.x = x
+            c.y = y
+            c.width = col_width
+            c.height = row_height
+        self._layout_cells = cols, rows, xs, ys
+        return True
@@ -46,11 +46,62 @@ of the parent's height, do::
     The `reposition_child` internal method (made public by mistake) has
     been removed.
 
+.. _layout-touch-index:
+
+Touch index
+-----------
+
+.. versionadded:: 1.9.0
+
+By default, a touch is dispatched to every child of a widget, and each child
+checks whether the touch is inside it. With thousands of children (tile maps,
+large grids), this walk is slow. When :attr:`Layout.touch_index` is True, the
+layout keeps a :class:`~kivy.geometry.BoxIndex` of the bounding boxes of its
+children, rebuilt after they moved or were resized, and dispatches the touch
+events only to the children colliding with the touch, in the usual order::
+
+    grid = GridLayout(cols=100, touch_index=True)
+    for i in range(10000):
+        grid.add_widget(Button())
+
+Only enable it if the children ignore the touches outside their bounding box,
+as buttons, labels or images do. Touches grabbed by a child are still
+dispatched to it by the window.
+
+.. _layout-incremental:
+
+Incremental layout
+------------------
+
+.. versionadded:: 1.9.0
+
+The :class:`~kivy.uix.boxlayout.BoxLayout`,
+:class:`~kivy.uix.gridlayout.GridLayout` and
+:class:`~kivy.uix.stacklayout.StackLayout` remember which children changed
+(`size`, `size_hint` or `pos_hint`) since the last layout. When the layout
+itself didn't change, only these children and the ones they affect are laid
+out again:
+
+- a :class:`~kivy.uix.gridlayout.GridLayout` recomputes the columns and rows
+  of the changed children, then moves the children of the columns and rows
+  whose position or size changed.
+- a :class:`~kivy.uix.stacklayout.StackLayout` lays out again from the line of
+  the first changed child.
+- a :class:`~kivy.uix.boxlayout.BoxLayout` lays out all its children, unless
+  the changes don't affect the layout, e.g. when the layout resized its
+  children.
+
+Children moved or resized without changing their `size`, `size_hint` or
+`pos_hint` are not laid out again until the next complete layout. Calling
+:meth:`Layout.do_layout` when no child changed always does a complete layout.
+
 '''
 
 __all__ = ('Layout', )
 
 from kivy.clock import Clock
+from kivy.geometry import BoxIndex
+from kivy.properties import BooleanProperty
 from kivy.uix.widget import Widget
 
 
@@ -63,7 +114,29 @@ class Layout(Widget):
         if self.__class__ == Layout:
             raise Exception('The Layout class cannot be used.')
         self._trigger_layout = Clock.create_trigger(self.do_layout, -1)
+        self._touch_index = None
+        # incremental layout: inputs of the layout and per child state of the
+        # last complete layout, and the children changed since the last layout
+        self._layout_key = None
+        self._layout_state = None
+        self._dirty_children = set()
         super(Layout, self).__init__(**kwargs)
+        self.bind(children=self._clear_touch_index)
+        self.bind(children=self._clear_layout_state)
+
+    # True if do_layout uses _start_layout to lay out only the changed children
+    _incremental_layout = False
+
+    touch_index = BooleanProperty(False)
+    '''If True, the touch events are dispatched only to the children colliding
+    with the touch, found with an index of their bounding boxes. See
+    :ref:`the module documentation <layout-touch-index>`.
+
+    .. versionadded:: 1.9.0
+
+    :attr:`touch_index` is a :class:`~kivy.properties.BooleanProperty` and
+    defaults to False.
+    '''
 
     def do_layout(self, *largs):
         '''This function is called when a layout is needed by a trigger.
@@ -76,12 +149,125 @@ class Layout(Widget):
 
     def add_widget(self, widget, index=0):
         widget.bind(
-            size=self._trigger_layout,
-            size_hint=self._trigger_layout)
+            size=self._trigger_child_layout,
+            size_hint=self._trigger_child_layout)
+        if self.touch_index:
+            widget.bind(
+                pos=self._clear_touch_index,
+                size=self._clear_touch_index)
         return super(Layout, self).add_widget(widget, index)
 
     def remove_widget(self, widget):
         widget.unbind(
-            size=self._trigger_layout,
-            size_hint=self._trigger_layout)
+            size=self._trigger_child_layout,
+            size_hint=self._trigger_child_layout)
+        self._dirty_children.discard(widget)
+        widget.unbind(
+            pos=self._clear_touch_index,
+            size=self._clear_touch_index)
         return super(Layout, self).remove_widget(widget)
+
+    def _trigger_child_layout(self, child, *largs):
+        # the child is laid out again at the next layout
+        if self._incremental_layout:
+            self._dirty_children.add(child)
+        self._trigger_layout()
+
+    def _clear_layout_state(self, *largs):
+        self._layout_state = None
+
+    def _start_layout(self, key):
+        '''(internal) Start a layout, `key` holds the inputs of the layout
+        itself. Return the children changed since the last layout, or None
+        if all the children must be laid out, in which case the layout must
+        set :attr:`_layout_state` once done.
+        '''
+        dirty = self._dirty_children
+        self._dirty_children = set()
+        if not dirty or self._layout_state is None or key != self._layout_key:
+            self._layout_key = key
+            self._layout_state = None
+            return None
+        return dirty
+
+    def _layout_unchanged_children(self, dirty, get_inputs):
+        '''(internal) Lay out again the changed children whose inputs, as
+        returned by `get_inputs`, are the same as in the last layout, using
+        their last geometry. Return the children whose inputs changed, or
+        None if one of them is unknown.
+        '''
+        state = self._layout_state
+        changed = []
+        unchanged = []
+        for c in dirty:
+            item = state.get(c)
+            if item is None:
+                return None
+            if get_inputs(c) != item[0]:
+                changed.append(c)
+            else:
+                unchanged.append((c, item[1]))
+        for c, (x, y, width, height) in unchanged:
+            c.x = x
+            c.y = y
+            c.width = width
+            c.height = height
+        return changed
+
+    def on_touch_index(self, instance, value):
+        callback = self._clear_touch_index
+        for child in self.children:
+            if value:
+                child.bind(pos=callback, size=callback)
+            else:
+                child.unbind(pos=callback, size=callback)
+        self._touch_index = None
+
+    def _clear_touch_index(self, *largs):
+        # the index is rebuilt at the next touch
+        self._touch_index = None
+
+    def get_touch_candidates(self, x, y):
+        '''Return the children colliding with the point (x, y), in the order
+        the touch events are dispatched to them. The point is in the
+        coordinates of the children.
+
+        If :attr:`touch_index` is False, all the children are returned.
+
+        .. versionadded:: 1.9.0
+        '''
+        children = self.children
+        if not self.touch_index:
+            return children[:]
+        index = self._touch_index
+        if index is None or len(index.boxes) != len(children):
+            self._touch_index = index = BoxIndex(
+                [(c.x, c.y, c.right, c.top) for c in children])
+        return [children[i] for i in index.query(x, y)]
+
+    def on_touch_down(self, touch):
+        if not self.touch_index:
+            return super(Layout, self).on_touch_down(touch)
+        if self.disabled and self.collide_point(*touch.pos):
+            return True
+        for child in self.get_touch_candidates(touch.x, touch.y):
+            if child.dispatch('on_touch_down', touch):
+                return True
+
+    def on_touch_move(self, touch):
+        if not self.touch_index:
+            return super(Layout, self).on_touch_move(touch)
+        if self.disabled:
+            return
+        for child in self.get_touch_candidates(touch.x, touch.y):
+            if child.dispatch('on_touch_move', touch):
+                return True
+
+    def on_touch_up(self, touch):
+        if not self.touch_index:
+            return super(Layout, self).on_touch_up(touch)
+        if self.disabled:
+            return
+        for child in self.get_touch_candidates(touch.x, touch.y):
+            if child.dispatch('on_touch_up', touch):
+                return True
@@ -126,6 +126,25 @@ example, this can be accomplished like so::
     """)
 
 
+Deferred build
+--------------
+
+.. versionadded:: 1.9.0
+
+A screen is added to the widget tree only when it is displayed. If the
+:attr:`~kivy.uix.widget.Widget.defer_build` property of a screen is True, the
+content defined in its rules is built when the screen is displayed for the
+first time, instead of when it is created. It reduces the startup time of
+applications with many screens::
+
+    <SettingScreen>:
+        defer_build: True
+        BoxLayout:
+            # ...
+
+See :ref:`kv-defer-build`.
+
+
 Advanced Usage
 --------------
 
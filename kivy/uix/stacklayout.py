@@ -133,9 +133,42 @@ class StackLayout(Layout):
             size=self._trigger_layout,
             pos=self._trigger_layout)
 
+    _incremental_layout = True
+
+    @staticmethod
+    def _get_child_inputs(c):
+        # what the layout of a child depends on, see _start_layout
+        shw, shh = c.size_hint
+        return (shw, shh, None if shw else c.width, None if shh else c.height)
+
     def do_layout(self, *largs):
         if not self.children:
             return
+        dirty = self._start_layout((
+            self.x, self.y, self.width, self.height, tuple(self.padding),
+            tuple(self.spacing), self.orientation))
+        # index of the line to start from, see _layout_lines
+        line = 0
+        if dirty is not None:
+            changed = self._layout_unchanged_children(
+                dirty, self._get_child_inputs)
+            if changed is None:
+                dirty = None
+            elif not changed:
+                return
+            else:
+                # the lines before the line of the first changed child are not
+                # affected, except the previous line if the child starts its
+                # line, as it may fit in the previous line now
+                state = self._layout_state
+                lines = self._layout_lines
+                children = self.children
+                line = len(lines)
+                for c in changed:
+                    cline = state[c][2]
+                    if cline and children[-1 - lines[cline][0]] is c:
+                        cline -= 1
+                    line = min(line, cline)
 
         # optimize layout by preventing looking at the same attribute in a loop
         selfpos = self.pos
@@ -208,7 +241,19 @@ class StackLayout(Layout):
         vrev = (deltav < 0)
         firstchild = self.children[0]
         sizes = []
-        for c in reversed(self.children):
+
+        # the index of the first child and the v and sv positions of every
+        # line, to lay out again from a line
+        if dirty is None:
+            state = {}
+            lines = [(0, v, sv)]
+        else:
+            lines = self._layout_lines[:line + 1]
+            v, sv = lines[-1][1:]
+        get_inputs = self._get_child_inputs
+        children = self.children[::-1]
+        for index in range(lines[-1][0], len(children)):
+            c = children[index]
             if c.size_hint[outerattr]:
                 c.size[outerattr] = max(1,
                     c.size_hint[outerattr] * (selfsize[outerattr] - padding_v))
@@ -257,6 +302,7 @@ class StackLayout(Layout):
 
             # push the line
             sv += lv + spacing_v
+            line = len(lines) - 1
             for c2 in lc:
                 if urev:
                     u -= c2.size[innerattr]
@@ -268,6 +314,8 @@ class StackLayout(Layout):
                     # we need to subtract the height/width from the position.
                     pos_outer -= c2.size[outerattr]
                 c2.pos[outerattr] = pos_outer
+                state[c2] = (get_inputs(c2), (c2.x, c2.y, c2.width, c2.height),
+                             line)
                 if urev:
                     u -= spacing_u
                 else:
@@ -275,6 +323,7 @@ class StackLayout(Layout):
 
             v += deltav * lv
             v += deltav * spacing_v
+            lines.append((index, v, sv))
             lc = [c]
             lv = c.size[outerattr]
             if c.size_hint[innerattr]:
@@ -292,6 +341,7 @@ class StackLayout(Layout):
 
             # push the last (incomplete) line
             sv += lv + spacing_v
+            line = len(lines) - 1
             for c2 in lc:
                 if urev:
                     u -= c2.size[innerattr]
@@ -300,9 +350,13 @@ class StackLayout(Layout):
                 if vrev:
                     pos_outer -= c2.size[outerattr]
                 c2.pos[outerattr] = pos_outer
+                state[c2] = (get_inputs(c2), (c2.x, c2.y, c2.width, c2.height),
+                             line)
                 if urev:
                     u -= spacing_u
                 else:
                     u += c2.size[innerattr] + spacing_u
 
+        self._layout_lines = lines
+        self._layout_state = state
         self.minimum_size[outerattr] = sv
@@ -249,6 +249,8 @@ class Widget(WidgetBase):
     __metaclass__ = WidgetMetaclass
     __events__ = ('on_touch_down', 'on_touch_move', 'on_touch_up')
     _proxy_ref = None
+    # rules to apply when the build is deferred, see defer_build
+    _build_pending = None
 
     def __init__(self, **kwargs):
         # Before doing anything, ensure the windows exist.
@@ -487,6 +489,10 @@ class Widget(WidgetBase):
                 next_index = 1
             canvas.insert(next_index, widget.canvas)
 
+        # Apply the rules of the widget if its build was deferred.
+        if widget._build_pending is not None:
+            Builder.apply_deferred(widget)
+
     def remove_widget(self, widget):
         '''Remove a widget from the children of this widget.
 
@@ -1138,6 +1144,23 @@ class Widget(WidgetBase):
     See :class:`~kivy.graphics.Canvas` for more information about the usage.
     '''
 
+    defer_build = BooleanProperty(False)
+    '''If True when the widget is created without a parent, the application
+    of its kv rules, which creates its children and canvas instructions, is
+    deferred until the widget is added to a parent.
+
+    It reduces the startup time of applications with many widgets that are
+    not displayed at first, like the screens of a
+    :class:`~kivy.uix.screenmanager.ScreenManager`. The property must be set
+    in the constructor, in the class rule or in the rule creating the widget.
+    See :ref:`kv-defer-build`.
+
+    .. versionadded:: 1.9.0
+
+    :attr:`defer_build` is a :class:`~kivy.properties.BooleanProperty` and
+    defaults to False.
+    '''
+
     disabled = BooleanProperty(False)
     '''Indicates whether this widget can interact with input or not.
 